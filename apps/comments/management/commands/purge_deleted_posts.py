@@ -0,0 +1,53 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from apps.posts.repositories.post_repository import PostRepository
+from ...repositories.comment_repository import CommentRepository
+
+
+class Command(BaseCommand):
+    """
+    Permanently remove soft-deleted posts together with their comments.
+
+    Comments are deleted in fixed-size batches, each one committed in its own short
+    transaction, and the post row goes last. Memory use and the time the SQLite write lock
+    is held stay bounded regardless of the size of a thread, so the command can run
+    against a live database, from cron or a worker, and can be interrupted and resumed.
+    """
+
+    help = "Purge soft-deleted posts and their comments in bounded batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of comments deleted per transaction (default: 1000).",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches so other writers can get the lock (default: 0).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        pause = options["pause"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be a positive integer.")
+        if pause < 0:
+            raise CommandError("--pause must not be negative.")
+
+        posts, comments = 0, 0
+        # Purged posts leave the queue, so fetching the oldest ones again always makes progress.
+        while post_ids := PostRepository.get_deleted_post_ids():
+            for post_id in post_ids:
+                while deleted := CommentRepository.purge_comments_batch(post_id, batch_size):
+                    comments += deleted
+                    if pause:
+                        time.sleep(pause)
+                if PostRepository.purge_post(post_id):
+                    posts += 1
+                    self.stdout.write(f"Purged post {post_id} ({comments} comments so far).")
+
+        self.stdout.write(self.style.SUCCESS(f"Purged {posts} posts and {comments} comments."))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.posts.models import Post
+from ...repositories.comment_repository import CommentRepository
+
+
+class Command(BaseCommand):
+    """
+    Recompute Post.comment_count and Post.last_commented_at from the comments table.
+
+    Posts are walked in primary key order in fixed-size batches, each one committed in its
+    own short transaction, so the command can run against a live database to repair drift.
+    """
+
+    help = "Recompute the denormalized comment_count and last_commented_at of every post in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of posts recomputed per transaction (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        last_id, total = 0, 0
+        while True:
+            post_ids = list(
+                Post.objects.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not post_ids:
+                break
+            with transaction.atomic():
+                total += CommentRepository.recount_post_comment_stats(post_ids)
+            last_id = post_ids[-1]
+            self.stdout.write(f"Recounted {total} posts (up to ID {last_id}).")
+
+        self.stdout.write(self.style.SUCCESS(f"Recounted comment stats for {total} posts."))
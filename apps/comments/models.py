@@ -3,10 +3,19 @@ from apps.posts.models import Post
 
 
 class Comment(models.Model):
-    post = models.ForeignKey(Post, related_name="comments", on_delete=models.CASCADE)
+    # The composite index below starts with post_id, so the FK does not need its own index.
+    post = models.ForeignKey(Post, related_name="comments", on_delete=models.CASCADE, db_index=False)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Serves the per-post comment list as a single range scan in (created_at, id) order.
+            models.Index(fields=["post", "created_at", "id"], name="comments_post_created_id_idx"),
+            # Covers the count/max(updated_at) aggregate behind the comment list ETag.
+            models.Index(fields=["post", "updated_at"], name="comments_post_updated_idx"),
+        ]
+
     def __str__(self):
         return self.content[:20]
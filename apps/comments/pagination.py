@@ -0,0 +1,12 @@
+from apps.posts.pagination import KeysetCursorPagination
+
+
+class CommentCursorPagination(KeysetCursorPagination):
+    """
+    Cursor pagination for the comments of a post, ordered oldest first on ``(created_at, id)``.
+
+    Combined with the ``post_id`` filter, every page is one range scan over the
+    ``(post_id, created_at, id)`` index, however many comments the post has.
+    """
+
+    ordering = ("created_at", "id")
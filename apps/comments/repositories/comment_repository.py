@@ -1,34 +1,302 @@
 from ..models import Comment
+from apps.posts.models import Post
+from apps.posts.repositories.cache import comment_cache, post_cache
+from apps.posts.repositories.timestamps import restore_timestamps
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
 from django.db.utils import DatabaseError
+from django.utils import timezone
+
+# Aggregates describing the version of a post's comment list (see ETags).
+COMMENTS_VERSION_AGGREGATES = {"count": Count("id"), "updated_at": Max("updated_at")}
+
+# Columns written for each comment by the NDJSON export.
+EXPORT_FIELDS = ("id", "post_id", "content", "created_at", "updated_at")
 
 class CommentRepository:
     @staticmethod
-    def get_comments_by_post_id(post_id):
+    def get_comments_by_post_id(post_id, since=None, before=None):
         """
-        Retrieve all comments associated with a specific post_id.
+        Retrieve the comments associated with a specific post_id, oldest first.
+        Comments of a soft-deleted post are not returned.
 
         :param post_id: The ID of the post to retrieve comments for.
-        :return: QuerySet of Comment objects.
+        :param since: Optional datetime; only comments created after it are returned.
+        :param before: Optional datetime; only comments created before it are returned.
+        :return: QuerySet of Comment objects ordered by (created_at, id).
         """
         try:
-            return Comment.objects.filter(post_id=post_id)
+            comments = Comment.objects.filter(post_id=post_id, post__deleted_at__isnull=True)
+            if since is not None:
+                comments = comments.filter(created_at__gt=since)
+            if before is not None:
+                comments = comments.filter(created_at__lt=before)
+            return comments.order_by("created_at", "id")
         except DatabaseError as e:
             # Log the exception (if logging is configured)
             # logger.error(f"Database error when retrieving comments for post_id {post_id}: {e}")
             raise e
 
     @staticmethod
-    def get_comment_by_post_and_id(post_id, comment_id):
+    def get_comment_rows_by_post_id(post_id, columns, since=None, before=None):
+        """
+        Retrieve the comments of a post as named tuples of the given columns, oldest first,
+        without instantiating models.
+
+        :param post_id: The ID of the post to retrieve comments for.
+        :param columns: Model field names to select.
+        :param since: Optional datetime; only comments created after it are returned.
+        :param before: Optional datetime; only comments created before it are returned.
+        :return: QuerySet of named tuples ordered by (created_at, id).
+        """
+        try:
+            return CommentRepository.get_comments_by_post_id(post_id, since=since, before=before).values_list(
+                *columns, named=True
+            )
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving comment rows for post_id {post_id}: {e}")
+            raise e
+
+    @staticmethod
+    def get_comment_rows_with_version(post_id, columns):
+        """
+        Retrieve the comments of a post as named tuples of the given columns, like
+        `get_comment_rows_by_post_id`, each ending with a 'comments_updated_at' item.
+
+        'comments_updated_at' is the latest updated_at of all the post's comments, whatever
+        part of them is fetched. It is an uncorrelated subquery, looked up once per query
+        at the end of the (post_id, updated_at) index, so a page of comments and the
+        version of the whole list are read with a single query.
+
+        :param post_id: The ID of the post to retrieve comments for.
+        :param columns: Model field names to select.
+        :return: QuerySet of named tuples ordered by (created_at, id).
+        """
+        try:
+            latest_update = Comment.objects.filter(post_id=post_id).order_by("-updated_at").values("updated_at")[:1]
+            return (
+                CommentRepository.get_comments_by_post_id(post_id)
+                .annotate(comments_updated_at=Subquery(latest_update))
+                .values_list(*columns, "comments_updated_at", named=True)
+            )
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving comment rows for post_id {post_id}: {e}")
+            raise e
+
+    @staticmethod
+    def get_comment_summaries_by_post_id(post_id):
+        """
+        Retrieve the comments of a post with only the columns a listing needs, oldest first.
+
+        Only 'id', 'post_id' and 'content' are loaded; the post is never joined because
+        its ID is already known from the comment row.
+
+        :param post_id: The ID of the post to retrieve comments for.
+        :return: QuerySet of partially loaded Comment objects.
+        """
+        try:
+            return (
+                Comment.objects.filter(post_id=post_id, post__deleted_at__isnull=True)
+                .only("id", "post_id", "content")
+                .order_by("created_at", "id")
+            )
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving comment summaries for post_id {post_id}: {e}")
+            raise e
+
+    @staticmethod
+    def iter_comments_for_export(chunk_size):
+        """
+        Stream the comments of every live post as dictionaries of their columns, in primary key order.
+
+        Rows are fetched from a single cursor `chunk_size` at a time and never cached on
+        a QuerySet, so memory use does not grow with the number of comments.
+
+        :param chunk_size: Number of rows fetched from the database cursor at a time.
+        :return: Iterator of dictionaries.
+        """
+        try:
+            return (
+                Comment.objects.filter(post__deleted_at__isnull=True)
+                .order_by("pk")
+                .values(*EXPORT_FIELDS)
+                .iterator(chunk_size=chunk_size)
+            )
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when exporting comments: {e}")
+            raise e
+
+    @staticmethod
+    def get_comments_version(post_id):
+        """
+        Describe the current state of a post's comments with one aggregate query.
+
+        The query is answered from the (post_id, updated_at) covering index.
+
+        The version has no last-modified time (see ConditionalGetMixin.get_version):
+        deleting a comment does not move max(updated_at) forward, so If-Modified-Since
+        would keep answering 304 for a list that lost a comment. Only the ETag is used.
+
+        :param post_id: The ID of the post the comments belong to.
+        :return: Tuple of (None, latest updated_at or None, number of comments).
+        """
+        try:
+            stats = CommentRepository._live_comments(post_id).aggregate(**COMMENTS_VERSION_AGGREGATES)
+            return CommentRepository._comments_version(stats)
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving comments version for post_id {post_id}: {e}")
+            raise e
+
+    @staticmethod
+    async def aget_comments_version(post_id):
+        """
+        Async variant of `get_comments_version`.
+        """
+        try:
+            stats = await CommentRepository._live_comments(post_id).aaggregate(**COMMENTS_VERSION_AGGREGATES)
+            return CommentRepository._comments_version(stats)
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving comments version for post_id {post_id}: {e}")
+            raise e
+
+    @staticmethod
+    def get_comment_version(post_id, comment_id):
         """
-        Retrieve a specific comment by post_id and comment_id.
+        Describe the current state of a comment without instantiating it.
+
+        The cached comment is used when present; otherwise only updated_at is read.
+
+        :param post_id: The ID of the post the comment is associated with.
+        :param comment_id: The ID of the comment.
+        :return: Tuple of (updated_at,), or None if the comment does not exist.
+        """
+        try:
+            comment = comment_cache.peek((post_id, comment_id))
+            if comment is not None:
+                return (comment.updated_at,)
+            return CommentRepository._live_comments(post_id).filter(id=comment_id).values_list("updated_at").first()
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving version of comment {comment_id}: {e}")
+            raise e
+
+    @staticmethod
+    async def aget_comment_version(post_id, comment_id):
+        """
+        Async variant of `get_comment_version`.
+        """
+        try:
+            comment = await comment_cache.apeek((post_id, comment_id))
+            if comment is not None:
+                return (comment.updated_at,)
+            return await (
+                CommentRepository._live_comments(post_id).filter(id=comment_id).values_list("updated_at").afirst()
+            )
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving version of comment {comment_id}: {e}")
+            raise e
+
+    @staticmethod
+    def get_comment_by_post_and_id(post_id, comment_id, fields=None):
+        """
+        Retrieve a specific comment by post_id and comment_id, through the read-through cache.
+
+        Comments of a soft-deleted post are no longer loaded from the database, and the
+        copies cached before the deletion are dropped by PostRepository.delete_post.
+        When `fields` is given and the comment is not cached, only those columns are
+        read and the partial comment is not cached.
 
         :param post_id: The ID of the post the comment is associated with.
         :param comment_id: The ID of the comment to retrieve.
+        :param fields: Optional model field names to load; the other columns are deferred.
         :return: Comment object if found, None otherwise.
         """
+        if fields is not None:
+            try:
+                comment = comment_cache.peek((post_id, comment_id))
+                if comment is not None:
+                    return comment
+                return CommentRepository._live_comments(post_id).only(*fields).filter(id=comment_id).first()
+            except DatabaseError as e:
+                # Log the exception (if logging is configured)
+                # logger.error(f"Database error when retrieving comment {comment_id} for post_id {post_id}: {e}")
+                raise e
+
+        def load():
+            try:
+                return Comment.objects.get(post_id=post_id, id=comment_id, post__deleted_at__isnull=True)
+            except Comment.DoesNotExist:
+                return None
+
+        try:
+            return comment_cache.get_or_load((post_id, comment_id), load)
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving comment {comment_id} for post_id {post_id}: {e}")
+            raise e
+
+    @staticmethod
+    async def aget_comment_by_post_and_id(post_id, comment_id, fields=None):
+        """
+        Async variant of `get_comment_by_post_and_id`.
+        """
+        if fields is not None:
+            try:
+                comment = await comment_cache.apeek((post_id, comment_id))
+                if comment is not None:
+                    return comment
+                return await CommentRepository._live_comments(post_id).only(*fields).filter(id=comment_id).afirst()
+            except DatabaseError as e:
+                # Log the exception (if logging is configured)
+                # logger.error(f"Database error when retrieving comment {comment_id} for post_id {post_id}: {e}")
+                raise e
+
+        async def load():
+            try:
+                return await CommentRepository._live_comments(post_id).aget(id=comment_id)
+            except Comment.DoesNotExist:
+                return None
+
+        try:
+            return await comment_cache.aget_or_load((post_id, comment_id), load)
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving comment {comment_id} for post_id {post_id}: {e}")
+            raise e
+
+    @staticmethod
+    def _comments_version(stats):
+        return None, stats["updated_at"], stats["count"]
+
+    @staticmethod
+    def _live_comments(post_id):
+        # Comments of a soft-deleted post are hidden until the purge removes them.
+        return Comment.objects.filter(post_id=post_id, post__deleted_at__isnull=True)
+
+    @staticmethod
+    def get_comment_with_post_by_post_and_id(post_id, comment_id):
+        """
+        Retrieve a specific comment together with the title of its post in a single query.
+
+        :param post_id: The ID of the post the comment is associated with.
+        :param comment_id: The ID of the comment to retrieve.
+        :return: Comment object with its post joined if found, None otherwise.
+        """
         try:
-            return Comment.objects.get(post_id=post_id, id=comment_id)
+            return (
+                Comment.objects.select_related("post")
+                .only("id", "post_id", "content", "post__id", "post__title")
+                .get(post_id=post_id, id=comment_id, post__deleted_at__isnull=True)
+            )
         except Comment.DoesNotExist:
             return None
         except DatabaseError as e:
@@ -41,31 +309,107 @@ class CommentRepository:
         """
         Create a new comment associated with a specific post_id.
 
+        The post's comment_count and last_commented_at are bumped in the same transaction.
+
         :param data: Dictionary containing the data for the new comment.
         :param post_id: The ID of the post the comment is associated with.
         :return: The newly created Comment object.
+        :raises: ObjectDoesNotExist if the post does not exist.
         """
         try:
-            return Comment.objects.create(post_id=post_id, **data)
+            with transaction.atomic():
+                comment = Comment.objects.create(post_id=post_id, **data)
+                if not CommentRepository._add_to_post_comment_stats(comment.post_id, 1, comment.created_at):
+                    # Rolls the insert back instead of leaving an orphan for the FK check at commit.
+                    raise ObjectDoesNotExist(f"Post with ID {post_id} does not exist.")
+                return comment
         except DatabaseError as e:
             # Log the exception (if logging is configured)
             # logger.error(f"Database error when creating comment for post_id {post_id}: {e}")
             raise e
 
     @staticmethod
-    def update_comment(data, comment_id):
+    def bulk_create_comments(data_list, batch_size=None, keep_timestamps=False):
+        """
+        Create many comments, possibly for many posts, in one transaction.
+
+        Comments are inserted with multi-row INSERTs, then the comment stats of each
+        affected post are updated once per post rather than once per comment.
+
+        :param data_list: List of dictionaries with 'post_id' and 'content', one per comment.
+        :param batch_size: Maximum number of rows per INSERT statement (None lets Django decide).
+        :param keep_timestamps: If True, save the 'created_at' and 'updated_at' given in every
+                                dictionary instead of the current time (used by imports).
+        :return: List of the newly created Comment objects, with their IDs set.
+        """
+        try:
+            with transaction.atomic():
+                comments = Comment.objects.bulk_create(
+                    [Comment(**data) for data in data_list], batch_size=batch_size
+                )
+                if keep_timestamps:
+                    restore_timestamps(Comment, comments, data_list, batch_size=batch_size)
+                stats = {}  # post_id -> [number of new comments, newest created_at]
+                for comment in comments:
+                    post_stats = stats.setdefault(comment.post_id, [0, comment.created_at])
+                    post_stats[0] += 1
+                    post_stats[1] = max(post_stats[1], comment.created_at)
+                for post_id, (count, commented_at) in stats.items():
+                    CommentRepository._add_to_post_comment_stats(post_id, count, commented_at)
+                return comments
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when bulk creating {len(data_list)} comments: {e}")
+            raise e
+
+    @staticmethod
+    def _add_to_post_comment_stats(post_id, count, commented_at):
+        """
+        Add `count` new comments, the newest created at `commented_at`, to a post's stats.
+
+        Must run in the transaction that inserted the comments.
+
+        :param post_id: The ID of the post the comments belong to.
+        :param count: Number of comments added.
+        :param commented_at: Creation datetime of the newest comment added.
+        :return: Number of posts updated (0 if the post does not exist).
+        """
+        commented_at = Value(commented_at)
+        updated = Post.objects.filter(pk=post_id).update(
+            comment_count=F("comment_count") + count,
+            # Concurrent inserts may commit out of order, so never move the timestamp back.
+            last_commented_at=Greatest(Coalesce("last_commented_at", commented_at), commented_at),
+            comments_changed_at=timezone.now(),
+        )
+        post_cache.invalidate(post_id)
+        return updated
+
+    @staticmethod
+    def update_comment(data, comment_id, comment=None):
         """
         Update an existing comment identified by comment_id.
 
+        Every given field is written, with a single UPDATE statement. The comment held by
+        the caller may be a cached or outdated copy, so it is never used to skip the write.
+        When the caller already holds the comment it is reused and updated in place.
+
         :param data: Dictionary containing the data to update the comment with.
         :param comment_id: The ID of the comment to update.
-        :return: The updated Comment object.
+        :param comment: Optional Comment object already loaded for 'comment_id'.
+        :return: The updated Comment object, or None if it does not exist.
         """
         try:
-            comment = Comment.objects.get(pk=comment_id)
-            for attr, value in data.items():
+            if comment is None:
+                comment = Comment.objects.get(pk=comment_id)
+            cached_under = (comment.post_id, comment.pk)  # Key of the comment before any reassignment.
+            changes = dict(data)
+            changes["updated_at"] = timezone.now()  # Queryset updates skip auto_now.
+            # The post may have been soft-deleted since the comment was loaded (or cached).
+            if not Comment.objects.filter(pk=comment.pk, post__deleted_at__isnull=True).update(**changes):
+                return None
+            for attr, value in changes.items():
                 setattr(comment, attr, value)
-            comment.save()
+            comment_cache.invalidate(*cached_under)
             return comment
         except Comment.DoesNotExist:
             return None
@@ -79,16 +423,94 @@ class CommentRepository:
         """
         Delete an existing comment identified by comment_id.
 
+        The post's comment_count and last_commented_at are updated in the same transaction,
+        and its comments_changed_at is set: last_commented_at may move back, and the post's
+        Last-Modified must still move forward. updated_at is left to edits of the post.
+
         :param comment_id: The ID of the comment to delete.
         :return: True if the comment was successfully deleted, False otherwise.
         """
         try:
-            comment = Comment.objects.get(pk=comment_id)
-            comment.delete()
-            return True
+            with transaction.atomic():
+                comment = Comment.objects.get(pk=comment_id)
+                comment.delete()
+                latest = (
+                    Comment.objects.filter(post_id=OuterRef("pk"))
+                    .order_by("-created_at", "-id")
+                    .values("created_at")[:1]
+                )
+                Post.objects.filter(pk=comment.post_id).update(
+                    comment_count=Greatest(F("comment_count") - 1, Value(0)),
+                    last_commented_at=Subquery(latest),
+                    comments_changed_at=timezone.now(),
+                )
+                comment_cache.invalidate(comment.post_id, comment_id)
+                post_cache.invalidate(comment.post_id)
+                return True
         except Comment.DoesNotExist:
             return False
         except DatabaseError as e:
             # Log the exception (if logging is configured)
             # logger.error(f"Database error when deleting comment {comment_id}: {e}")
             raise e
+
+    @staticmethod
+    def purge_comments_batch(post_id, batch_size):
+        """
+        Permanently delete up to `batch_size` comments of a post in one short transaction.
+
+        Only the IDs of the batch are read, from the (post_id, created_at, id) index, and the
+        rows are removed with a single DELETE, so memory use and the time the write lock is
+        held stay bounded however many comments the post has.
+
+        :param post_id: The ID of the post whose comments are purged.
+        :param batch_size: Maximum number of comments deleted.
+        :return: Number of comments deleted; 0 once the post has none left.
+        """
+        try:
+            with transaction.atomic():
+                comment_ids = list(
+                    Comment.objects.filter(post_id=post_id)
+                    .order_by()
+                    .values_list("id", flat=True)[:batch_size]
+                )
+                if not comment_ids:
+                    return 0
+                # Comment has no dependents or signal receivers, so this is one DELETE ... WHERE id IN.
+                Comment.objects.filter(pk__in=comment_ids).delete()
+                comment_cache.invalidate_many((post_id, comment_id) for comment_id in comment_ids)
+                return len(comment_ids)
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when purging comments of post_id {post_id}: {e}")
+            raise e
+
+    @staticmethod
+    def recount_post_comment_stats(post_ids):
+        """
+        Recompute comment_count and last_commented_at from the comments table for the given posts.
+
+        Used to repair drift in the denormalized counters; runs as a single UPDATE with
+        correlated subqueries served by the (post_id, created_at, id) index.
+
+        :param post_ids: Iterable of post IDs to recompute.
+        :return: Number of posts updated.
+        """
+        try:
+            comments = Comment.objects.filter(post_id=OuterRef("pk")).order_by()
+            updated = Post.objects.filter(pk__in=post_ids).update(
+                comment_count=Coalesce(
+                    Subquery(comments.values("post_id").annotate(total=Count("id")).values("total")),
+                    0,
+                ),
+                last_commented_at=Subquery(
+                    comments.order_by("-created_at", "-id").values("created_at")[:1]
+                ),
+                comments_changed_at=timezone.now(),  # Repaired counters are served; move Last-Modified.
+            )
+            post_cache.invalidate_many((post_id,) for post_id in post_ids)
+            return updated
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when recounting comments for posts {post_ids}: {e}")
+            raise e
@@ -1,9 +1,18 @@
 from rest_framework import serializers
+from apps.posts.serializers import DynamicFieldsModelSerializer
 from .models import Comment
 
 
 # CommentSerializer is a ModelSerializer that automatically creates fields and methods for the Comment model.
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Comment  # The model that this serializer will be based on.
         fields = "__all__"  # Automatically include all fields from the Comment model.
+        read_only_fields = ("post",)  # The post comes from the URL; validating it would cost a query per write.
+
+
+# CommentBulkItemSerializer validates one item of a batch comment import.
+# The post is referenced by its raw ID so that existence can be checked for the whole batch in one query.
+class CommentBulkItemSerializer(serializers.Serializer):
+    post_id = serializers.IntegerField(min_value=1)
+    content = serializers.CharField()
@@ -1,36 +1,179 @@
 from ..repositories.comment_repository import CommentRepository
+from apps.posts.repositories.post_repository import PostRepository
 from django.core.exceptions import ObjectDoesNotExist
 from django.db.utils import DatabaseError
 
 class CommentService:
     @staticmethod
-    def get_comments_by_post_id(post_id):
+    def get_comments_by_post_id(post_id, since=None, before=None):
         """
-        Retrieve all comments associated with a specific post_id.
+        Retrieve the comments associated with a specific post_id, oldest first.
 
         :param post_id: The ID of the post to retrieve comments for.
+        :param since: Optional datetime; only comments created after it are returned.
+        :param before: Optional datetime; only comments created before it are returned.
         :return: QuerySet of Comment objects.
         :raises: DatabaseError if there is an error accessing the database.
         """
         try:
-            return CommentRepository.get_comments_by_post_id(post_id)
+            return CommentRepository.get_comments_by_post_id(post_id, since=since, before=before)
         except DatabaseError as e:
             # Log the exception (if logging is configured)
             # logger.error(f"Database error when retrieving comments for post_id {post_id}: {e}")
             raise e
 
     @staticmethod
-    def get_comment_by_post_and_id(post_id, comment_id):
+    def get_comment_rows_by_post_id(post_id, columns, since=None, before=None):
+        """
+        Retrieve the comments of a post as named tuples of the given columns, for read-only listings.
+
+        :param post_id: The ID of the post to retrieve comments for.
+        :param columns: Model field names to select.
+        :param since: Optional datetime; only comments created after it are returned.
+        :param before: Optional datetime; only comments created before it are returned.
+        :return: QuerySet of named tuples.
+        :raises: DatabaseError if there is an error accessing the database.
+        """
+        try:
+            return CommentRepository.get_comment_rows_by_post_id(post_id, columns, since=since, before=before)
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving comment rows for post_id {post_id}: {e}")
+            raise e
+
+    @staticmethod
+    def get_comment_rows_with_version(post_id, columns):
+        """
+        Retrieve the comments of a post as named tuples of the given columns, each ending with
+        the latest updated_at of all the post's comments ('comments_updated_at').
+
+        :param post_id: The ID of the post to retrieve comments for.
+        :param columns: Model field names to select.
+        :return: QuerySet of named tuples.
+        :raises: DatabaseError if there is an error accessing the database.
+        """
+        try:
+            return CommentRepository.get_comment_rows_with_version(post_id, columns)
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving comment rows for post_id {post_id}: {e}")
+            raise e
+
+    @staticmethod
+    def get_comment_summaries_by_post_id(post_id):
+        """
+        Retrieve the comments of a post with only the columns a listing needs.
+
+        :param post_id: The ID of the post to retrieve comments for.
+        :return: QuerySet of partially loaded Comment objects.
+        :raises: DatabaseError if there is an error accessing the database.
+        """
+        try:
+            return CommentRepository.get_comment_summaries_by_post_id(post_id)
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving comment summaries for post_id {post_id}: {e}")
+            raise e
+
+    @staticmethod
+    def get_comments_version(post_id):
+        """
+        Retrieve a cheap description of the current state of a post's comments, used for conditional GETs.
+
+        :param post_id: The ID of the post the comments belong to.
+        :return: Tuple of (None, latest updated_at or None, number of comments); the list has no Last-Modified.
+        :raises: DatabaseError if there is an error accessing the database.
+        """
+        try:
+            return CommentRepository.get_comments_version(post_id)
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving comments version for post_id {post_id}: {e}")
+            raise e
+
+    @staticmethod
+    async def aget_comments_version(post_id):
+        """
+        Async variant of `get_comments_version`, for views served under ASGI.
+        """
+        try:
+            return await CommentRepository.aget_comments_version(post_id)
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving comments version for post_id {post_id}: {e}")
+            raise e
+
+    @staticmethod
+    def get_comment_version(post_id, comment_id):
+        """
+        Retrieve a cheap description of the current state of a comment, used for conditional GETs.
+
+        :param post_id: The ID of the post the comment is associated with.
+        :param comment_id: The ID of the comment.
+        :return: Version tuple, or None if the comment does not exist.
+        :raises: DatabaseError if there is an error accessing the database.
+        """
+        try:
+            return CommentRepository.get_comment_version(post_id, comment_id)
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving version of comment {comment_id}: {e}")
+            raise e
+
+    @staticmethod
+    async def aget_comment_version(post_id, comment_id):
+        """
+        Async variant of `get_comment_version`, for views served under ASGI.
+        """
+        try:
+            return await CommentRepository.aget_comment_version(post_id, comment_id)
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving version of comment {comment_id}: {e}")
+            raise e
+
+    @staticmethod
+    def get_comment_by_post_and_id(post_id, comment_id, fields=None):
         """
         Retrieve a specific comment by post_id and comment_id.
 
+        :param post_id: The ID of the post the comment is associated with.
+        :param comment_id: The ID of the comment to retrieve.
+        :param fields: Optional model field names to load; the other columns are deferred.
+        :return: Comment object if found, None otherwise.
+        :raises: DatabaseError if there is an error accessing the database.
+        """
+        try:
+            return CommentRepository.get_comment_by_post_and_id(post_id, comment_id, fields=fields)
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving comment {comment_id} for post_id {post_id}: {e}")
+            raise e
+
+    @staticmethod
+    async def aget_comment_by_post_and_id(post_id, comment_id, fields=None):
+        """
+        Async variant of `get_comment_by_post_and_id`, for views served under ASGI.
+        """
+        try:
+            return await CommentRepository.aget_comment_by_post_and_id(post_id, comment_id, fields=fields)
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when retrieving comment {comment_id} for post_id {post_id}: {e}")
+            raise e
+
+    @staticmethod
+    def get_comment_with_post_by_post_and_id(post_id, comment_id):
+        """
+        Retrieve a specific comment together with its post in a single query.
+
         :param post_id: The ID of the post the comment is associated with.
         :param comment_id: The ID of the comment to retrieve.
         :return: Comment object if found, None otherwise.
         :raises: DatabaseError if there is an error accessing the database.
         """
         try:
-            return CommentRepository.get_comment_by_post_and_id(post_id, comment_id)
+            return CommentRepository.get_comment_with_post_by_post_and_id(post_id, comment_id)
         except DatabaseError as e:
             # Log the exception (if logging is configured)
             # logger.error(f"Database error when retrieving comment {comment_id} for post_id {post_id}: {e}")
@@ -44,6 +187,7 @@ class CommentService:
         :param data: Dictionary containing the data for the new comment.
         :param post_id: The ID of the post the comment is associated with.
         :return: The newly created Comment object.
+        :raises: ObjectDoesNotExist if the post does not exist.
         :raises: DatabaseError if there is an error accessing the database.
         """
         try:
@@ -54,18 +198,55 @@ class CommentService:
             raise e
 
     @staticmethod
-    def update_comment(data, comment_id):
+    def get_existing_post_ids(post_ids):
+        """
+        Find which of the given posts exist, with a single query.
+
+        :param post_ids: Iterable of post IDs referenced by new comments.
+        :return: Set of the IDs that belong to existing posts.
+        :raises: DatabaseError if there is an error accessing the database.
+        """
+        try:
+            return set(PostRepository.get_posts_in_bulk(post_ids))
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when checking posts {post_ids}: {e}")
+            raise e
+
+    @staticmethod
+    def bulk_create_comments(data_list, batch_size=None, keep_timestamps=False):
+        """
+        Create many comments, possibly for many posts, at once.
+
+        :param data_list: List of dictionaries with 'post_id' and 'content', one per comment.
+        :param batch_size: Maximum number of rows per INSERT statement.
+        :param keep_timestamps: If True, keep the 'created_at' and 'updated_at' given in the data.
+        :return: List of the newly created Comment objects.
+        :raises: DatabaseError if there is an error accessing the database.
+        """
+        try:
+            return CommentRepository.bulk_create_comments(
+                data_list, batch_size=batch_size, keep_timestamps=keep_timestamps
+            )
+        except DatabaseError as e:
+            # Log the exception (if logging is configured)
+            # logger.error(f"Database error when bulk creating {len(data_list)} comments: {e}")
+            raise e
+
+    @staticmethod
+    def update_comment(data, comment_id, comment=None):
         """
         Update an existing comment identified by comment_id.
 
         :param data: Dictionary containing the data to update the comment with.
         :param comment_id: The ID of the comment to update.
+        :param comment: Optional Comment object already loaded, reused to avoid another SELECT.
         :return: The updated Comment object.
         :raises: ObjectDoesNotExist if the comment does not exist.
         :raises: DatabaseError if there is an error accessing the database.
         """
         try:
-            comment = CommentRepository.update_comment(data, comment_id)
+            comment = CommentRepository.update_comment(data, comment_id, comment=comment)
             if comment is None:
                 raise ObjectDoesNotExist(f"Comment with id {comment_id} does not exist.")
             return comment
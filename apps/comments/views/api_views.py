@@ -1,14 +1,48 @@
-from rest_framework import generics
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import generics, status
 from rest_framework.exceptions import NotFound, ValidationError, APIException
-from ..serializers import CommentSerializer
+from rest_framework.response import Response
+from ..pagination import CommentCursorPagination
+from ..serializers import CommentBulkItemSerializer, CommentSerializer
 from ..services.comment_service import CommentService
+from ...posts.views.mixins import ConditionalGetMixin, SparseFieldsetMixin, ValuesListMixin
 
-class CommentListCreateAPIView(generics.ListCreateAPIView):
+def parse_time_bounds(query_params):
+    """
+    Parse the 'since' and 'before' query parameters of a comment list as ISO 8601 datetimes.
+
+    :param query_params: Query parameters of the request.
+    :return: Tuple of (since, before); each is None when not provided.
+    :raises: ValidationError if a parameter is not a valid datetime.
+    """
+    bounds = []
+    for param in ("since", "before"):
+        value = query_params.get(param)
+        if not value:
+            bounds.append(None)
+            continue
+        try:
+            parsed = parse_datetime(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({param: "Enter a valid ISO 8601 datetime."})
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        bounds.append(parsed)
+    return tuple(bounds)
+
+class CommentListCreateAPIView(ConditionalGetMixin, ValuesListMixin, generics.ListCreateAPIView):
     serializer_class = CommentSerializer
+    pagination_class = CommentCursorPagination
 
     def get_queryset(self):
         """
         Retrieve the 'post_id' from the URL kwargs and fetch comments related to the given post ID using the CommentService.
+        The optional 'since' and 'before' query parameters bound the comments by creation time.
 
         :return: QuerySet of Comment objects.
         :raises: ValidationError if 'post_id' is not provided.
@@ -17,10 +51,31 @@ class CommentListCreateAPIView(generics.ListCreateAPIView):
         if not post_id:
             raise APIException("Post ID is required to fetch comments.")
         try:
-            return CommentService.get_comments_by_post_id(post_id)
+            since, before = self.get_time_bounds()
+            return CommentService.get_comments_by_post_id(post_id, since=since, before=before)
         except ValueError:
             raise APIException("Invalid Post ID format.")
 
+    def get_version(self):
+        """
+        Describe the state of the post's comments for ETag / Last-Modified validation.
+
+        :return: Version tuple computed with a single aggregate query.
+        """
+        return CommentService.get_comments_version(self.kwargs.get("post_id"))
+
+    def get_time_bounds(self):
+        """
+        Parse the 'since' and 'before' query parameters as ISO 8601 datetimes.
+
+        :return: Tuple of (since, before); each is None when not provided.
+        :raises: ValidationError if a parameter is not a valid datetime.
+        """
+        request = getattr(self, "request", None)
+        if request is None:
+            return None, None
+        return parse_time_bounds(request.query_params)
+
     def perform_create(self, serializer):
         """
         Create a new comment for the specified post using the CommentService.
@@ -33,10 +88,62 @@ class CommentListCreateAPIView(generics.ListCreateAPIView):
             raise APIException("Post ID is required to create a comment.")
         try:
             CommentService.create_comment(serializer.validated_data, post_id)
+        except ObjectDoesNotExist:
+            raise NotFound("Post not found")
         except ValueError:
             raise APIException("Invalid Post ID format.")
 
-class CommentRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class CommentBulkCreateAPIView(generics.GenericAPIView):
+    serializer_class = CommentBulkItemSerializer
+
+    def post(self, request, *args, **kwargs):
+        """
+        Create a batch of comments spanning any number of posts.
+
+        The body is a list of {"post_id", "content"} objects. Every referenced post is checked
+        with one query, the valid comments are inserted with batched multi-row INSERTs, and
+        invalid items or items referencing missing posts are reported by index.
+
+        :param request: Request whose body is a list of comment objects.
+        :return: 201 with the created IDs and per-item errors, or 400 if nothing could be created.
+        :raises: ValidationError if the body is not a non-empty list within the size limit.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"detail": "Expected a non-empty list of comments."})
+        if len(items) > settings.COMMENT_BULK_CREATE_MAX_ITEMS:
+            raise ValidationError(
+                {"detail": f"At most {settings.COMMENT_BULK_CREATE_MAX_ITEMS} comments can be created per request."}
+            )
+
+        child = self.get_serializer(many=True).child
+        validated, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                validated.append((index, child.run_validation(item)))
+            except ValidationError as e:
+                errors.append({"index": index, "errors": e.detail})
+
+        existing = CommentService.get_existing_post_ids({data["post_id"] for _, data in validated})
+        valid_items = []
+        for index, data in validated:
+            if data["post_id"] in existing:
+                valid_items.append(data)
+            else:
+                errors.append({"index": index, "errors": {"post_id": ["Post not found."]}})
+        errors.sort(key=lambda error: error["index"])
+
+        created = []
+        if valid_items:
+            created = CommentService.bulk_create_comments(
+                valid_items, batch_size=settings.COMMENT_BULK_CREATE_BATCH_SIZE
+            )
+        return Response(
+            {"created": [comment.pk for comment in created], "errors": errors},
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+        )
+
+class CommentRetrieveUpdateDestroyAPIView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = CommentSerializer
 
     def get_object(self):
@@ -52,13 +159,21 @@ class CommentRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView)
         if not post_id or not comment_id:
             raise APIException("Post ID and Comment ID are required to fetch the comment.")
         try:
-            comment = CommentService.get_comment_by_post_and_id(post_id, comment_id)
+            comment = CommentService.get_comment_by_post_and_id(post_id, comment_id, fields=self.get_columns())
             if comment is None:
                 raise NotFound("Comment not found")
             return comment
         except ValueError:
             raise APIException("Invalid Post or Comment ID format.")
 
+    def get_version(self):
+        """
+        Describe the state of the comment for ETag / Last-Modified validation.
+
+        :return: Version tuple, or None if the comment does not exist.
+        """
+        return CommentService.get_comment_version(self.kwargs.get("post_id"), self.kwargs.get("comment_pk"))
+
     def perform_update(self, serializer):
         """
         Update the specified comment using the CommentService.
@@ -70,7 +185,10 @@ class CommentRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView)
         if not comment_id:
             raise APIException("Comment ID is required to update the comment.")
         try:
-            CommentService.update_comment(serializer.validated_data, comment_id)
+            # Reuse the comment loaded by get_object: one UPDATE, no second SELECT.
+            CommentService.update_comment(serializer.validated_data, comment_id, comment=serializer.instance)
+        except ObjectDoesNotExist:
+            raise NotFound("Comment not found")
         except ValueError:
             raise APIException("Invalid Comment ID format.")
 
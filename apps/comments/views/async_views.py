@@ -0,0 +1,48 @@
+from rest_framework.exceptions import NotFound
+from ..pagination import CommentCursorPagination
+from apps.posts.serializers import ValuesListSerializer
+from ..serializers import CommentSerializer
+from ..services.comment_service import CommentService
+from .api_views import CommentListCreateAPIView, CommentRetrieveUpdateDestroyAPIView, parse_time_bounds
+from ...posts.views.async_views import AsyncReadView
+
+
+class AsyncCommentListView(AsyncReadView):
+    """
+    Async GET of the comments of a post; POST is served by CommentListCreateAPIView.
+    """
+    write_view_class = CommentListCreateAPIView
+    serializer_class = CommentSerializer
+
+    async def get_version(self):
+        return await CommentService.aget_comments_version(self.kwargs.get("post_id"))
+
+    async def get_data(self):
+        since, before = parse_time_bounds(self.api_request.query_params)
+        paginator = CommentCursorPagination()
+        serializer = ValuesListSerializer(CommentSerializer, fields=self.get_fields())
+        rows = CommentService.get_comment_rows_by_post_id(
+            self.kwargs.get("post_id"), serializer.get_columns(required=paginator.ordering), since=since, before=before
+        )
+        queryset = paginator.get_page_queryset(rows, self.api_request)
+        page = paginator.build_page([row async for row in queryset])
+        return paginator.get_paginated_response(serializer.to_representation(page)).data
+
+
+class AsyncCommentDetailView(AsyncReadView):
+    """
+    Async GET of a comment; PUT, PATCH and DELETE are served by CommentRetrieveUpdateDestroyAPIView.
+    """
+    write_view_class = CommentRetrieveUpdateDestroyAPIView
+    serializer_class = CommentSerializer
+
+    async def get_version(self):
+        return await CommentService.aget_comment_version(self.kwargs.get("post_id"), self.kwargs.get("comment_pk"))
+
+    async def get_data(self):
+        comment = await CommentService.aget_comment_by_post_and_id(
+            self.kwargs.get("post_id"), self.kwargs.get("comment_pk"), fields=self.get_columns()
+        )
+        if comment is None:
+            raise NotFound("Comment not found")
+        return CommentSerializer(comment, fields=self.get_fields()).data
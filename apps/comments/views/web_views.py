@@ -20,7 +20,7 @@ class CommentListView(ListView):
         if not post_id:
             raise ValidationError("Post ID is required to fetch comments.")
         try:
-            return CommentService.get_comments_by_post_id(post_id)
+            return CommentService.get_comment_summaries_by_post_id(post_id)
         except Exception as e:
             raise e
 
@@ -53,7 +53,7 @@ class CommentDetailView(DetailView):
         if not post_id or not comment_id:
             raise ValidationError("Post ID and Comment ID are required to fetch the comment.")
         try:
-            comment = CommentService.get_comment_by_post_and_id(post_id, comment_id)
+            comment = CommentService.get_comment_with_post_by_post_and_id(post_id, comment_id)
             if comment is None:
                 raise ObjectDoesNotExist(f"Comment with post_id {post_id} and comment_id {comment_id} not found.")
             return comment
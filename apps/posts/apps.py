@@ -1,7 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class PostsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     # This configuration specifies that this app is located at 'apps.posts'.
     name = "apps.posts"
+
+    def ready(self):
+        from .signals import restore_search_triggers
+
+        post_migrate.connect(restore_search_triggers, sender=self)
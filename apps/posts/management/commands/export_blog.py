@@ -0,0 +1,53 @@
+import sys
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ...services.export_service import ExportService
+
+
+class Command(BaseCommand):
+    """
+    Write every post and comment as NDJSON to a file or to standard output.
+
+    The export is streamed straight from the database cursor to the output, so memory
+    use stays constant however many rows there are.
+    """
+
+    help = "Export all posts and comments as NDJSON, optionally gzip-compressed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="File to write the export to, or '-' for standard output (default: -).",
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Compress the export with gzip on the fly.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.EXPORT_CHUNK_SIZE,
+            help=f"Rows fetched from the database cursor at a time (default: {settings.EXPORT_CHUNK_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size must be a positive integer.")
+
+        blocks = ExportService.iter_ndjson(chunk_size, compress=options["gzip"])
+        if options["output"] == "-":
+            self.write_blocks(blocks, sys.stdout.buffer)
+            return
+        with open(options["output"], "wb") as output:
+            written = self.write_blocks(blocks, output)
+        self.stdout.write(self.style.SUCCESS(f"Exported {written} bytes to {options['output']}."))
+
+    def write_blocks(self, blocks, output):
+        written = 0
+        for block in blocks:
+            output.write(block)
+            written += len(block)
+        return written
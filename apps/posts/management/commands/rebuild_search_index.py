@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from ...services.search_service import SearchService
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the full-text search index from the posts and comments tables.
+
+    Also restores the triggers that keep the index in sync, which SQLite drops whenever a
+    migration has to rebuild one of those tables.
+    """
+
+    help = "Re-index every post and comment for full-text search, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Range of primary keys indexed per transaction (default: 10000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be a positive integer.")
+        posts, comments = SearchService.rebuild_index(batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {posts} posts and {comments} comments."))
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:40
+
+from django.db import migrations
+
+
+# The schema is frozen here rather than imported from SearchRepository, so later changes to
+# the app code cannot change what this migration does.
+SEARCH_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS blog_search USING fts5(
+        title, body, post_id UNINDEXED, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    "INSERT INTO blog_search(blog_search, rank) VALUES ('rank', 'bm25(10.0, 1.0, 0.0)')",
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_search_post_insert AFTER INSERT ON posts_post BEGIN
+        INSERT INTO blog_search(rowid, title, body, post_id) VALUES (new.id * 2, new.title, new.content, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_search_post_update AFTER UPDATE OF title, content ON posts_post BEGIN
+        DELETE FROM blog_search WHERE rowid = old.id * 2;
+        INSERT INTO blog_search(rowid, title, body, post_id) VALUES (new.id * 2, new.title, new.content, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_search_post_delete AFTER DELETE ON posts_post BEGIN
+        DELETE FROM blog_search WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_search_comment_insert AFTER INSERT ON comments_comment BEGIN
+        INSERT INTO blog_search(rowid, body, post_id) VALUES (new.id * 2 + 1, new.content, new.post_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_search_comment_update AFTER UPDATE OF content, post_id ON comments_comment BEGIN
+        DELETE FROM blog_search WHERE rowid = old.id * 2 + 1;
+        INSERT INTO blog_search(rowid, body, post_id) VALUES (new.id * 2 + 1, new.content, new.post_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_search_comment_delete AFTER DELETE ON comments_comment BEGIN
+        DELETE FROM blog_search WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+    "INSERT INTO blog_search(rowid, title, body, post_id) SELECT id * 2, title, content, id FROM posts_post",
+    "INSERT INTO blog_search(rowid, body, post_id) SELECT id * 2 + 1, content, post_id FROM comments_comment",
+]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in SEARCH_SCHEMA:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for trigger in (
+        "blog_search_post_insert",
+        "blog_search_post_update",
+        "blog_search_post_delete",
+        "blog_search_comment_insert",
+        "blog_search_comment_update",
+        "blog_search_comment_delete",
+    ):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    schema_editor.execute("DROP TABLE IF EXISTS blog_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_post_soft_delete'),
+        ('comments', '0003_comment_post_updated_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
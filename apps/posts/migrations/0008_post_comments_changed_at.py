@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:04
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_last_commented_at(apps, schema_editor):
+    # Start from the timestamp Last-Modified was derived from, so it never moves back.
+    Post = apps.get_model("posts", "Post")
+    Post._base_manager.using(schema_editor.connection.alias).update(comments_changed_at=F("last_commented_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='posts_post_version_idx',
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comments_changed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(copy_last_commented_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['deleted_at', 'updated_at', 'comments_changed_at', 'comment_count'], name='posts_post_version_idx'),
+        ),
+    ]
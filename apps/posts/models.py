@@ -1,11 +1,72 @@
 from django.db import models
 
 
+class LivePostManager(models.Manager):
+    """
+    Default manager for Post that hides soft-deleted posts.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Post(models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized from the comments table; kept up to date by CommentRepository.
+    comment_count = models.PositiveIntegerField(default=0)
+    last_commented_at = models.DateTimeField(null=True, blank=True)
+    # Set whenever the comment stats change, including on deletions, which move last_commented_at
+    # back; it moves Last-Modified forward without touching updated_at. Not served.
+    comments_changed_at = models.DateTimeField(null=True, blank=True)
+    # Set when the post is deleted; the row and its comments are purged later in batches.
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = LivePostManager()
+    all_objects = models.Manager()  # Includes soft-deleted posts; used by the purge.
+
+    class Meta:
+        indexes = [
+            # Backs the keyset pagination of the posts list (see apps/posts/pagination.py).
+            models.Index(
+                fields=["created_at", "id"],
+                name="posts_post_created_id_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            # Covers the aggregate behind the posts list ETag, so it never reads post rows.
+            # deleted_at leads instead of being a partial-index condition, which would not cover;
+            # it also lets the purge find the soft-deleted posts without scanning the table.
+            models.Index(
+                fields=["deleted_at", "updated_at", "comments_changed_at", "comment_count"],
+                name="posts_post_version_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class ImportCheckpoint(models.Model):
+    """
+    Progress of a resumable import_blog run, saved in the transaction of every batch.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    phase = models.CharField(max_length=10)
+    # Number of input records already handled in `phase`.
+    position = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return self.name
+
+
+class ImportedPost(models.Model):
+    """
+    Legacy ID of a post created by a checkpointed import, so a resumed run can map comments to it.
+    """
+
+    checkpoint = models.ForeignKey(ImportCheckpoint, on_delete=models.CASCADE, related_name="imported_posts")
+    legacy_id = models.BigIntegerField()
+    post_id = models.BigIntegerField()  # No foreign key: purging a post must not need this table.
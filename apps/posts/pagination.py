@@ -0,0 +1,272 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Opaque-cursor pagination over a two-column keyset, ``(created_at, id)`` by default.
+
+    Every page is fetched with a range predicate on the ordering columns instead of an
+    OFFSET, so a deep page costs the same single indexed query as the first one.
+    The cursor stores the position of the boundary row and the direction to walk in.
+    """
+
+    ordering = ("created_at", "id")  # Leading column first; the second one breaks ties.
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return the rows of the requested page.
+
+        :param queryset: Unordered QuerySet to paginate.
+        :param request: The incoming request carrying the cursor and page size.
+        :return: List of rows for the current page.
+        :raises NotFound: If the cursor cannot be decoded.
+        """
+        page_queryset = self.get_page_queryset(queryset, request)
+        return self.build_page(list(page_queryset))
+
+    def get_page_queryset(self, queryset, request):
+        """
+        Apply the keyset predicate, ordering and LIMIT for the requested page.
+
+        The query is not evaluated here so callers can fetch it however they like.
+
+        :param queryset: Unordered QuerySet to paginate.
+        :param request: The incoming request carrying the cursor and page size.
+        :return: Sliced QuerySet that yields at most ``page_size + 1`` rows.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request, queryset.model)
+
+        leading, tiebreak = self.ordering
+        if self.cursor is None:
+            reverse = False
+            queryset = queryset.order_by(leading, tiebreak)
+        else:
+            position, reverse = self.cursor
+            if reverse:
+                queryset = queryset.filter(
+                    Q(**{f"{leading}__lte": position[0]}),
+                    Q(**{f"{leading}__lt": position[0]}) | Q(**{f"{tiebreak}__lt": position[1]}),
+                ).order_by(f"-{leading}", f"-{tiebreak}")
+            else:
+                queryset = queryset.filter(
+                    Q(**{f"{leading}__gte": position[0]}),
+                    Q(**{f"{leading}__gt": position[0]}) | Q(**{f"{tiebreak}__gt": position[1]}),
+                ).order_by(leading, tiebreak)
+        self.reverse = reverse
+        # Fetch one extra row to find out whether there is more to read in this direction.
+        return queryset[: self.page_size + 1]
+
+    def get_last_page_queryset(self, queryset, page_size, base_url):
+        """
+        Apply the ordering and LIMIT for the last page of the list: its newest rows.
+
+        Used to embed the end of a list in another resource. The page's previous link
+        walks back through the list served at `base_url`, `page_size` rows at a time.
+
+        :param queryset: Unordered QuerySet to paginate.
+        :param page_size: Number of rows on the page.
+        :param base_url: Absolute URL of the list endpoint.
+        :return: Sliced QuerySet that yields at most ``page_size + 1`` rows, newest first.
+        """
+        self.base_url = replace_query_param(base_url, self.page_size_query_param, page_size)
+        self.page_size = page_size
+        self.cursor = None
+        self.reverse = True
+        leading, tiebreak = self.ordering
+        return queryset.order_by(f"-{leading}", f"-{tiebreak}")[: page_size + 1]
+
+    def build_page(self, rows):
+        """
+        Trim the look-ahead row and work out which neighbouring pages exist.
+
+        :param rows: Rows fetched from the queryset returned by `get_page_queryset`.
+        :return: List of rows for the current page, in ascending order.
+        """
+        has_more = len(rows) > self.page_size
+        page = rows[: self.page_size]
+        if self.reverse:
+            page.reverse()
+            # Without a cursor this is the last page (see `get_last_page_queryset`).
+            self.has_previous, self.has_next = has_more, self.cursor is not None
+        else:
+            self.has_previous, self.has_next = self.cursor is not None, has_more
+        self.page = page
+        return page
+
+    def get_page_size(self, request, query_param=None):
+        """
+        Read the page size from the query string, bounded by `max_page_size`.
+
+        :param request: The incoming request.
+        :param query_param: Name of the query parameter, `page_size_query_param` by default.
+        :return: Number of rows to return per page.
+        """
+        try:
+            requested = int(request.query_params[query_param or self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if requested <= 0:
+            return self.page_size
+        return min(requested, self.max_page_size)
+
+    def decode_cursor(self, request, model):
+        """
+        Decode the opaque cursor from the query string.
+
+        :param request: The incoming request.
+        :param model: Model being paginated, used to validate the stored position.
+        :return: Tuple of (position, reverse), or None when no cursor was sent.
+        :raises NotFound: If the cursor is malformed.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            position = self.parse_position(payload["p"], model)
+            reverse = bool(payload.get("r"))
+        except (TypeError, ValueError, KeyError, UnicodeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        if any(value is None for value in position):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def parse_position(self, values, model):
+        """
+        Convert the position stored in a cursor back to column values.
+
+        :param values: List of JSON values read from the cursor.
+        :param model: Model being paginated.
+        :return: Tuple of column values, in `ordering` order.
+        :raises ValueError: If the values do not fit the ordering columns.
+        """
+        return tuple(
+            model._meta.get_field(name).to_python(value)
+            for name, value in zip(self.ordering, values, strict=True)
+        )
+
+    def encode_cursor(self, row, reverse):
+        """
+        Build the URL that points at the page after (or before) the given row.
+
+        :param row: Boundary row of the current page.
+        :param reverse: True to walk backwards from the row.
+        :return: Absolute URL with the encoded cursor.
+        """
+        position = [self.get_position_value(row, name) for name in self.ordering]
+        payload = {"p": [value.isoformat() if hasattr(value, "isoformat") else value for value in position]}
+        if reverse:
+            payload["r"] = 1
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode("ascii")
+        ).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_position_value(self, row, name):
+        """
+        Read one ordering column from a page row.
+
+        :param row: Model instance of the current page.
+        :param name: Name of the ordering column.
+        :return: Value of the column.
+        """
+        return getattr(row, name)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Walking backwards past the start leaves nothing to anchor on; restart.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class PostCursorPagination(KeysetCursorPagination):
+    """
+    Cursor pagination for the posts list, ordered oldest first on ``(created_at, id)``.
+    """
+
+    ordering = ("created_at", "id")
+
+
+class SearchCursorPagination(KeysetCursorPagination):
+    """
+    Forward-only cursor pagination for full-text search hits, ordered on ``(rank, id)``.
+
+    Hits are dictionaries returned by a search callable rather than model instances, and
+    the keyset is applied by that callable. Relevance has no natural way back, so only
+    a next link is provided.
+    """
+
+    ordering = ("rank", "id")
+
+    def paginate_search(self, search, request):
+        """
+        Return the hits of the requested page.
+
+        :param search: Callable taking `after` (a (rank, id) tuple or None) and `limit`.
+        :param request: The incoming request carrying the cursor and page size.
+        :return: List of hits for the current page.
+        :raises NotFound: If the cursor cannot be decoded.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request, None)
+        if self.cursor is not None and self.cursor[1]:
+            raise NotFound(self.invalid_cursor_message)
+        self.reverse = False
+        after = self.cursor[0] if self.cursor is not None else None
+        return self.build_page(search(after=after, limit=self.page_size + 1))
+
+    def parse_position(self, values, model):
+        rank, post_id = values
+        return float(rank), int(post_id)
+
+    def get_position_value(self, row, name):
+        return row[name]
+
+    def get_previous_link(self):
+        return None
@@ -0,0 +1,153 @@
+import threading
+from itertools import islice
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from my_project_blog.routers import use_primary
+
+
+class ReadThroughCache:
+    """
+    Read-through cache for single-object repository lookups, backed by Django's cache framework.
+
+    Objects are stored under ``<prefix>:<key parts>`` for REPOSITORY_CACHE_TTL seconds.
+    Misses (None) are never cached, so a lookup for a missing row always reaches the
+    database. Repositories are responsible for invalidating keys on every write.
+
+    Objects are loaded from the primary database: a cached row outlives the replication
+    lag, so one loaded from a lagging replica could stay stale for the whole TTL.
+    """
+
+    def __init__(self, prefix):
+        """
+        :param prefix: Namespace for the keys of this cache, e.g. "post".
+        """
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()  # Guards the counters only, never the cache itself.
+
+    @property
+    def backend(self):
+        return caches[settings.REPOSITORY_CACHE_ALIAS]
+
+    def make_key(self, *parts):
+        """
+        Build the cache key for the given identifying parts.
+
+        :param parts: Values identifying the object, e.g. its primary key.
+        :return: Cache key string.
+        """
+        return ":".join([self.prefix, *(str(part) for part in parts)])
+
+    def get_or_load(self, parts, loader):
+        """
+        Return the cached object for `parts`, loading and caching it on a miss.
+
+        :param parts: Tuple of values identifying the object.
+        :param loader: Callable returning the object from the database, or None.
+        :return: The cached or freshly loaded object, or None if it does not exist.
+        """
+        key = self.make_key(*parts)
+        value = self.backend.get(key)
+        if value is not None:
+            self._count(hit=True)
+            return value
+        self._count(hit=False)
+        with use_primary():
+            value = loader()
+        if value is not None:
+            self.backend.set(key, value, settings.REPOSITORY_CACHE_TTL)
+        return value
+
+    async def aget_or_load(self, parts, loader):
+        """
+        Async variant of `get_or_load`.
+
+        :param parts: Tuple of values identifying the object.
+        :param loader: Coroutine function returning the object from the database, or None.
+        :return: The cached or freshly loaded object, or None if it does not exist.
+        """
+        key = self.make_key(*parts)
+        value = await self.backend.aget(key)
+        if value is not None:
+            self._count(hit=True)
+            return value
+        self._count(hit=False)
+        with use_primary():
+            value = await loader()
+        if value is not None:
+            await self.backend.aset(key, value, settings.REPOSITORY_CACHE_TTL)
+        return value
+
+    def peek(self, parts):
+        """
+        Return the cached object for `parts` without loading it on a miss.
+
+        Peeks are opportunistic (a version lookup, a sparse read) and often precede a
+        `get_or_load` of the same key, so they are not counted in the hit/miss stats.
+
+        :param parts: Tuple of values identifying the object.
+        :return: The cached object, or None if it is not cached.
+        """
+        return self.backend.get(self.make_key(*parts))
+
+    async def apeek(self, parts):
+        """
+        Async variant of `peek`.
+        """
+        return await self.backend.aget(self.make_key(*parts))
+
+    def invalidate(self, *parts):
+        """
+        Drop the cached object identified by `parts`.
+
+        Inside a transaction the key is dropped again on commit, because a concurrent
+        reader may re-cache the old row before the new one becomes visible.
+
+        :param parts: Values identifying the object.
+        """
+        key = self.make_key(*parts)
+        self.backend.delete(key)
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self.backend.delete(key))
+
+    def invalidate_many(self, parts_list, batch_size=1000):
+        """
+        Drop several cached objects, `batch_size` keys per backend call.
+
+        :param parts_list: Iterable of tuples identifying the objects.
+        :param batch_size: Maximum number of keys sent to the backend at once.
+        """
+        in_atomic_block = transaction.get_connection().in_atomic_block
+        parts_iter = iter(parts_list)
+        while keys := [self.make_key(*parts) for parts in islice(parts_iter, batch_size)]:
+            self.backend.delete_many(keys)
+            if in_atomic_block:
+                transaction.on_commit(lambda keys=keys: self.backend.delete_many(keys))
+
+    def stats(self):
+        """
+        Return the hit/miss counters of this process.
+
+        :return: Dictionary with 'hits' and 'misses'.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+# Shared instances used by PostRepository and CommentRepository.
+post_cache = ReadThroughCache("post")
+comment_cache = ReadThroughCache("comment")
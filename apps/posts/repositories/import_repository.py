@@ -0,0 +1,62 @@
+from ..models import ImportCheckpoint, ImportedPost
+
+
+class ImportRepository:
+    """
+    Repository class for the progress of resumable imports (see the import_blog command).
+    """
+
+    @staticmethod
+    def get_checkpoint(name):
+        """
+        :param name: Name of the checkpoint.
+        :return: Tuple of (phase, position), or None if no import was checkpointed under 'name'.
+        """
+        return ImportCheckpoint.objects.filter(name=name).values_list("phase", "position").first()
+
+    @staticmethod
+    def iter_imported_posts(name):
+        """
+        Stream the (legacy ID, new ID) pairs of the posts imported under a checkpoint.
+
+        :param name: Name of the checkpoint.
+        :return: Iterator of (legacy_id, post_id) tuples, in import order.
+        """
+        return (
+            ImportedPost.objects.filter(checkpoint__name=name)
+            .order_by("id")
+            .values_list("legacy_id", "post_id")
+            .iterator(chunk_size=10000)
+        )
+
+    @staticmethod
+    def save_progress(name, phase, position, imported_posts=()):
+        """
+        Record the progress of an import, and the legacy IDs of the posts it just created.
+
+        Called inside the transaction of the batch it describes, so the batch and its
+        checkpoint are committed, or rolled back, together.
+
+        :param name: Name of the checkpoint.
+        :param phase: Record type being imported, "post" or "comment", or "done".
+        :param position: Number of input records handled in 'phase'.
+        :param imported_posts: Iterable of (legacy_id, post_id) pairs to record.
+        """
+        checkpoint, _ = ImportCheckpoint.objects.update_or_create(
+            name=name, defaults={"phase": phase, "position": position}
+        )
+        ImportedPost.objects.bulk_create(
+            [
+                ImportedPost(checkpoint=checkpoint, legacy_id=legacy_id, post_id=post_id)
+                for legacy_id, post_id in imported_posts
+            ]
+        )
+
+    @staticmethod
+    def delete_checkpoint(name):
+        """
+        Forget a checkpoint and the legacy IDs recorded under it.
+
+        :param name: Name of the checkpoint.
+        """
+        ImportCheckpoint.objects.filter(name=name).delete()
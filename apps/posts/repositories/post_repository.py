@@ -1,5 +1,26 @@
 from ..models import Post
+from apps.comments.models import Comment
+from .cache import comment_cache, post_cache
+from .timestamps import restore_timestamps
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+
+# Aggregates and columns describing the version of the posts list and of one post (see ETags).
+# The list aggregates run over all_objects: the latest soft deletion moves Last-Modified forward.
+LIVE_POSTS = Q(deleted_at__isnull=True)
+POSTS_VERSION_AGGREGATES = {
+    "count": Count("id", filter=LIVE_POSTS),
+    "updated_at": Max("updated_at", filter=LIVE_POSTS),
+    "comments_changed_at": Max("comments_changed_at", filter=LIVE_POSTS),
+    "comments": Sum("comment_count", filter=LIVE_POSTS),
+    "deleted_at": Max("deleted_at"),
+}
+POST_VERSION_FIELDS = ("updated_at", "comment_count", "last_commented_at", "comments_changed_at")
+
+# Columns written for each post by the NDJSON export.
+EXPORT_FIELDS = ("id", "title", "content", "created_at", "updated_at", "comment_count", "last_commented_at")
 
 
 class PostRepository:
@@ -17,20 +38,165 @@ class PostRepository:
         return Post.objects.all()
 
     @staticmethod
-    def get_post_by_id(post_id):
+    def get_post_rows(columns):
+        """
+        Fetch all posts as named tuples of the given columns, without instantiating models.
+
+        :param columns: Model field names to select.
+        :return: QuerySet of named tuples.
         """
-        Fetch a specific post by its primary key (ID).
+        return Post.objects.values_list(*columns, named=True)
+
+    @staticmethod
+    def get_post_by_id(post_id, fields=None):
+        """
+        Fetch a specific post by its primary key (ID), through the read-through cache.
+
+        When `fields` is given and the post is not cached, only those columns are read
+        and the partial post is not cached, as other callers expect complete posts.
 
         :param post_id: Primary key of the post to fetch.
+        :param fields: Optional model field names to load; the other columns are deferred.
         :return: Post object if found, None otherwise.
         :raises: ValidationError if 'post_id' is not provided.
         """
         if not post_id:
             raise ValidationError("Post ID is required to fetch the post.")
-        try:
-            return Post.objects.get(pk=post_id)
-        except Post.DoesNotExist:
+        if fields is not None:
+            post = post_cache.peek((post_id,))
+            if post is not None:
+                return post
+            return Post.objects.only(*fields).filter(pk=post_id).first()
+
+        def load():
+            try:
+                return Post.objects.get(pk=post_id)
+            except Post.DoesNotExist:
+                return None
+
+        return post_cache.get_or_load((post_id,), load)
+
+    @staticmethod
+    async def aget_post_by_id(post_id, fields=None):
+        """
+        Async variant of `get_post_by_id`.
+
+        :param post_id: Primary key of the post to fetch.
+        :param fields: Optional model field names to load; the other columns are deferred.
+        :return: Post object if found, None otherwise.
+        :raises: ValidationError if 'post_id' is not provided.
+        """
+        if not post_id:
+            raise ValidationError("Post ID is required to fetch the post.")
+        if fields is not None:
+            post = await post_cache.apeek((post_id,))
+            if post is not None:
+                return post
+            return await Post.objects.only(*fields).filter(pk=post_id).afirst()
+
+        async def load():
+            try:
+                return await Post.objects.aget(pk=post_id)
+            except Post.DoesNotExist:
+                return None
+
+        return await post_cache.aget_or_load((post_id,), load)
+
+    @staticmethod
+    def iter_posts_for_export(chunk_size):
+        """
+        Stream every post as a dictionary of its columns, in primary key order.
+
+        Rows are fetched from a single cursor `chunk_size` at a time and never cached on
+        a QuerySet, so memory use does not grow with the number of posts.
+
+        :param chunk_size: Number of rows fetched from the database cursor at a time.
+        :return: Iterator of dictionaries.
+        """
+        return (
+            Post.objects.order_by("pk")
+            .values(*EXPORT_FIELDS)
+            .iterator(chunk_size=chunk_size)
+        )
+
+    @staticmethod
+    def get_posts_in_bulk(post_ids):
+        """
+        Fetch several posts by ID with a single query, loading only their IDs.
+
+        :param post_ids: Iterable of post primary keys.
+        :return: Dictionary mapping each existing post ID to a Post object.
+        """
+        return Post.objects.only("id").in_bulk(post_ids)
+
+    @staticmethod
+    def get_posts_version():
+        """
+        Describe the current state of the posts table with one aggregate query.
+
+        The query is answered from the posts_post_version_idx covering index, so no row
+        (and no post content) is read. Soft-deleted posts waiting for the purge are part
+        of it: a deletion only lowers the count, which If-Modified-Since cannot see, so
+        the latest deleted_at counts as a modification.
+
+        :return: Tuple of (last modification datetime or None, row count, total comments).
+        """
+        return PostRepository._posts_version(Post.all_objects.aggregate(**POSTS_VERSION_AGGREGATES))
+
+    @staticmethod
+    async def aget_posts_version():
+        """
+        Async variant of `get_posts_version`.
+        """
+        return PostRepository._posts_version(await Post.all_objects.aaggregate(**POSTS_VERSION_AGGREGATES))
+
+    @staticmethod
+    def get_post_version(post_id):
+        """
+        Describe the current state of a post without instantiating it.
+
+        The cached post is used when present; otherwise only the version columns are read.
+
+        :param post_id: Primary key of the post.
+        :return: Tuple of (last modification datetime, comment count, last comment datetime),
+                 or None if the post does not exist.
+        :raises: ValidationError if 'post_id' is not provided.
+        """
+        if not post_id:
+            raise ValidationError("Post ID is required to fetch the post.")
+        post = post_cache.peek((post_id,))
+        if post is not None:
+            return PostRepository._post_version(tuple(getattr(post, field) for field in POST_VERSION_FIELDS))
+        return PostRepository._post_version(
+            Post.objects.filter(pk=post_id).values_list(*POST_VERSION_FIELDS).first()
+        )
+
+    @staticmethod
+    async def aget_post_version(post_id):
+        """
+        Async variant of `get_post_version`.
+        """
+        if not post_id:
+            raise ValidationError("Post ID is required to fetch the post.")
+        post = await post_cache.apeek((post_id,))
+        if post is not None:
+            return PostRepository._post_version(tuple(getattr(post, field) for field in POST_VERSION_FIELDS))
+        return PostRepository._post_version(
+            await Post.objects.filter(pk=post_id).values_list(*POST_VERSION_FIELDS).afirst()
+        )
+
+    @staticmethod
+    def _posts_version(stats):
+        timestamps = (stats["updated_at"], stats["comments_changed_at"], stats["deleted_at"])
+        last_modified = max((value for value in timestamps if value is not None), default=None)
+        return last_modified, stats["count"], stats["comments"] or 0
+
+    @staticmethod
+    def _post_version(row):
+        if row is None:
             return None
+        updated_at, comment_count, last_commented_at, comments_changed_at = row
+        return max(updated_at, comments_changed_at or updated_at), comment_count, last_commented_at
 
     @staticmethod
     def create_post(data):
@@ -43,12 +209,38 @@ class PostRepository:
         return Post.objects.create(**data)
 
     @staticmethod
-    def update_post(data, post_id):
+    def bulk_create_posts(data_list, batch_size=None, keep_timestamps=False):
+        """
+        Create many posts in one transaction with multi-row INSERTs.
+
+        :param data_list: List of dictionaries of data, one per post.
+        :param batch_size: Maximum number of rows per INSERT statement (None lets Django decide).
+        :param keep_timestamps: If True, save the 'created_at' and 'updated_at' given in every
+                                dictionary instead of the current time (used by imports).
+        :return: List of the newly created Post objects, with their IDs set.
+        """
+        with transaction.atomic():
+            posts = Post.objects.bulk_create(
+                [Post(**data) for data in data_list], batch_size=batch_size
+            )
+            if keep_timestamps:
+                restore_timestamps(Post, posts, data_list, batch_size=batch_size)
+            return posts
+
+    @staticmethod
+    def update_post(data, post_id, post=None):
         """
         Update an existing post with the provided data.
 
+        Every given field is written, with a single UPDATE statement. The post held by the
+        caller may be a cached or outdated copy, so it is never used to skip the write:
+        as before, the last writer wins. When the caller already holds the post it is
+        reused and updated in place, so the whole update costs one query and no SELECT is
+        needed to return the fresh row.
+
         :param data: Dictionary of data to update the post.
         :param post_id: Primary key of the post to update.
+        :param post: Optional Post object already loaded for 'post_id'.
         :return: Updated Post object.
         :raises: ValidationError if 'post_id' is not provided.
         :raises: ObjectDoesNotExist if the post is not found.
@@ -56,10 +248,15 @@ class PostRepository:
         if not post_id:
             raise ValidationError("Post ID is required to update the post.")
         try:
-            post = Post.objects.get(pk=post_id)
-            for attr, value in data.items():
+            if post is None:
+                post = Post.objects.get(pk=post_id)
+            changes = dict(data)
+            changes["updated_at"] = timezone.now()  # Queryset updates skip auto_now.
+            if not Post.objects.filter(pk=post.pk).update(**changes):
+                raise Post.DoesNotExist
+            for attr, value in changes.items():
                 setattr(post, attr, value)  # Dynamically update each attribute
-            post.save()
+            post_cache.invalidate(post_id)
             return post
         except Post.DoesNotExist:
             raise ObjectDoesNotExist(f"Post with ID {post_id} does not exist.")
@@ -67,7 +264,13 @@ class PostRepository:
     @staticmethod
     def delete_post(post_id):
         """
-        Delete a post by its primary key (ID).
+        Soft-delete a post by its primary key (ID).
+
+        The post is only marked as deleted, with a single-row UPDATE, so it stops being
+        served at once without holding the write lock for the cascade. Its comments and
+        the row itself are removed later, in batches, by the purge_deleted_posts command.
+        The cached copies of the post and of its comments are dropped, so none of them
+        is served from the cache either.
 
         :param post_id: Primary key of the post to delete.
         :raises: ValidationError if 'post_id' is not provided.
@@ -75,8 +278,39 @@ class PostRepository:
         """
         if not post_id:
             raise ValidationError("Post ID is required to delete the post.")
-        try:
-            post = Post.objects.get(pk=post_id)
-            post.delete()
-        except Post.DoesNotExist:
+        if not Post.objects.filter(pk=post_id).update(deleted_at=timezone.now()):
             raise ObjectDoesNotExist(f"Post with ID {post_id} does not exist.")
+        post_cache.invalidate(post_id)
+        # The comment IDs are read from the (post_id, created_at, id) index, without loading rows.
+        comment_ids = Comment.objects.filter(post_id=post_id).values_list("pk", flat=True).iterator()
+        comment_cache.invalidate_many((post_id, comment_id) for comment_id in comment_ids)
+
+    @staticmethod
+    def get_deleted_post_ids(limit=1000):
+        """
+        Fetch the IDs of soft-deleted posts waiting to be purged, oldest deletion first.
+
+        The lookup is a range scan of the posts_post_version_idx index, led by deleted_at.
+
+        :param limit: Maximum number of IDs to return.
+        :return: List of post primary keys.
+        """
+        return list(
+            Post.all_objects.filter(deleted_at__isnull=False)
+            .order_by("deleted_at")
+            .values_list("pk", flat=True)[:limit]
+        )
+
+    @staticmethod
+    def purge_post(post_id):
+        """
+        Permanently delete a soft-deleted post.
+
+        Its comments are expected to be purged first, so the cascade has nothing left to load.
+
+        :param post_id: Primary key of the soft-deleted post.
+        :return: True if the post was deleted, False if it was not soft-deleted.
+        """
+        with transaction.atomic():
+            deleted, _ = Post.all_objects.filter(pk=post_id, deleted_at__isnull=False).delete()
+        return bool(deleted)
@@ -0,0 +1,193 @@
+import html
+from django.db import DEFAULT_DB_ALIAS, connection, connections, router, transaction
+from ..models import Post
+
+# Every post and every comment is one document of the blog_search FTS5 table. Posts use
+# rowid 2 * id and comments 2 * id + 1, so both fit in one table and share BM25 statistics;
+# post_id records the post a document belongs to. Triggers keep the table in sync with
+# every write, including bulk_create and queryset updates.
+SEARCH_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS blog_search USING fts5(
+        title, body, post_id UNINDEXED, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    # Titles weigh ten times as much as bodies in the BM25 rank.
+    "INSERT INTO blog_search(blog_search, rank) VALUES ('rank', 'bm25(10.0, 1.0, 0.0)')",
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_search_post_insert AFTER INSERT ON posts_post BEGIN
+        INSERT INTO blog_search(rowid, title, body, post_id) VALUES (new.id * 2, new.title, new.content, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_search_post_update AFTER UPDATE OF title, content ON posts_post BEGIN
+        DELETE FROM blog_search WHERE rowid = old.id * 2;
+        INSERT INTO blog_search(rowid, title, body, post_id) VALUES (new.id * 2, new.title, new.content, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_search_post_delete AFTER DELETE ON posts_post BEGIN
+        DELETE FROM blog_search WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_search_comment_insert AFTER INSERT ON comments_comment BEGIN
+        INSERT INTO blog_search(rowid, body, post_id) VALUES (new.id * 2 + 1, new.content, new.post_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_search_comment_update AFTER UPDATE OF content, post_id ON comments_comment BEGIN
+        DELETE FROM blog_search WHERE rowid = old.id * 2 + 1;
+        INSERT INTO blog_search(rowid, body, post_id) VALUES (new.id * 2 + 1, new.content, new.post_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_search_comment_delete AFTER DELETE ON comments_comment BEGIN
+        DELETE FROM blog_search WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+]
+
+# Snippet markers: control characters that cannot appear in escaped HTML, swapped for <mark>.
+MARK_START, MARK_END = "\x02", "\x03"
+
+
+class SearchRepository:
+    """
+    Repository class for full-text search over posts and their comments (SQLite FTS5).
+    """
+
+    @staticmethod
+    def create_schema(using=DEFAULT_DB_ALIAS):
+        """
+        Create the blog_search table and the triggers that keep it in sync, if missing.
+
+        SQLite migrations that rebuild posts_post or comments_comment drop their triggers;
+        a post_migrate handler and the rebuild_search_index command call this to restore them.
+
+        :param using: Alias of the database to create the schema in.
+        """
+        with connections[using].cursor() as cursor:
+            for statement in SEARCH_SCHEMA:
+                cursor.execute(statement)
+
+    @staticmethod
+    def rebuild(batch_size):
+        """
+        Re-index every post and comment, `batch_size` IDs per transaction.
+
+        The table is recreated first, with its triggers, so writes made while the rebuild
+        runs are indexed by the triggers and never lost. Rows are then copied over in
+        short transactions, so other writers are never locked out for long.
+
+        :param batch_size: Range of primary keys indexed per transaction.
+        :return: Tuple of (posts indexed, comments indexed).
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS blog_search")
+            SearchRepository.create_schema()
+
+        counts = []
+        for table, columns in (
+            ("posts_post", "id * 2, title, content, id"),
+            ("comments_comment", "id * 2 + 1, NULL, content, post_id"),
+        ):
+            indexed = 0
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT MAX(id) FROM {table}")
+                max_id = cursor.fetchone()[0] or 0
+                for start in range(0, max_id, batch_size):
+                    with transaction.atomic():
+                        # OR REPLACE: a trigger may have indexed the row since the table was recreated.
+                        cursor.execute(
+                            f"INSERT OR REPLACE INTO blog_search(rowid, title, body, post_id) "
+                            f"SELECT {columns} FROM {table} WHERE id > %s AND id <= %s",
+                            [start, start + batch_size],
+                        )
+                        indexed += cursor.rowcount
+            counts.append(indexed)
+
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO blog_search(blog_search) VALUES ('optimize')")
+        return tuple(counts)
+
+    @staticmethod
+    def search(terms, limit, after=None):
+        """
+        Find the live posts whose title, content or comments match every search term.
+
+        Posts are ranked by the best BM25 rank among their documents (lower is better),
+        ties broken by ID, and paged with a keyset on (rank, id). Each hit carries a
+        snippet of its best-matching document with the terms wrapped in <mark>.
+
+        :param terms: List of search terms; a term ending with '*' matches as a prefix.
+        :param limit: Maximum number of posts to return.
+        :param after: Optional (rank, id) of the last post of the previous page.
+        :return: List of dictionaries with 'id', 'title', 'rank' and 'snippet'.
+        """
+        match = SearchRepository.build_match_query(terms)
+        having, params = "", [match]
+        if after is not None:
+            having = "HAVING best_rank > %s OR (best_rank = %s AND blog_search.post_id > %s)"
+            params += [after[0], after[0], after[1]]
+        # Raw SQL bypasses the database router; ask it where the query should go.
+        with connections[router.db_for_read(Post)].cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT blog_search.post_id, MIN(blog_search.rank) AS best_rank, blog_search.rowid, posts_post.title
+                FROM blog_search
+                JOIN posts_post ON posts_post.id = blog_search.post_id
+                WHERE blog_search MATCH %s AND posts_post.deleted_at IS NULL
+                GROUP BY blog_search.post_id
+                {having}
+                ORDER BY best_rank, blog_search.post_id
+                LIMIT %s
+                """,
+                params + [limit],
+            )
+            hits = cursor.fetchall()
+            if not hits:
+                return []
+            # Snippets are only built for the documents of this page.
+            placeholders = ", ".join(["%s"] * len(hits))
+            cursor.execute(
+                f"""
+                SELECT rowid, snippet(blog_search, -1, '{MARK_START}', '{MARK_END}', '…', 16)
+                FROM blog_search
+                WHERE blog_search MATCH %s AND rowid IN ({placeholders})
+                """,
+                [match] + [hit[2] for hit in hits],
+            )
+            snippets = dict(cursor.fetchall())
+        return [
+            {
+                "id": post_id,
+                "title": title,
+                "rank": rank,
+                "snippet": SearchRepository.format_snippet(snippets.get(document, "")),
+            }
+            for post_id, rank, document, title in hits
+        ]
+
+    @staticmethod
+    def build_match_query(terms):
+        """
+        Turn plain search terms into an FTS5 query that cannot be a syntax error.
+
+        Every term is quoted as a string, so FTS5 operators typed by users are searched
+        literally; the terms are combined with an implicit AND.
+
+        :param terms: List of search terms; a term ending with '*' matches as a prefix.
+        :return: FTS5 MATCH expression.
+        """
+        parts = []
+        for term in terms:
+            prefix = term.endswith("*")
+            term = term.rstrip("*")
+            if term:
+                parts.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+        return " ".join(parts)
+
+    @staticmethod
+    def format_snippet(snippet):
+        return html.escape(snippet).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
@@ -0,0 +1,24 @@
+def restore_timestamps(model, objs, data_list, batch_size=None):
+    """
+    Write the timestamps given in `data_list` over those bulk_create just saved for `objs`.
+
+    bulk_create always stamps auto_now / auto_now_add fields with the current time. Imports
+    keep the original timestamps by updating them afterwards, in the same transaction,
+    rather than switching the flags off on the shared model fields, which would also
+    affect every other thread saving this model meanwhile.
+
+    :param model: Model class of `objs`.
+    :param objs: Instances returned by bulk_create, in the order of `data_list`.
+    :param data_list: Dictionaries the instances were created from; each carries every
+                      auto_now / auto_now_add field of the model.
+    :param batch_size: Maximum number of rows per UPDATE statement (None lets Django decide).
+    """
+    fields = [
+        field.name
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    for obj, data in zip(objs, data_list):
+        for name in fields:
+            setattr(obj, name, data[name])
+    model._base_manager.bulk_update(objs, fields, batch_size=batch_size)
@@ -1,12 +1,102 @@
-from rest_framework import serializers
+import datetime
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 from .models import Post
 
 
+# Base ModelSerializer whose representation can be narrowed to a subset of its fields (sparse fieldsets).
+# Pass fields=("id", "title") to keep only those; views read them from the ?fields= query parameter.
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
 # Serializer for the Post model
 # This class is responsible for converting Post instances into JSON data and validating incoming data for creating or updating posts.
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(DynamicFieldsModelSerializer):
 
     # Meta class specifies the model and fields to be used by the serializer.
     class Meta:
         model = Post  # The model associated with this serializer. It tells DRF which model the serializer will be handling.
-        fields = "__all__"  # Specifies that all fields from the model should be included in the serialization and deserialization process.
+        exclude = ("comments_changed_at",)  # All fields of the model but this one, which only feeds Last-Modified.
+        read_only_fields = ("comment_count", "last_commented_at")  # Maintained by CommentRepository, never written by clients.
+
+
+# Read-only serializer producing the same output as a ModelSerializer straight from values_list() rows.
+# Building a model instance and running every DRF field for each row dominates the cost of large lists;
+# here each field is compiled once into a plain converter applied to its column (see ValuesListMixin).
+class ValuesListSerializer:
+
+    def __init__(self, serializer_class, fields=None):
+        """
+        :param serializer_class: ModelSerializer whose representation is reproduced.
+        :param fields: Optional sparse fieldset, as for DynamicFieldsModelSerializer.
+        :raises ImproperlyConfigured: If a field is not read from a column of the model.
+        """
+        model = serializer_class.Meta.model
+        columns = {field.name for field in model._meta.concrete_fields}
+        self.names, self.columns, self.converters = [], [], []
+        for name, field in serializer_class(fields=fields).fields.items():
+            if field.write_only:
+                continue
+            if field.source not in columns:
+                raise ImproperlyConfigured(f"{serializer_class.__name__}.{name} is not a column of {model.__name__}.")
+            self.names.append(name)
+            self.columns.append(field.source)
+            self.converters.append(compile_converter(field))
+
+    def get_columns(self, required=()):
+        """
+        :param required: Columns to select in any case, after the serialized ones (e.g. the pagination keyset).
+        :return: Tuple of the columns to pass to values_list().
+        """
+        return (*self.columns, *(column for column in required if column not in self.columns))
+
+    def to_representation(self, rows):
+        """
+        :param rows: Tuples whose leading items are the values of `get_columns()`, in order.
+        :return: List of dictionaries, equal to the ModelSerializer's data for the same rows.
+        """
+        names, converters = self.names, self.converters
+        return [
+            {name: None if value is None else convert(value) for name, convert, value in zip(names, converters, row)}
+            for row in rows
+        ]
+
+
+def compile_converter(field):
+    """
+    Build a function turning a column value into the representation of a DRF field.
+
+    Values are never None (the serializer renders those as null without calling the field).
+    Datetimes are converted to the time zone active now, so build converters per request.
+
+    :param field: Bound DRF field.
+    :return: Callable taking the column value.
+    """
+    if isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+        if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+            return field.to_representation
+
+        is_utc = field_timezone is datetime.timezone.utc or getattr(field_timezone, "key", None) == "UTC"
+
+        def convert_datetime(value):
+            # The database backend returns UTC datetimes; only other time zones need converting.
+            if not (is_utc and value.tzinfo is datetime.timezone.utc):
+                value = value.astimezone(field_timezone)
+            value = value.isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+        return convert_datetime
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        return lambda value: value  # values_list() already returns the related primary key.
+    if type(field) in (serializers.IntegerField, serializers.CharField):
+        return int if isinstance(field, serializers.IntegerField) else str
+    return field.to_representation
@@ -0,0 +1,85 @@
+import zlib
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from ..repositories.post_repository import PostRepository
+from apps.comments.repositories.comment_repository import CommentRepository
+
+
+class ExportService:
+    """
+    Service class for exporting the whole blog as NDJSON (one JSON object per line).
+
+    Every post is written first, then every comment, each line tagged with its "type".
+    Output is produced as a stream of byte blocks, so an export of any size is written
+    with a constant amount of memory.
+    """
+
+    # Lines are grouped into blocks of about this many bytes before being yielded.
+    block_size = 64 * 1024
+
+    @staticmethod
+    def iter_ndjson(chunk_size, compress=False):
+        """
+        Stream the export as blocks of bytes.
+
+        :param chunk_size: Number of rows fetched from the database cursor at a time.
+        :param compress: If True, the blocks form a gzip stream compressed on the fly.
+        :return: Iterator of bytes.
+        """
+        blocks = ExportService._iter_blocks(chunk_size)
+        if compress:
+            return ExportService._gzip(blocks)
+        return blocks
+
+    @staticmethod
+    async def aiter_ndjson(chunk_size, compress=False):
+        """
+        Async variant of `iter_ndjson`, for responses served under ASGI.
+
+        Django reads a synchronous iterator of a streaming response into a list before
+        sending it under ASGI, so the export would be held in memory whole. Here every
+        block is pulled from `iter_ndjson` in the thread that owns the database
+        connection, and sent as soon as it is produced.
+
+        :param chunk_size: Number of rows fetched from the database cursor at a time.
+        :param compress: If True, the blocks form a gzip stream compressed on the fly.
+        :return: Async iterator of bytes.
+        """
+        blocks = ExportService.iter_ndjson(chunk_size, compress=compress)
+        next_block = sync_to_async(next, thread_sensitive=True)
+        try:
+            while (block := await next_block(blocks, None)) is not None:
+                yield block
+        finally:
+            # Close the database cursor in its own thread, also when the client goes away.
+            await sync_to_async(blocks.close, thread_sensitive=True)()
+
+    @staticmethod
+    def _iter_records(chunk_size):
+        for row in PostRepository.iter_posts_for_export(chunk_size):
+            yield {"type": "post", **row}
+        for row in CommentRepository.iter_comments_for_export(chunk_size):
+            yield {"type": "comment", **row}
+
+    @staticmethod
+    def _iter_blocks(chunk_size):
+        encoder = DjangoJSONEncoder(separators=(",", ":"))
+        block, size = [], 0
+        for record in ExportService._iter_records(chunk_size):
+            line = encoder.encode(record).encode("utf-8") + b"\n"
+            block.append(line)
+            size += len(line)
+            if size >= ExportService.block_size:
+                yield b"".join(block)
+                block, size = [], 0
+        if block:
+            yield b"".join(block)
+
+    @staticmethod
+    def _gzip(blocks):
+        compressor = zlib.compressobj(wbits=31)  # 31 selects the gzip container.
+        for block in blocks:
+            compressed = compressor.compress(block)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
@@ -0,0 +1,48 @@
+from django.core.exceptions import ValidationError
+from ..repositories.import_repository import ImportRepository
+
+
+class ImportService:
+    """
+    Service class for the progress of resumable imports.
+    """
+
+    @staticmethod
+    def get_checkpoint(name):
+        """
+        :param name: Name of the checkpoint.
+        :return: Tuple of (phase, position), or None if nothing was checkpointed under 'name'.
+        """
+        return ImportRepository.get_checkpoint(name)
+
+    @staticmethod
+    def iter_imported_posts(name):
+        """
+        :param name: Name of the checkpoint.
+        :return: Iterator of the (legacy_id, post_id) pairs recorded under 'name'.
+        """
+        return ImportRepository.iter_imported_posts(name)
+
+    @staticmethod
+    def save_progress(name, phase, position, imported_posts=()):
+        """
+        Record the progress of an import; call it in the transaction of the batch it describes.
+
+        :param name: Name of the checkpoint.
+        :param phase: "post", "comment" or "done".
+        :param position: Number of input records handled in 'phase'.
+        :param imported_posts: Iterable of (legacy_id, post_id) pairs of the posts just created.
+        :raises: ValidationError if 'phase' is not a known phase.
+        """
+        if phase not in ("post", "comment", "done"):
+            raise ValidationError(f"Unknown import phase: {phase}.")
+        ImportRepository.save_progress(name, phase, position, imported_posts)
+
+    @staticmethod
+    def delete_checkpoint(name):
+        """
+        Forget a checkpoint, so the next import under 'name' starts from the beginning.
+
+        :param name: Name of the checkpoint.
+        """
+        ImportRepository.delete_checkpoint(name)
@@ -16,22 +16,91 @@ class PostService:
         return PostRepository.get_all_posts()
 
     @staticmethod
-    def get_post_by_id(post_id):
+    def get_post_rows(columns):
+        """
+        Retrieve all posts as named tuples of the given columns, for read-only listings.
+
+        :param columns: Model field names to select.
+        :return: QuerySet of named tuples.
+        """
+        return PostRepository.get_post_rows(columns)
+
+    @staticmethod
+    def get_post_by_id(post_id, fields=None):
         """
         Retrieve a post by its ID from the repository.
 
         :param post_id: Primary key of the post to fetch.
+        :param fields: Optional model field names to load; the other columns are deferred.
         :return: Post object if found, None otherwise.
         :raises: ValidationError if 'post_id' is not provided.
         :raises: ObjectDoesNotExist if the post does not exist.
         """
         if not post_id:
             raise ValidationError("Post ID is required to fetch the post.")
-        post = PostRepository.get_post_by_id(post_id)
+        post = PostRepository.get_post_by_id(post_id, fields=fields)
         if post is None:
             raise ObjectDoesNotExist(f"Post with ID {post_id} does not exist.")
         return post
 
+    @staticmethod
+    async def aget_post_by_id(post_id, fields=None):
+        """
+        Async variant of `get_post_by_id`, for views served under ASGI.
+
+        :param post_id: Primary key of the post to fetch.
+        :param fields: Optional model field names to load; the other columns are deferred.
+        :return: Post object.
+        :raises: ValidationError if 'post_id' is not provided.
+        :raises: ObjectDoesNotExist if the post does not exist.
+        """
+        if not post_id:
+            raise ValidationError("Post ID is required to fetch the post.")
+        post = await PostRepository.aget_post_by_id(post_id, fields=fields)
+        if post is None:
+            raise ObjectDoesNotExist(f"Post with ID {post_id} does not exist.")
+        return post
+
+    @staticmethod
+    def get_posts_version():
+        """
+        Retrieve a cheap description of the current state of all posts, used for conditional GETs.
+
+        :return: Tuple of (last modification datetime or None, row count, total comments).
+        """
+        return PostRepository.get_posts_version()
+
+    @staticmethod
+    def get_post_version(post_id):
+        """
+        Retrieve a cheap description of the current state of a post, used for conditional GETs.
+
+        :param post_id: Primary key of the post.
+        :return: Version tuple, or None if the post does not exist.
+        :raises: ValidationError if 'post_id' is not provided.
+        """
+        if not post_id:
+            raise ValidationError("Post ID is required to fetch the post.")
+        return PostRepository.get_post_version(post_id)
+
+    @staticmethod
+    async def aget_posts_version():
+        """
+        Async variant of `get_posts_version`.
+        """
+        return await PostRepository.aget_posts_version()
+
+    @staticmethod
+    async def aget_post_version(post_id):
+        """
+        Async variant of `get_post_version`.
+
+        :raises: ValidationError if 'post_id' is not provided.
+        """
+        if not post_id:
+            raise ValidationError("Post ID is required to fetch the post.")
+        return await PostRepository.aget_post_version(post_id)
+
     @staticmethod
     def create_post(data):
         """
@@ -47,12 +116,30 @@ class PostService:
         return PostRepository.create_post(data)
 
     @staticmethod
-    def update_post(data, post_id):
+    def bulk_create_posts(data_list, batch_size=None, keep_timestamps=False):
+        """
+        Create many posts at once.
+
+        :param data_list: List of dictionaries of data, one per post.
+        :param batch_size: Maximum number of rows per INSERT statement.
+        :param keep_timestamps: If True, keep the 'created_at' and 'updated_at' given in the data.
+        :return: List of the newly created Post objects.
+        :raises: ValidationError if any item is missing its title or content.
+        """
+        if any(not data.get("title") or not data.get("content") for data in data_list):
+            raise ValidationError("Title and content are required to create a post.")
+        return PostRepository.bulk_create_posts(
+            data_list, batch_size=batch_size, keep_timestamps=keep_timestamps
+        )
+
+    @staticmethod
+    def update_post(data, post_id, post=None):
         """
         Update an existing post with the given data.
 
         :param data: Dictionary of data to update the post.
         :param post_id: Primary key of the post to update.
+        :param post: Optional Post object already loaded, reused to avoid another SELECT.
         :return: Updated Post object.
         :raises: ValidationError if 'post_id' is not provided.
         :raises: ObjectDoesNotExist if the post does not exist.
@@ -61,12 +148,12 @@ class PostService:
             raise ValidationError("Post ID is required to update the post.")
         if not data:
             raise ValidationError("Data is required to update the post.")
-        return PostRepository.update_post(data, post_id)
+        return PostRepository.update_post(data, post_id, post=post)
 
     @staticmethod
     def delete_post(post_id):
         """
-        Delete a post by its ID from the repository.
+        Soft-delete a post by its ID; it is purged later by the purge_deleted_posts command.
 
         :param post_id: Primary key of the post to delete.
         :raises: ValidationError if 'post_id' is not provided.
@@ -0,0 +1,34 @@
+from django.core.exceptions import ValidationError
+from ..repositories.search_repository import SearchRepository
+
+
+class SearchService:
+    """
+    Service class for full-text search over posts and their comments.
+    """
+
+    @staticmethod
+    def search_posts(query, limit, after=None):
+        """
+        Search live posts, their titles, contents and comments, for every word of `query`.
+
+        :param query: Text typed by the user; a word ending with '*' matches as a prefix.
+        :param limit: Maximum number of posts to return.
+        :param after: Optional (rank, id) of the last post of the previous page.
+        :return: List of hits, best first.
+        :raises: ValidationError if the query has no searchable word.
+        """
+        terms = [term for term in query.split() if term.rstrip("*")]
+        if not terms:
+            raise ValidationError("A search query is required.")
+        return SearchRepository.search(terms, limit, after=after)
+
+    @staticmethod
+    def rebuild_index(batch_size):
+        """
+        Re-index every post and comment in batches.
+
+        :param batch_size: Range of primary keys indexed per transaction.
+        :return: Tuple of (posts indexed, comments indexed).
+        """
+        return SearchRepository.rebuild(batch_size)
@@ -0,0 +1,18 @@
+from django.db import connections
+from .repositories.search_repository import SearchRepository
+
+
+def restore_search_triggers(using, **kwargs):
+    """
+    Recreate the full-text search triggers after migrations.
+
+    SQLite alters a table by rebuilding it, which drops its triggers, so any later migration
+    of posts_post or comments_comment would silently stop indexing. Nothing is done until
+    the blog_search table exists, so unapplying the search migration is not undone here.
+
+    :param using: Alias of the database that was migrated.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite" or "blog_search" not in connection.introspection.table_names():
+        return
+    SearchRepository.create_schema(using=using)
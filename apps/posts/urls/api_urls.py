@@ -1,6 +1,13 @@
 from django.urls import path
-from ..views.api_views import PostListCreateAPIView, PostRetrieveUpdateDestroyAPIView
+from ..views.api_views import (
+    BlogExportAPIView,
+    PostBulkCreateAPIView,
+    PostListCreateAPIView,
+    PostSearchAPIView,
+    PostRetrieveUpdateDestroyAPIView,
+)
 from ...comments.views.api_views import (
+    CommentBulkCreateAPIView,
     CommentListCreateAPIView,
     CommentRetrieveUpdateDestroyAPIView,
 )
@@ -8,6 +15,14 @@ from ...comments.views.api_views import (
 urlpatterns = [
     # Route for listing all posts or creating a new post
     path("", PostListCreateAPIView.as_view(), name="post-list-create"),
+    # Route for creating many posts from a JSON array in a single request
+    path("bulk/", PostBulkCreateAPIView.as_view(), name="post-bulk-create"),
+    # Route for creating a batch of comments that spans many posts in a single request
+    path("comments/bulk/", CommentBulkCreateAPIView.as_view(), name="comment-bulk-create"),
+    # Route for full-text search over posts and their comments
+    path("search/", PostSearchAPIView.as_view(), name="post-search"),
+    # Route for streaming every post and comment as NDJSON
+    path("export/", BlogExportAPIView.as_view(), name="blog-export"),
     # Route for retrieving, updating, or deleting a specific post by post_id
     path(
         "<int:post_id>/",
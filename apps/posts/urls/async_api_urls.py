@@ -0,0 +1,22 @@
+from django.urls import path
+from .api_urls import urlpatterns as sync_urlpatterns
+from ..views.async_views import AsyncBlogExportAPIView, AsyncPostDetailView, AsyncPostListView
+from ...comments.views.async_views import AsyncCommentDetailView, AsyncCommentListView
+
+# The API as served under ASGI: the same routes as api_urls, with the list and detail
+# endpoints answered by async views (GETs on the event loop, writes delegated to DRF)
+# and the export streamed from an async iterator.
+ASYNC_VIEWS = {
+    "blog-export": AsyncBlogExportAPIView,
+    "post-list-create": AsyncPostListView,
+    "post-retrieve-update-destroy": AsyncPostDetailView,
+    "post-comment-create": AsyncCommentListView,
+    "post-comment-retrieve-update-destroy": AsyncCommentDetailView,
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS[pattern.name].as_view(), name=pattern.name)
+    if pattern.name in ASYNC_VIEWS
+    else pattern
+    for pattern in sync_urlpatterns
+]
@@ -1,16 +1,28 @@
-from rest_framework import generics
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import generics, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from ..pagination import PostCursorPagination, SearchCursorPagination
 from ..serializers import PostSerializer
+from ..services.export_service import ExportService
 from ..services.post_service import PostService
+from ..services.search_service import SearchService
+from .mixins import ConditionalGetMixin, EmbeddedComments, SparseFieldsetMixin, ValuesListMixin, parse_include
 from rest_framework.exceptions import NotFound, ValidationError
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ObjectDoesNotExist, ValidationError as DjangoValidationError
 
 
-class PostListCreateAPIView(generics.ListCreateAPIView):
+class PostListCreateAPIView(ConditionalGetMixin, ValuesListMixin, generics.ListCreateAPIView):
     """
     API view for listing all posts and creating a new post.
     Utilizes Django REST Framework's ListCreateAPIView for listing and creating resources.
+    Conditional GETs are answered with 304 Not Modified while no post has changed.
+    GET ?fields=id,title returns only those fields and reads only their columns.
+    Pages are serialized from values_list() rows rather than Post instances.
     """
     serializer_class = PostSerializer  # Defines the serializer class used for converting model instances to JSON and vice versa.
+    pagination_class = PostCursorPagination  # Pages with an opaque (created_at, id) cursor so deep pages stay cheap.
 
     def get_queryset(self):
         """
@@ -21,6 +33,14 @@ class PostListCreateAPIView(generics.ListCreateAPIView):
         """
         return PostService.get_all_posts()  # Delegates the database query to the PostService layer.
 
+    def get_version(self):
+        """
+        Describe the state of the posts table for ETag / Last-Modified validation.
+
+        :return: Version tuple computed with a single aggregate query.
+        """
+        return PostService.get_posts_version()
+
     def perform_create(self, serializer):
         """
         Handle the creation of a new post.
@@ -35,12 +55,144 @@ class PostListCreateAPIView(generics.ListCreateAPIView):
             raise ValidationError({"detail": str(e)})
 
 
-class PostRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class PostBulkCreateAPIView(generics.GenericAPIView):
+    """
+    API view for creating many posts in a single request.
+    Accepts a JSON array of posts; valid items are inserted together and invalid ones are reported by index.
+    """
+    serializer_class = PostSerializer
+
+    def post(self, request, *args, **kwargs):
+        """
+        Validate every item and insert the valid ones with batched multi-row INSERTs in one transaction.
+
+        :param request: Request whose body is a list of post objects.
+        :return: 201 with the created IDs and per-item errors, or 400 if nothing could be created.
+        :raises ValidationError: If the body is not a non-empty list within the size limit.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"detail": "Expected a non-empty list of posts."})
+        if len(items) > settings.POST_BULK_CREATE_MAX_ITEMS:
+            raise ValidationError(
+                {"detail": f"At most {settings.POST_BULK_CREATE_MAX_ITEMS} posts can be created per request."}
+            )
+
+        # Validate item by item with the list serializer's child, so one bad item does not reject the batch.
+        child = self.get_serializer(many=True).child
+        valid_items, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                valid_items.append(child.run_validation(item))
+            except ValidationError as e:
+                errors.append({"index": index, "errors": e.detail})
+
+        created = []
+        if valid_items:
+            created = PostService.bulk_create_posts(
+                valid_items, batch_size=settings.POST_BULK_CREATE_BATCH_SIZE
+            )
+        return Response(
+            {"created": [post.pk for post in created], "errors": errors},
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class PostSearchAPIView(APIView):
+    """
+    API view for full-text search over post titles, contents and comments.
+    Hits are ranked by BM25, carry a highlighted snippet and are paged with an opaque cursor.
+    """
+    pagination_class = SearchCursorPagination
+
+    def get(self, request, *args, **kwargs):
+        """
+        Search for the words of the 'q' query parameter.
+
+        :param request: The incoming request carrying 'q', 'cursor' and 'page_size'.
+        :return: Paginated list of hits with 'id', 'title', 'rank' and 'snippet'.
+        :raises ValidationError: If 'q' holds no searchable word.
+        """
+        query = request.query_params.get("q", "")
+        paginator = self.pagination_class()
+        try:
+            hits = paginator.paginate_search(
+                lambda after, limit: SearchService.search_posts(query, limit, after=after), request
+            )
+        except DjangoValidationError as e:
+            raise ValidationError({"q": e.messages})
+        return paginator.get_paginated_response(hits)
+
+
+class BlogExportAPIView(APIView):
+    """
+    API view streaming the whole blog as NDJSON: every post, then every comment.
+    Rows are read from the database in chunks and written as they arrive, so memory use is
+    constant whatever the size of the blog. Pass ?gzip=1 to download it gzip-compressed.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """
+        Stream the export.
+
+        :param request: The incoming request; a truthy 'gzip' query parameter compresses the stream.
+        :return: StreamingHttpResponse with the NDJSON export as an attachment.
+        """
+        compress = request.query_params.get("gzip", "").lower() in ("1", "true", "yes")
+        response = StreamingHttpResponse(
+            self.get_stream(compress),
+            content_type="application/gzip" if compress else "application/x-ndjson",
+        )
+        filename = "blog-export.ndjson.gz" if compress else "blog-export.ndjson"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def get_stream(self, compress):
+        """
+        :param compress: If True, the stream is gzip-compressed.
+        :return: Iterator of the blocks of bytes of the export.
+        """
+        return ExportService.iter_ndjson(settings.EXPORT_CHUNK_SIZE, compress=compress)
+
+
+class PostRetrieveUpdateDestroyAPIView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     API view for retrieving, updating, and deleting a specific post.
     Extends RetrieveUpdateDestroyAPIView for detailed operations on a single resource.
+    Conditional GETs are answered with 304 Not Modified while the post is unchanged.
+    GET ?fields=id,title returns only those fields and reads only their columns.
+    GET ?include=comments&comments_limit=20 also returns the newest comments, with two queries.
     """
     serializer_class = PostSerializer  # Specifies the serializer class for retrieving, updating, and deleting resources.
+    embedded_comments = None  # EmbeddedComments of the request, loaded with the version.
+
+    def get_includes(self):
+        """
+        :return: Tuple of the related resources to embed, e.g. ("comments",).
+        :raises ValidationError: If an unknown resource is requested.
+        """
+        request = getattr(self, "request", None)
+        if request is None or request.method not in ("GET", "HEAD"):
+            return ()
+        return parse_include(request.query_params)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Serialize the post, with the newest comments when ?include=comments is given.
+        """
+        response = super().retrieve(request, *args, **kwargs)
+        if "comments" in self.get_includes():
+            response.data["comments"] = self.get_embedded_comments().get_data()
+        return response
+
+    def get_embedded_comments(self):
+        """
+        :return: EmbeddedComments of the post, fetched with one query the first time.
+        """
+        if self.embedded_comments is None:
+            self.embedded_comments = EmbeddedComments(self.request, self.kwargs.get("post_id"))
+            self.embedded_comments.load(list(self.embedded_comments.queryset))
+        return self.embedded_comments
 
     def get_object(self):
         """
@@ -51,14 +203,35 @@ class PostRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
         :raises NotFound: If the post does not exist.
         """
         post_id = self.kwargs.get("post_id")  # Extract post_id from the URL kwargs.
+        columns = self.get_columns()  # Outside the try: an unknown field is a 400, not a 404.
         try:
-            post = PostService.get_post_by_id(post_id)  # Fetch the post using PostService.
+            post = PostService.get_post_by_id(post_id, fields=columns)  # Fetch the post using PostService.
             return post
         except ObjectDoesNotExist:
             raise NotFound("Post not found")  # Raise a 404 error if the post does not exist.
         except ValidationError as e:
             raise NotFound({"detail": str(e)})
 
+    def get_version(self):
+        """
+        Describe the state of the post for ETag / Last-Modified validation.
+
+        With ?include=comments the version also covers the comments. The whole post is
+        then loaded through the cache rather than its version columns alone, as the
+        response needs it anyway, and the embedded comments carry their own version:
+        one query for each.
+
+        :return: Version tuple, or None if the post does not exist.
+        """
+        post_id = self.kwargs.get("post_id")
+        if "comments" not in self.get_includes():
+            return PostService.get_post_version(post_id)
+        try:
+            PostService.get_post_by_id(post_id)
+        except (ObjectDoesNotExist, DjangoValidationError):
+            return None  # Let get_object produce the 404.
+        return self.get_embedded_comments().get_version(PostService.get_post_version(post_id))
+
     def perform_update(self, serializer):
         """
         Update an existing post instance.
@@ -69,7 +242,9 @@ class PostRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
         """
         post_id = self.kwargs["post_id"]  # Extract post_id from the URL kwargs.
         try:
-            PostService.update_post(serializer.validated_data, post_id)  # Delegate the update logic to PostService.
+            # Reuse the post loaded by get_object, so the update is a single UPDATE and the
+            # response is rendered from the updated instance without another SELECT.
+            PostService.update_post(serializer.validated_data, post_id, post=serializer.instance)
         except ObjectDoesNotExist:
             raise NotFound("Post not found")
         except ValidationError as e:
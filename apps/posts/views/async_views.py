@@ -0,0 +1,201 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError as DjangoValidationError
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, NotAcceptable, NotFound
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from my_project_blog.instrumentation import measure_serialization
+from ..pagination import PostCursorPagination
+from ..serializers import PostSerializer, ValuesListSerializer
+from ..services.export_service import ExportService
+from ..services.post_service import PostService
+from .api_views import BlogExportAPIView, PostListCreateAPIView, PostRetrieveUpdateDestroyAPIView
+from .mixins import EmbeddedComments, get_last_modified, get_model_columns, make_etag, parse_fields, parse_include
+
+
+class AsyncReadView(View):
+    """
+    Base view that serves JSON GETs natively on the event loop, for deployment under ASGI.
+
+    GET and HEAD requests negotiated to JSON run as coroutines end to end: the version
+    lookup behind the ETag, the async ORM query and the rendering. Everything else (writes,
+    OPTIONS, the browsable API) is handed to the synchronous DRF view `write_view_class`
+    in a worker thread, so both views answer the same URL with the same behaviour.
+
+    Subclasses implement the coroutines `get_version` and `get_data`, and honour the
+    sparse fieldset of `get_fields` like the DRF views do.
+    """
+
+    write_view_class = None
+    serializer_class = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Same as DRF views: sessions are not used to authenticate the API, so no CSRF check.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def get_version(self):
+        """
+        Describe the current state of the resource (see ConditionalGetMixin.get_version).
+
+        :return: Version tuple, or None to skip validation and let `get_data` produce a 404.
+        """
+        raise NotImplementedError("AsyncReadView subclasses must implement get_version().")
+
+    async def get_data(self):
+        """
+        Load and serialize the resource.
+
+        :return: Data to render as JSON.
+        :raises APIException: To answer with an error response instead.
+        """
+        raise NotImplementedError("AsyncReadView subclasses must implement get_data().")
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Answer a GET with a 304, the rendered resource or an error, without leaving the event loop.
+        """
+        self.api_request = Request(request)
+        try:
+            renderer, media_type = DefaultContentNegotiation().select_renderer(
+                self.api_request, [renderer() for renderer in api_settings.DEFAULT_RENDERER_CLASSES]
+            )
+        except NotAcceptable:
+            renderer = None
+        if not isinstance(renderer, JSONRenderer):
+            return await self.delegate(request, *args, **kwargs)
+
+        try:
+            response, etag, last_modified = None, None, None
+            version = await self.get_version()
+            if version is not None:
+                etag = make_etag(version, request.get_full_path(), media_type)
+                last_modified = get_last_modified(version)
+                response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = self.render(renderer, media_type, await self.get_data())
+        except APIException as exc:
+            detail = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+            return self.render(renderer, media_type, detail, status=exc.status_code)
+
+        if etag is not None:
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def get_fields(self):
+        """
+        :return: Tuple of the field names requested with ?fields=, or None for every field.
+        :raises ValidationError: If an unknown field is requested.
+        """
+        return parse_fields(self.api_request.query_params, self.serializer_class)
+
+    def get_columns(self, required=()):
+        """
+        :return: Model field names to load for the requested fields, or None for every column.
+        """
+        fields = self.get_fields()
+        return None if fields is None else get_model_columns(self.serializer_class, fields, required)
+
+    def render(self, renderer, media_type, data, status=200):
+        with measure_serialization():
+            content = renderer.render(data, media_type, {"request": self.api_request})
+        response = HttpResponse(content, content_type=renderer.media_type, status=status)
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+    async def delegate(self, request, *args, **kwargs):
+        """
+        Serve the request with the synchronous DRF view, in a worker thread.
+        """
+        view = self.write_view_class.as_view()
+        return await sync_to_async(view)(request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        return await self.delegate(request, *args, **kwargs)
+
+    async def put(self, request, *args, **kwargs):
+        return await self.delegate(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await self.delegate(request, *args, **kwargs)
+
+    async def delete(self, request, *args, **kwargs):
+        return await self.delegate(request, *args, **kwargs)
+
+    async def options(self, request, *args, **kwargs):
+        return await self.delegate(request, *args, **kwargs)
+
+
+class AsyncPostListView(AsyncReadView):
+    """
+    Async GET of the posts list; POST is served by PostListCreateAPIView.
+    """
+    write_view_class = PostListCreateAPIView
+    serializer_class = PostSerializer
+
+    async def get_version(self):
+        return await PostService.aget_posts_version()
+
+    async def get_data(self):
+        paginator = PostCursorPagination()
+        serializer = ValuesListSerializer(PostSerializer, fields=self.get_fields())
+        rows = PostService.get_post_rows(serializer.get_columns(required=paginator.ordering))
+        queryset = paginator.get_page_queryset(rows, self.api_request)
+        page = paginator.build_page([row async for row in queryset])
+        return paginator.get_paginated_response(serializer.to_representation(page)).data
+
+
+class AsyncPostDetailView(AsyncReadView):
+    """
+    Async GET of a post; PUT, PATCH and DELETE are served by PostRetrieveUpdateDestroyAPIView.
+    """
+    write_view_class = PostRetrieveUpdateDestroyAPIView
+    serializer_class = PostSerializer
+
+    embedded_comments = None
+
+    async def get_version(self):
+        post_id = self.kwargs.get("post_id")
+        try:
+            if "comments" not in parse_include(self.api_request.query_params):
+                return await PostService.aget_post_version(post_id)
+            # As in PostRetrieveUpdateDestroyAPIView.get_version: one query for the post, one for the comments.
+            await PostService.aget_post_by_id(post_id)
+        except (ObjectDoesNotExist, DjangoValidationError):
+            return None
+        self.embedded_comments = EmbeddedComments(self.api_request, post_id)
+        self.embedded_comments.load([row async for row in self.embedded_comments.queryset])
+        return self.embedded_comments.get_version(await PostService.aget_post_version(post_id))
+
+    async def get_data(self):
+        try:
+            post = await PostService.aget_post_by_id(self.kwargs.get("post_id"), fields=self.get_columns())
+        except ObjectDoesNotExist:
+            raise NotFound("Post not found")
+        except DjangoValidationError as e:
+            raise NotFound({"detail": str(e)})
+        data = PostSerializer(post, fields=self.get_fields()).data
+        if self.embedded_comments is not None:
+            data["comments"] = self.embedded_comments.get_data()
+        return data
+
+
+class AsyncBlogExportAPIView(BlogExportAPIView):
+    """
+    The export as served under ASGI: the same view, streaming an async iterator.
+
+    Django would read the synchronous iterator of BlogExportAPIView into a list before
+    sending anything, holding the whole export in memory.
+    """
+
+    def get_stream(self, compress):
+        return ExportService.aiter_ndjson(settings.EXPORT_CHUNK_SIZE, compress=compress)
@@ -0,0 +1,262 @@
+import functools
+import hashlib
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.exceptions import ValidationError
+from apps.comments.pagination import CommentCursorPagination
+from apps.comments.serializers import CommentSerializer
+from apps.comments.services.comment_service import CommentService
+from ..serializers import ValuesListSerializer
+
+FIELDS_QUERY_PARAM = "fields"
+INCLUDE_QUERY_PARAM = "include"
+COMMENTS_LIMIT_QUERY_PARAM = "comments_limit"
+INCLUDABLE = ("comments",)  # Related resources a post detail can embed.
+
+
+class ConditionalGetMixin:
+    """
+    Mixin for API views that answers conditional GETs (If-None-Match / If-Modified-Since).
+
+    Views provide `get_version`, a cheap lookup that returns a tuple describing the current
+    state of the resource without instantiating models. When the client already holds that
+    state, a 304 Not Modified is returned before the queryset is evaluated or anything is
+    serialized. Otherwise the regular GET runs and the response carries ETag and Last-Modified.
+    """
+
+    def get_version(self):
+        """
+        Describe the current state of the resource.
+
+        :return: Tuple whose first item is the last-modified datetime (or None) and whose
+                 remaining items complete the version, or None if the resource does not exist.
+        """
+        raise NotImplementedError("Views using ConditionalGetMixin must implement get_version().")
+
+    def get(self, request, *args, **kwargs):
+        """
+        Short-circuit to 304 Not Modified when the client's validators still match.
+        """
+        version = self.get_version()
+        if version is None:
+            return super().get(request, *args, **kwargs)  # Let the view produce its own 404.
+
+        etag = self.make_etag(request, version)
+        last_modified = get_last_modified(version)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def make_etag(self, request, version):
+        """
+        Build a strong ETag from the resource version and the requested representation.
+
+        :param request: The incoming request; its path, query string and negotiated media
+                        type are part of the representation.
+        :param version: Tuple returned by `get_version`.
+        :return: Quoted ETag string.
+        """
+        return make_etag(version, request.get_full_path(), getattr(request, "accepted_media_type", ""))
+
+
+def make_etag(version, full_path, media_type):
+    """
+    Build a strong ETag from a resource version and the representation it is rendered to.
+
+    :param version: Version tuple of the resource.
+    :param full_path: Path and query string of the request.
+    :param media_type: Negotiated media type of the response.
+    :return: Quoted ETag string.
+    """
+    digest = hashlib.sha1(repr((version, full_path, media_type)).encode("utf-8")).hexdigest()
+    return quote_etag(digest)
+
+
+def get_last_modified(version):
+    """
+    :param version: Version tuple whose first item is the last-modified datetime, or None.
+    :return: Last-modified time as a POSIX timestamp, or None.
+    """
+    last_modified = version[0]
+    return int(last_modified.timestamp()) if last_modified else None
+
+
+class SparseFieldsetMixin:
+    """
+    Mixin for API views serving sparse fieldsets: GET ?fields=id,title,created_at.
+
+    The serializer is narrowed to the requested fields and `get_columns` tells the
+    repository which columns to load, so the unrequested ones (such as a long `content`)
+    are never read from the database. Writes always validate and return every field.
+    """
+
+    def get_fields(self):
+        """
+        :return: Tuple of the requested field names, or None to serialize every field.
+        :raises ValidationError: If an unknown field is requested.
+        """
+        request = getattr(self, "request", None)
+        if request is None or request.method not in ("GET", "HEAD"):
+            return None
+        return parse_fields(request.query_params, self.get_serializer_class())
+
+    def get_columns(self, required=()):
+        """
+        :param required: Model fields to load whatever is requested, e.g. the pagination keyset.
+        :return: Model field names to pass to QuerySet.only(), or None to load every column.
+        """
+        fields = self.get_fields()
+        if fields is None:
+            return None
+        return get_model_columns(self.get_serializer_class(), fields, required)
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_fields()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        return super().get_serializer(*args, **kwargs)
+
+
+class ValuesListMixin(SparseFieldsetMixin):
+    """
+    Mixin for list API views serving their pages from values_list() rows.
+
+    Rows are fetched as named tuples and turned into the serializer's representation by a
+    ValuesListSerializer, so no model instance is built and no DRF field runs per row.
+    The output is the same as the ModelSerializer's. The rows are selected from the
+    view's `get_queryset`, so only the rendered columns are read.
+    """
+
+    def get_rows(self, columns):
+        """
+        :param columns: Model field names to select; they include the pagination keyset.
+        :return: QuerySet of named tuples, as returned by values_list(named=True).
+        """
+        return self.get_queryset().values_list(*columns, named=True)
+
+    def list(self, request, *args, **kwargs):
+        serializer = ValuesListSerializer(self.get_serializer_class(), fields=self.get_fields())
+        rows = self.get_rows(serializer.get_columns(required=self.pagination_class.ordering))
+        page = self.paginate_queryset(rows)
+        return self.get_paginated_response(serializer.to_representation(page))
+
+
+class EmbeddedComments:
+    """
+    The newest comments of a post, embedded in the post detail with
+    ?include=comments&comments_limit=N (N defaults to the comment list page size).
+
+    They are rendered as the last page of the post's comment list, oldest first, and the
+    page's previous link walks back through the older comments on the comment list
+    endpoint. The rows are fetched with one indexed query, which also reports the
+    latest update of any of the post's comments; `get_version` adds it to the post
+    version, so editing a comment changes the ETag of the compound document.
+    """
+
+    def __init__(self, request, post_id):
+        """
+        :param request: The incoming DRF request, carrying 'comments_limit'.
+        :param post_id: Primary key of the post.
+        """
+        self.paginator = CommentCursorPagination()
+        self.serializer = ValuesListSerializer(CommentSerializer)
+        rows = CommentService.get_comment_rows_with_version(
+            post_id, self.serializer.get_columns(required=self.paginator.ordering)
+        )
+        self.queryset = self.paginator.get_last_page_queryset(
+            rows,
+            self.paginator.get_page_size(request, COMMENTS_LIMIT_QUERY_PARAM),
+            request.build_absolute_uri(reverse("post-comment-create", args=[post_id])),
+        )
+        self.page, self.updated_at = None, None
+
+    def load(self, rows):
+        """
+        :param rows: Rows fetched from `queryset`, synchronously or not.
+        """
+        self.page = self.paginator.build_page(rows)
+        self.updated_at = rows[0].comments_updated_at if rows else None
+
+    def get_version(self, post_version):
+        """
+        :param post_version: Version tuple of the post, or None if it does not exist.
+        :return: Version tuple of the post with its comments.
+        """
+        if post_version is None:
+            return None
+        last_modified, *rest = post_version
+        return (max(last_modified, self.updated_at or last_modified), *rest, self.updated_at)
+
+    def get_data(self):
+        """
+        :return: Dictionary with the 'next', 'previous' and 'results' keys of a comment list page.
+        """
+        return self.paginator.get_paginated_response(self.serializer.to_representation(self.page)).data
+
+
+def parse_include(query_params):
+    """
+    Read the related resources requested with the 'include' query parameter.
+
+    :param query_params: Query parameters of the request.
+    :return: Tuple of the requested names, possibly empty.
+    :raises ValidationError: If a name cannot be included.
+    """
+    requested = {name.strip() for name in query_params.get(INCLUDE_QUERY_PARAM, "").split(",") if name.strip()}
+    unknown = requested.difference(INCLUDABLE)
+    if unknown:
+        raise ValidationError(
+            {INCLUDE_QUERY_PARAM: [f"Unknown include(s): {', '.join(sorted(unknown))}. Choose from: {', '.join(INCLUDABLE)}."]}
+        )
+    return tuple(name for name in INCLUDABLE if name in requested)
+
+
+def parse_fields(query_params, serializer_class):
+    """
+    Read the sparse fieldset requested with the 'fields' query parameter.
+
+    :param query_params: Query parameters of the request.
+    :param serializer_class: Serializer whose fields may be requested.
+    :return: Tuple of the requested field names in serializer order, or None if none were requested.
+    :raises ValidationError: If a name is not a field of the serializer.
+    """
+    requested = {name.strip() for name in query_params.get(FIELDS_QUERY_PARAM, "").split(",") if name.strip()}
+    if not requested:
+        return None
+    sources = get_field_sources(serializer_class)
+    unknown = requested.difference(sources)
+    if unknown:
+        raise ValidationError(
+            {FIELDS_QUERY_PARAM: [f"Unknown field(s): {', '.join(sorted(unknown))}. Choose from: {', '.join(sources)}."]}
+        )
+    return tuple(name for name in sources if name in requested)
+
+
+def get_model_columns(serializer_class, fields, required=()):
+    """
+    Map serializer fields to the model fields they are read from.
+
+    :param serializer_class: ModelSerializer the fields belong to.
+    :param fields: Names of the serializer fields to render.
+    :param required: Model fields to load in any case.
+    :return: Tuple of concrete model field names, in model order.
+    """
+    sources = get_field_sources(serializer_class)
+    wanted = {sources[name] for name in fields}.union(required)
+    model = serializer_class.Meta.model
+    return tuple(field.name for field in model._meta.concrete_fields if field.name in wanted)
+
+
+@functools.cache
+def get_field_sources(serializer_class):
+    """
+    :return: Dictionary mapping each field of the serializer to its source attribute, in field order.
+    """
+    return {name: field.source for name, field in serializer_class().fields.items()}
@@ -1,10 +1,25 @@
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from django.test import Client
 from apps.posts.models import Post
 from apps.comments.models import Comment
 
 
+# Fixture to empty the cache around every test
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Clear the cache before each test.
+
+    Test databases are rolled back between tests but the local-memory cache is not,
+    so repository lookups could otherwise return rows cached by a previous test.
+    """
+    cache.clear()
+    yield
+    cache.clear()
+
+
 # Fixture to create a Post instance for testing
 @pytest.fixture
 def post(db):
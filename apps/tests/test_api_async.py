@@ -0,0 +1,172 @@
+import gzip
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from apps.posts.models import Post
+from apps.posts.views.async_views import AsyncPostDetailView, AsyncPostListView
+from apps.comments.views.async_views import AsyncCommentDetailView, AsyncCommentListView
+
+
+# Fixture providing a client that goes through the ASGI handler
+@pytest.fixture
+def async_client():
+    """
+    Provide an AsyncClient; its requests are routed with ASGI_ROOT_URLCONF.
+
+    Returns:
+        AsyncClient: An instance of Django's AsyncClient class.
+    """
+    return AsyncClient()
+
+
+def asgi_get(async_client, url, data=None, **extra):
+    return async_to_sync(async_client.get)(url, data, **extra)
+
+
+def test_async_post_list_matches_sync_response(api_client, async_client, post):
+    """
+    Verify that under ASGI the posts list is served by the async view with the same body and ETag.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        async_client: The AsyncClient fixture for requests through the ASGI handler.
+        post: The Post fixture providing a Post object.
+
+    Asserts:
+        The async view answers, with the JSON and ETag of the synchronous view.
+        The ETag is honoured with a 304.
+    """
+    url = reverse("post-list-create")
+    sync_response = api_client.get(url)
+    response = asgi_get(async_client, url)
+
+    assert response.resolver_match.func.view_class is AsyncPostListView
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == sync_response.json()
+    assert response["ETag"] == sync_response["ETag"]
+    not_modified = asgi_get(async_client, url, headers={"If-None-Match": response["ETag"]})
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_async_post_detail(async_client, post):
+    """
+    Verify that under ASGI a post and a missing post are served by the async detail view.
+    """
+    response = asgi_get(async_client, reverse("post-retrieve-update-destroy", args=[post.id]))
+    missing = asgi_get(async_client, reverse("post-retrieve-update-destroy", args=[999]))
+
+    assert response.resolver_match.func.view_class is AsyncPostDetailView
+    assert response.json()["title"] == post.title
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
+    assert missing.json() == {"detail": "Post not found"}
+
+
+def test_async_views_delegate_writes(async_client, post):
+    """
+    Verify that under ASGI writes are still served by the DRF views.
+
+    Args:
+        async_client: The AsyncClient fixture for requests through the ASGI handler.
+        post: The Post fixture providing a Post object.
+
+    Asserts:
+        POST creates a post and PATCH updates one.
+    """
+    created = async_to_sync(async_client.post)(
+        reverse("post-list-create"), {"title": "Async", "content": "Created"}, content_type="application/json"
+    )
+    updated = async_to_sync(async_client.patch)(
+        reverse("post-retrieve-update-destroy", args=[post.id]), {"title": "Patched"}, content_type="application/json"
+    )
+
+    assert created.status_code == status.HTTP_201_CREATED
+    assert updated.status_code == status.HTTP_200_OK
+    assert set(Post.objects.values_list("title", flat=True)) == {"Async", "Patched"}
+
+
+def test_async_comment_list_and_detail(api_client, async_client, comment):
+    """
+    Verify that under ASGI comment lists and comments are served by the async views.
+    """
+    list_url = reverse("post-comment-create", args=[comment.post_id])
+    detail_url = reverse("post-comment-retrieve-update-destroy", args=[comment.post_id, comment.id])
+
+    listed = asgi_get(async_client, list_url)
+    detail = asgi_get(async_client, detail_url)
+    invalid = asgi_get(async_client, list_url, {"since": "yesterday"})
+
+    assert listed.resolver_match.func.view_class is AsyncCommentListView
+    assert listed.json() == api_client.get(list_url).json()
+    assert detail.resolver_match.func.view_class is AsyncCommentDetailView
+    assert detail.json()["content"] == comment.content
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_async_views_delegate_browsable_api(async_client, post):
+    """
+    Verify that a GET asking for HTML is answered by the DRF view with the browsable API.
+    """
+    response = asgi_get(async_client, reverse("post-list-create"), headers={"Accept": "text/html"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"].startswith("text/html")
+
+
+def test_async_views_sparse_fieldset(api_client, async_client, comment):
+    """
+    Verify that under ASGI ?fields= is honoured like in the synchronous views, and validated.
+    """
+    post_url = reverse("post-retrieve-update-destroy", args=[comment.post.id])
+    comments_url = reverse("post-comment-create", args=[comment.post.id])
+    posts = asgi_get(async_client, reverse("post-list-create"), {"fields": "title"})
+    detail = asgi_get(async_client, post_url, {"fields": "id,title"})
+    comments = asgi_get(async_client, comments_url, {"fields": "content"})
+    invalid = asgi_get(async_client, post_url, {"fields": "nope"})
+
+    assert posts.json()["results"] == [{"title": comment.post.title}]
+    assert detail.json() == api_client.get(post_url, {"fields": "id,title"}).json()
+    assert comments.json()["results"] == [{"content": comment.content}]
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+    assert "nope" in invalid.json()["fields"][0]
+
+
+def test_async_post_detail_include_comments(api_client, async_client, comment):
+    """
+    Verify that under ASGI ?include=comments returns the same compound document as the synchronous view.
+    """
+    url = reverse("post-retrieve-update-destroy", args=[comment.post.id])
+    params = {"include": "comments", "comments_limit": 1}
+    response = asgi_get(async_client, url, params)
+    invalid = asgi_get(async_client, url, {"include": "nope"})
+
+    assert response.json() == api_client.get(url, params).json()
+    assert response.json()["comments"]["results"][0]["id"] == comment.id
+    assert response["ETag"] == api_client.get(url, params)["ETag"]
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_async_export_streams_from_async_iterator(api_client, async_client, comment):
+    """
+    Verify that under ASGI the export is streamed from an async iterator, block by block.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        async_client: The AsyncClient fixture for requests through the ASGI handler.
+        comment: The Comment fixture providing a Comment object.
+
+    Asserts:
+        The response is async, so Django does not read the whole export into a list first.
+        Its content, plain or gzip-compressed, is the same as under WSGI.
+    """
+    url = reverse("blog-export")
+
+    async def read(params):
+        response = await async_client.get(url, params)
+        assert response.is_async
+        return b"".join([block async for block in response.streaming_content])
+
+    plain = b"".join(api_client.get(url).streaming_content)
+    assert async_to_sync(read)({}) == plain
+    assert gzip.decompress(async_to_sync(read)({"gzip": "1"})) == plain
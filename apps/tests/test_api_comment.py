@@ -2,9 +2,15 @@ import pytest
 from rest_framework import status
 from django.urls import reverse
 from apps.comments.models import Comment
+from apps.comments.repositories.comment_repository import CommentRepository
+from django.core.cache import cache
+from apps.posts.models import Post
 from rest_framework.exceptions import APIException
 from apps.comments.views.api_views import CommentListCreateAPIView, CommentRetrieveUpdateDestroyAPIView
 from rest_framework.serializers import Serializer
+from django.db import connection
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
 
 class MockSerializer(Serializer):
     validated_data = {"content": "Test comment"}
@@ -46,7 +52,7 @@ def test_get_comments_by_post_id(api_client, comment):
     response = api_client.get(reverse("post-comment-create", args=[comment.post.id]))
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.data[0]["content"] == "This is a test comment"
+    assert response.data["results"][0]["content"] == "This is a test comment"
 
 
 def test_update_comment(api_client, comment):
@@ -73,6 +79,41 @@ def test_update_comment(api_client, comment):
     assert updated_comment.content == "Updated comment"
 
 
+def test_update_comment_query_count(api_client, comment, django_assert_max_num_queries):
+    """
+    Verify that updating a Comment costs at most two queries and returns the fresh row.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        comment: The Comment fixture providing a Comment object.
+        django_assert_max_num_queries: The pytest-django fixture for bounding queries.
+
+    Asserts:
+        The PUT runs at most two queries: the SELECT in get_object and one UPDATE.
+        The response carries the new content and a newer updated_at.
+    """
+    url = reverse("post-comment-retrieve-update-destroy", args=[comment.post_id, comment.id])
+
+    with django_assert_max_num_queries(2):
+        response = api_client.put(url, {"content": "Updated comment"}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["content"] == "Updated comment"
+    assert response.data["updated_at"] == Comment.objects.get(pk=comment.pk).updated_at.isoformat().replace("+00:00", "Z")
+
+
+def test_create_comment_for_missing_post(api_client, db):
+    """
+    Verify that creating a Comment for a Post that does not exist returns HTTP 404 Not Found.
+    """
+    response = api_client.post(
+        reverse("post-comment-create", args=[999]), {"content": "Orphan"}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert Comment.objects.count() == 0
+
+
 def test_delete_comment(api_client, comment):
     """
     Verify that an existing Comment can be deleted via the API.
@@ -94,6 +135,72 @@ def test_delete_comment(api_client, comment):
     assert Comment.objects.count() == 0
 
 
+def test_get_comment_detail_repeated_get_issues_no_sql(api_client, comment, django_assert_num_queries):
+    """
+    Verify that a repeated Comment detail GET is served entirely from the repository cache.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        comment: The Comment fixture providing a Comment object.
+        django_assert_num_queries: The pytest-django fixture for counting queries.
+
+    Asserts:
+        The second GET returns HTTP 200 OK without running any query.
+    """
+    url = reverse("post-comment-retrieve-update-destroy", args=[comment.post_id, comment.id])
+    api_client.get(url)
+
+    with django_assert_num_queries(0):
+        response = api_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["content"] == "This is a test comment"
+
+
+def test_get_comments_conditional_get(api_client, comment):
+    """
+    Verify that the comment list returns 304 while unchanged and 200 after a comment is edited.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        comment: The Comment fixture providing a Comment object.
+
+    Asserts:
+        A matching If-None-Match returns 304 with the same ETag.
+        Editing a comment changes the ETag.
+    """
+    url = reverse("post-comment-create", args=[comment.post_id])
+    etag = api_client.get(url)["ETag"]
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+
+    Comment.objects.filter(pk=comment.pk).update(content="Edited", updated_at=timezone.now())
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_get_comment_detail_conditional_get(api_client, comment, django_assert_num_queries):
+    """
+    Verify that revalidating a cached Comment returns 304 without any query.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        comment: The Comment fixture providing a Comment object.
+        django_assert_num_queries: The pytest-django fixture for counting queries.
+
+    Asserts:
+        The revalidation returns 304 Not Modified and runs no query.
+    """
+    url = reverse("post-comment-retrieve-update-destroy", args=[comment.post_id, comment.id])
+    etag = api_client.get(url)["ETag"]
+
+    with django_assert_num_queries(0):
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
 @pytest.mark.django_db
 def test_update_delete_comment_not_found(api_client):
     """
@@ -217,4 +324,203 @@ def test_perform_destroy_raises_invalid_comment_pk():
 
     with pytest.raises(APIException) as excinfo:
         view.perform_destroy(None)
-    assert str(excinfo.value) == "Invalid Comment ID format."
\ No newline at end of file
+    assert str(excinfo.value) == "Invalid Comment ID format."
+
+def _create_comments(post, count):
+    return [
+        comment.pk
+        for comment in Comment.objects.bulk_create(
+            [Comment(post=post, content=f"Comment {i}") for i in range(count)]
+        )
+    ]
+
+
+def test_get_comments_cursor_pagination(api_client, post):
+    """
+    Verify that the comments of a Post are paged oldest first and that every page is one indexed range query.
+
+    Asserts:
+        Following the next links returns every Comment once, in creation order.
+        Besides the ETag aggregate, each page runs a single query that SQLite plans on the (post_id, created_at, id) index.
+    """
+    ids = _create_comments(post, 12)
+    url = reverse("post-comment-create", args=[post.id]) + "?page_size=5"
+    seen = []
+    while url:
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(queries) == 2
+        seen.extend(item["id"] for item in response.data["results"])
+        url = response.data["next"]
+
+    assert seen == ids
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + queries[-1]["sql"])
+        plan = " ".join(str(row) for row in cursor.fetchall())
+    assert "comments_post_created_id_idx" in plan
+
+
+def test_get_comments_since_and_before(api_client, post):
+    """
+    Verify that the 'since' and 'before' query parameters bound the returned comments by creation time.
+
+    Asserts:
+        'since' returns only newer comments and 'before' only older ones.
+        An invalid datetime returns HTTP 400 Bad Request.
+    """
+    ids = _create_comments(post, 3)
+    middle = Comment.objects.get(pk=ids[1]).created_at.isoformat()
+    url = reverse("post-comment-create", args=[post.id])
+
+    newer = api_client.get(url, {"since": middle})
+    older = api_client.get(url, {"before": middle})
+    invalid = api_client.get(url, {"since": "yesterday"})
+
+    assert [item["id"] for item in newer.data["results"]] == ids[2:]
+    assert [item["id"] for item in older.data["results"]] == ids[:1]
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_bulk_create_comments_across_posts(api_client, settings):
+    """
+    Verify that a comment batch spanning several posts checks the posts once and updates stats once per post.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        settings: The pytest-django fixture for overriding settings.
+
+    Asserts:
+        Valid comments are created and items with invalid data or missing posts are reported by index.
+        Posts are looked up with one SELECT and their stats with one UPDATE per post.
+        Each post's comment_count matches the comments it received.
+    """
+    settings.COMMENT_BULK_CREATE_BATCH_SIZE = 3
+    first = Post.objects.create(title="First", content="Body")
+    second = Post.objects.create(title="Second", content="Body")
+    payload = [{"post_id": first.id, "content": f"First {i}"} for i in range(4)]
+    payload += [{"post_id": second.id, "content": "Second"}, {"post_id": 999, "content": "Orphan"}]
+    payload += [{"post_id": first.id, "content": ""}]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.post(reverse("comment-bulk-create"), payload, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(response.data["created"]) == 5
+    assert [error["index"] for error in response.data["errors"]] == [5, 6]
+    statements = [query["sql"].split()[0] for query in queries if not query["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+    assert statements == ["SELECT", "INSERT", "INSERT", "UPDATE", "UPDATE"]
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert (first.comment_count, second.comment_count) == (4, 1)
+    assert first.last_commented_at == Comment.objects.filter(post=first).latest("created_at").created_at
+
+
+@pytest.mark.django_db
+def test_bulk_create_comments_without_valid_items(api_client):
+    """
+    Verify that a batch with only missing posts or a non-list body returns HTTP 400 Bad Request.
+    """
+    url = reverse("comment-bulk-create")
+
+    missing = api_client.post(url, [{"post_id": 999, "content": "Orphan"}], format="json")
+    not_a_list = api_client.post(url, {"post_id": 1, "content": "Comment"}, format="json")
+
+    assert missing.status_code == status.HTTP_400_BAD_REQUEST
+    assert missing.data["errors"][0]["errors"] == {"post_id": ["Post not found."]}
+    assert not_a_list.status_code == status.HTTP_400_BAD_REQUEST
+    assert Comment.objects.count() == 0
+
+
+def test_get_comments_sparse_fieldset(api_client, comment, django_assert_num_queries):
+    """
+    Verify that ?fields= narrows the comments of a post and of a comment detail.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        comment: The Comment fixture providing a Comment object.
+        django_assert_num_queries: Fixture asserting the number of SQL queries.
+
+    Asserts:
+        Only the requested fields are returned, with no query per comment for deferred columns.
+    """
+    _create_comments(comment.post, 3)
+    with django_assert_num_queries(2):  # Version aggregate, then the page.
+        response = api_client.get(
+            reverse("post-comment-create", args=[comment.post.id]), {"fields": "id,created_at"}
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == 4
+    assert all(set(item) == {"id", "created_at"} for item in response.data["results"])
+    detail = api_client.get(
+        reverse("post-comment-retrieve-update-destroy", args=[comment.post.id, comment.id]), {"fields": "post"}
+    )
+    assert detail.data == {"post": comment.post.id}
+
+
+def test_cached_comment_of_deleted_post_is_not_served(api_client, comment):
+    """
+    Verify that deleting a post drops its cached comments, so they stop being served and edited at once.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        comment: The Comment fixture providing a Comment object.
+
+    Asserts:
+        A comment cached before the post is deleted returns 404, also with ?fields= and a validator.
+        PATCH returns 404 and writes nothing, even with a comment loaded before the deletion.
+    """
+    url = reverse("post-comment-retrieve-update-destroy", args=[comment.post_id, comment.id])
+    etag = api_client.get(url)["ETag"]
+    api_client.delete(reverse("post-retrieve-update-destroy", args=[comment.post_id]))
+
+    assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+    assert api_client.get(url, {"fields": "content"}).status_code == status.HTTP_404_NOT_FOUND
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_404_NOT_FOUND
+    response = api_client.patch(url, {"content": "Edited"}, format="json")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    assert CommentRepository.update_comment({"content": "Edited"}, comment.id, comment=comment) is None
+    assert Comment.objects.get(pk=comment.id).content == "This is a test comment"
+
+
+def test_comment_deletion_is_not_hidden_by_if_modified_since(api_client, post):
+    """
+    Verify that If-Modified-Since never answers 304 after a comment is deleted.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+
+    Asserts:
+        The comment list carries no Last-Modified, as max(updated_at) does not move on deletion,
+        so If-Modified-Since is ignored and the list without the comment is returned.
+        Deleting the latest comment moves the post's Last-Modified forward, so its detail is
+        returned with the new comment_count, while its updated_at, the time of its last edit,
+        is left alone.
+    """
+    first = CommentRepository.create_comment({"content": "First"}, post.id)
+    latest = CommentRepository.create_comment({"content": "Latest"}, post.id)
+    an_hour_ago = timezone.now() - timezone.timedelta(hours=1)
+    Comment.objects.update(created_at=an_hour_ago, updated_at=an_hour_ago)
+    Post.objects.filter(pk=post.id).update(
+        updated_at=an_hour_ago, last_commented_at=an_hour_ago, comments_changed_at=an_hour_ago
+    )
+    cache.clear()
+    post_url = reverse("post-retrieve-update-destroy", args=[post.id])
+    comments_url = reverse("post-comment-create", args=[post.id])
+    last_modified = api_client.get(post_url)["Last-Modified"]
+    assert not api_client.get(comments_url).has_header("Last-Modified")
+
+    api_client.delete(reverse("post-comment-retrieve-update-destroy", args=[post.id, latest.id]))
+
+    comments = api_client.get(comments_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert comments.status_code == status.HTTP_200_OK
+    assert [c["id"] for c in comments.data["results"]] == [first.id]
+    detail = api_client.get(post_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert detail.status_code == status.HTTP_200_OK
+    assert detail.data["comment_count"] == 1
+    assert Post.objects.get(pk=post.id).updated_at == an_hour_ago
+    assert "comments_changed_at" not in detail.data
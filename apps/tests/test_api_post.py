@@ -1,7 +1,14 @@
+import gzip
+import json
 import pytest
+from django.core.cache import cache
+from django.db import connection
 from django.urls import reverse
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from apps.posts.models import Post
+from apps.comments.repositories.comment_repository import CommentRepository
 
 @pytest.mark.django_db
 def test_create_post(api_client):
@@ -39,8 +46,36 @@ def test_get_posts(api_client, post):
     response = api_client.get(reverse("post-list-create"))
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.data[0]["title"] == "Test Post"
-    assert response.data[0]["content"] == "This is a test post"
+    assert response.data["results"][0]["title"] == "Test Post"
+    assert response.data["results"][0]["content"] == "This is a test post"
+
+
+def test_get_post_includes_comment_stats(api_client, comment):
+    """
+    Verify that the Post API exposes the denormalized comment stats as read-only fields.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        comment: The Comment fixture providing a Comment object.
+
+    Asserts:
+        The response includes comment_count and last_commented_at.
+        Writing comment_count through the API is ignored.
+    """
+    url = reverse("post-retrieve-update-destroy", args=[comment.post_id])
+    api_client.post(
+        reverse("post-comment-create", args=[comment.post_id]),
+        {"post": comment.post_id, "content": "Another"},
+        format="json",
+    )
+
+    response = api_client.get(url)
+    # The fixture comment bypasses CommentRepository, so only the API comment is counted.
+    assert response.data["comment_count"] == 1
+    assert response.data["last_commented_at"] is not None
+
+    api_client.patch(url, {"title": "Renamed", "comment_count": 99}, format="json")
+    assert Post.objects.get(pk=comment.post_id).comment_count == 1
 
 
 @pytest.mark.django_db
@@ -94,6 +129,54 @@ def test_update_post(api_client, post):
     assert updated_post.content == "Updated content"
 
 
+def test_update_post_query_count(api_client, post, django_assert_max_num_queries):
+    """
+    Verify that updating a Post loads it once and writes it with one UPDATE.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        django_assert_max_num_queries: The pytest-django fixture for bounding queries.
+
+    Asserts:
+        The PUT runs at most two queries: the SELECT in get_object and one UPDATE.
+        The UPDATE writes every validated field, changed or not.
+        The response already reflects the new title.
+    """
+    url = reverse("post-retrieve-update-destroy", args=[post.id])
+
+    with django_assert_max_num_queries(2) as queries:
+        response = api_client.put(url, {"title": "Renamed", "content": post.content}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["title"] == "Renamed"
+    update = queries.captured_queries[-1]["sql"]
+    assert update.startswith("UPDATE")
+    assert '"title"' in update and '"content"' in update
+
+
+def test_update_post_is_written_over_a_stale_copy(api_client, post):
+    """
+    Verify that a PUT is written even when the post it was checked against is outdated.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+
+    Asserts:
+        After a concurrent write that bypassed the cache, a PUT sending the old values
+        restores them in the database instead of returning them without writing.
+    """
+    url = reverse("post-retrieve-update-destroy", args=[post.id])
+    api_client.get(url)  # Caches the post.
+    Post.objects.filter(pk=post.pk).update(title="Concurrent")
+
+    response = api_client.put(url, {"title": post.title, "content": post.content}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert Post.objects.get(pk=post.pk).title == post.title == response.data["title"]
+
+
 @pytest.mark.django_db
 def test_delete_post(api_client, post):
     """
@@ -114,6 +197,112 @@ def test_delete_post(api_client, post):
     assert Post.objects.count() == 0
 
 
+def test_deleted_post_and_comments_are_not_served(api_client, comment):
+    """
+    Verify that a deleted Post and its comments disappear from the API before they are purged.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        comment: The Comment fixture providing a Comment object.
+
+    Asserts:
+        The Post detail returns 404, the posts list is empty and the comment list is empty.
+        Commenting on the deleted Post returns 404.
+    """
+    post_id = comment.post_id
+    api_client.delete(reverse("post-retrieve-update-destroy", args=[post_id]))
+
+    assert api_client.get(reverse("post-retrieve-update-destroy", args=[post_id])).status_code == 404
+    assert api_client.get(reverse("post-list-create")).data["results"] == []
+    assert api_client.get(reverse("post-comment-create", args=[post_id])).data["results"] == []
+    response = api_client.post(reverse("post-comment-create", args=[post_id]), {"content": "Late"}, format="json")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_get_post_detail_repeated_get_issues_no_sql(api_client, post, django_assert_num_queries):
+    """
+    Verify that a repeated detail GET is served entirely from the repository cache.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        django_assert_num_queries: The pytest-django fixture for counting queries.
+
+    Asserts:
+        The second GET returns the same data without running any query.
+    """
+    url = reverse("post-retrieve-update-destroy", args=[post.id])
+    first = api_client.get(url)
+
+    with django_assert_num_queries(0):
+        second = api_client.get(url)
+
+    assert second.status_code == status.HTTP_200_OK
+    assert second.data == first.data
+
+
+def test_get_post_detail_conditional_get(api_client, post, django_assert_num_queries):
+    """
+    Verify that a post detail GET with a matching If-None-Match returns 304 without loading the post.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        django_assert_num_queries: The pytest-django fixture for counting queries.
+
+    Asserts:
+        The first response carries ETag and Last-Modified headers.
+        A revalidation runs one query that does not read the post content, and returns 304.
+        After an update, the old ETag no longer matches.
+    """
+    url = reverse("post-retrieve-update-destroy", args=[post.id])
+    etag = api_client.get(url)["ETag"]
+    cache.clear()
+
+    with django_assert_num_queries(1) as queries:
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+    assert "content" not in queries.captured_queries[0]["sql"]
+
+    api_client.patch(url, {"title": "Changed"}, format="json")
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+def test_get_posts_conditional_get(api_client, post):
+    """
+    Verify that the posts list revalidates with one covering-index aggregate and changes when comments change.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+
+    Asserts:
+        If-None-Match and If-Modified-Since both return 304 while nothing changed.
+        The ETag aggregate is answered from the posts_post_version_idx covering index.
+        A new comment, which changes comment_count, invalidates the ETag.
+    """
+    url = reverse("post-list-create")
+    first = api_client.get(url)
+
+    with CaptureQueriesContext(connection) as queries:
+        not_modified = api_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert len(queries) == 1
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + queries[0]["sql"])
+        assert "COVERING INDEX posts_post_version_idx" in str(cursor.fetchall())
+
+    since = api_client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+    assert since.status_code == status.HTTP_304_NOT_MODIFIED
+
+    CommentRepository.create_comment({"content": "New"}, post.id)
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert response.status_code == status.HTTP_200_OK
+
+
 @pytest.mark.django_db
 def test_update_delete_post_not_found(api_client):
     """
@@ -127,4 +316,433 @@ def test_update_delete_post_not_found(api_client):
     """
     response = api_client.get(reverse("post-retrieve-update-destroy", args=[444]))
 
-    assert response.status_code == status.HTTP_404_NOT_FOUND
\ No newline at end of file
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+def _create_posts(count):
+    """
+    Create `count` posts, giving every pair of posts the same created_at to exercise the id tie-breaker.
+    """
+    posts = Post.objects.bulk_create(
+        [Post(title=f"Post {i}", content=f"Content {i}") for i in range(count)]
+    )
+    for first, second in zip(posts[::2], posts[1::2]):
+        Post.objects.filter(pk=second.pk).update(
+            created_at=Post.objects.get(pk=first.pk).created_at
+        )
+    return [post.pk for post in posts]
+
+
+@pytest.mark.django_db
+def test_get_posts_cursor_pagination_walks_every_post_once(api_client):
+    """
+    Verify that following the next links visits every Post exactly once in (created_at, id) order.
+
+    Asserts:
+        Each page holds at most `page_size` posts.
+        The concatenated pages contain every Post id once, in creation order.
+        Following the previous link from the second page returns the first page.
+    """
+    ids = _create_posts(23)
+    url = reverse("post-list-create") + "?page_size=5"
+    seen, pages = [], []
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) <= 5
+        pages.append(response.data)
+        seen.extend(item["id"] for item in response.data["results"])
+        url = response.data["next"]
+
+    assert seen == ids
+    assert pages[0]["previous"] is None
+    previous = api_client.get(pages[1]["previous"])
+    assert [item["id"] for item in previous.data["results"]] == ids[:5]
+
+
+@pytest.mark.django_db
+def test_get_posts_deep_page_costs_the_same_as_first_page(api_client, django_assert_num_queries):
+    """
+    Verify that a deep page is fetched with one range query and no OFFSET scan.
+
+    Asserts:
+        The first and the last page each run the same two queries: the ETag aggregate and the page.
+        Neither page query uses OFFSET, and both read only page_size + 1 rows.
+    """
+    _create_posts(60)
+    url = reverse("post-list-create") + "?page_size=5"
+    with django_assert_num_queries(2) as first_page:
+        response = api_client.get(url)
+    while response.data["next"]:
+        last_url = response.data["next"]
+        response = api_client.get(last_url)
+    with django_assert_num_queries(2) as last_page:
+        api_client.get(last_url)
+
+    for captured in (first_page, last_page):
+        sql = captured.captured_queries[-1]["sql"]
+        assert "OFFSET" not in sql
+        assert "LIMIT 6" in sql
+
+
+@pytest.mark.django_db
+def test_get_posts_invalid_cursor(api_client):
+    """
+    Verify that a tampered cursor returns HTTP 404 Not Found.
+    """
+    response = api_client.get(reverse("post-list-create") + "?cursor=not-a-cursor")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_bulk_create_posts(api_client, settings):
+    """
+    Verify that the bulk endpoint inserts valid posts in batches and reports invalid ones by index.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        settings: The pytest-django fixture for overriding settings.
+
+    Asserts:
+        The response is HTTP 201 Created with the IDs of the created posts.
+        The invalid item is reported with its index and field errors.
+        The 5 valid posts are inserted with ceil(5 / batch size) INSERT statements.
+    """
+    settings.POST_BULK_CREATE_BATCH_SIZE = 2
+    payload = [{"title": f"Post {i}", "content": "Body"} for i in range(5)]
+    payload.insert(3, {"title": "", "content": "Missing title"})
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.post(reverse("post-bulk-create"), payload, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["created"] == list(
+        Post.objects.order_by("id").values_list("id", flat=True)
+    )
+    assert len(response.data["created"]) == 5
+    assert [error["index"] for error in response.data["errors"]] == [3]
+    assert "title" in response.data["errors"][0]["errors"]
+    inserts = [query for query in queries if query["sql"].startswith("INSERT")]
+    assert len(inserts) == 3
+
+
+@pytest.mark.django_db
+def test_bulk_create_posts_rejects_invalid_payloads(api_client, settings):
+    """
+    Verify that the bulk endpoint rejects non-list bodies, oversized lists and lists with no valid item.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        settings: The pytest-django fixture for overriding settings.
+
+    Asserts:
+        Each request returns HTTP 400 Bad Request and no post is created.
+    """
+    settings.POST_BULK_CREATE_MAX_ITEMS = 2
+    url = reverse("post-bulk-create")
+
+    not_a_list = api_client.post(url, {"title": "Post", "content": "Body"}, format="json")
+    too_many = api_client.post(url, [{"title": "Post", "content": "Body"}] * 3, format="json")
+    all_invalid = api_client.post(url, [{"title": ""}, "not an object"], format="json")
+
+    assert not_a_list.status_code == status.HTTP_400_BAD_REQUEST
+    assert too_many.status_code == status.HTTP_400_BAD_REQUEST
+    assert all_invalid.status_code == status.HTTP_400_BAD_REQUEST
+    assert [error["index"] for error in all_invalid.data["errors"]] == [0, 1]
+    assert Post.objects.count() == 0
+
+
+def test_export_streams_posts_then_comments(api_client, comment, django_assert_num_queries):
+    """
+    Verify that the export endpoint streams every post, then every comment, as NDJSON.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        comment: The Comment fixture providing a Comment object.
+        django_assert_num_queries: The pytest-django fixture for counting queries.
+
+    Asserts:
+        The response is streamed and each line is one JSON object tagged with its type.
+        The whole export runs one query per table, however many rows there are.
+    """
+    Post.objects.bulk_create([Post(title=f"Post {i}", content="Body") for i in range(5)])
+
+    with django_assert_num_queries(2):
+        response = api_client.get(reverse("blog-export"))
+        body = b"".join(response.streaming_content)
+
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in body.splitlines()]
+    assert [record["type"] for record in records] == ["post"] * 6 + ["comment"]
+    assert records[0]["id"] == comment.post_id
+    assert records[-1] == {
+        "type": "comment",
+        "id": comment.id,
+        "post_id": comment.post_id,
+        "content": comment.content,
+        "created_at": records[-1]["created_at"],
+        "updated_at": records[-1]["updated_at"],
+    }
+
+
+def test_export_gzip(api_client, comment):
+    """
+    Verify that ?gzip=1 streams the same export compressed with gzip.
+    """
+    plain = b"".join(api_client.get(reverse("blog-export")).streaming_content)
+    response = api_client.get(reverse("blog-export"), {"gzip": "1"})
+
+    assert response["Content-Type"] == "application/gzip"
+    assert 'filename="blog-export.ndjson.gz"' in response["Content-Disposition"]
+    assert gzip.decompress(b"".join(response.streaming_content)) == plain
+
+
+@pytest.mark.django_db
+def test_search_posts_ranks_titles_and_matches_comments(api_client):
+    """
+    Verify that search matches titles, contents and comments, best BM25 rank first.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+
+    Asserts:
+        A title match outranks a body match, and a post matched only by a comment is found.
+        Snippets highlight the term and escape HTML; deleted posts are not returned.
+    """
+    in_title = Post.objects.create(title="Sourdough basics", content="Flour and water.")
+    in_body = Post.objects.create(title="Weekend", content="I baked <b>sourdough</b> again.")
+    via_comment = Post.objects.create(title="Bread tools", content="Ovens and pans.")
+    via_comment.comments.create(content="Great for sourdough too")
+    deleted = Post.objects.create(title="Sourdough deleted", content="Gone")
+    Post.objects.filter(pk=deleted.pk).update(deleted_at=timezone.now())
+
+    response = api_client.get(reverse("post-search"), {"q": "sourdough"})
+
+    assert response.status_code == status.HTTP_200_OK
+    results = response.data["results"]
+    assert [hit["id"] for hit in results][0] == in_title.id
+    assert {hit["id"] for hit in results} == {in_title.id, in_body.id, via_comment.id}
+    body_hit = next(hit for hit in results if hit["id"] == in_body.id)
+    assert "<mark>sourdough</mark>" in body_hit["snippet"]
+    assert "&lt;b&gt;" in body_hit["snippet"]
+
+
+@pytest.mark.django_db
+def test_search_posts_cursor_paging(api_client):
+    """
+    Verify that search results are paged with a forward cursor without repeats or gaps.
+    """
+    Post.objects.bulk_create([Post(title=f"Kettle {i}", content="kettle " * (i + 1)) for i in range(5)])
+    seen, url, params = [], reverse("post-search"), {"q": "kett*", "page_size": 2}
+    while url:
+        response = api_client.get(url, params)
+        assert response.data["previous"] is None
+        seen += [hit["id"] for hit in response.data["results"]]
+        url, params = response.data["next"], None
+
+    assert sorted(seen) == sorted(Post.objects.values_list("id", flat=True))
+    assert len(seen) == 5
+
+
+@pytest.mark.django_db
+def test_search_posts_requires_query_and_escapes_operators(api_client, post):
+    """
+    Verify that an empty query returns 400 and FTS5 syntax in the query is searched literally.
+    """
+    assert api_client.get(reverse("post-search"), {"q": "  "}).status_code == status.HTTP_400_BAD_REQUEST
+    response = api_client.get(reverse("post-search"), {"q": 'test" OR NEAR('})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"] == []
+
+
+def test_get_posts_sparse_fieldset(api_client, post):
+    """
+    Verify that ?fields= narrows the posts list and keeps the post content out of the SQL.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+
+    Asserts:
+        Only the requested fields are returned, and the next page link still works.
+        The list query does not select the content column.
+    """
+    Post.objects.create(title="Second Post", content="More content")
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(reverse("post-list-create"), {"fields": "id,title", "page_size": 1})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"] == [{"id": post.id, "title": "Test Post"}]
+    list_sql = next(query["sql"] for query in queries if "LIMIT" in query["sql"])
+    assert '"posts_post"."title"' in list_sql
+    assert '"posts_post"."content"' not in list_sql
+    next_page = api_client.get(response.data["next"])
+    assert [item["title"] for item in next_page.data["results"]] == ["Second Post"]
+    assert set(next_page.data["results"][0]) == {"id", "title"}
+
+
+def test_get_post_sparse_fieldset(api_client, post, django_assert_num_queries):
+    """
+    Verify that a post detail honours ?fields= without caching a partially loaded post.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        django_assert_num_queries: Fixture asserting the number of SQL queries.
+
+    Asserts:
+        The sparse response holds only the requested fields.
+        A later full GET still returns every field.
+    """
+    url = reverse("post-retrieve-update-destroy", args=[post.id])
+    with django_assert_num_queries(2):  # Version lookup, then the sparse row.
+        response = api_client.get(url, {"fields": "title,comment_count"})
+
+    assert response.data == {"title": "Test Post", "comment_count": 0}
+    assert api_client.get(url).data["content"] == "This is a test post"
+    assert api_client.get(url, {"fields": "content"}).data == {"content": "This is a test post"}
+
+
+def test_sparse_fieldset_rejects_unknown_fields_and_ignores_writes(api_client, post):
+    """
+    Verify that unknown fields are rejected with 400 and that writes always return every field.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+
+    Asserts:
+        Requesting an unknown field returns 400 naming it.
+        A PATCH with ?fields= returns the full post.
+    """
+    url = reverse("post-retrieve-update-destroy", args=[post.id])
+    response = api_client.get(url, {"fields": "title,password"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "password" in response.data["fields"][0]
+    patched = api_client.patch(f"{url}?fields=id", {"title": "Renamed"}, format="json")
+    assert patched.status_code == status.HTTP_200_OK
+    assert patched.data["title"] == "Renamed"
+    assert "content" in patched.data
+
+
+def test_get_post_includes_newest_comments(api_client, post, django_assert_num_queries):
+    """
+    Verify that ?include=comments embeds the newest comments of the post, with a cursor for the older ones.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        django_assert_num_queries: The pytest-django fixture for counting queries.
+
+    Asserts:
+        A cold request runs two queries: the post, then the newest comments with their version.
+        The embedded page holds the newest comments, oldest first, like the comment list.
+        Its previous link pages through the older comments on the comment list endpoint.
+    """
+    comments = [CommentRepository.create_comment({"content": f"Comment {i}"}, post.id) for i in range(5)]
+    cache.clear()
+    url = reverse("post-retrieve-update-destroy", args=[post.id])
+
+    with django_assert_num_queries(2):
+        response = api_client.get(url, {"include": "comments", "comments_limit": 2})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["title"] == post.title
+    assert response.data["comment_count"] == 5
+    embedded = response.data["comments"]
+    assert [c["id"] for c in embedded["results"]] == [comments[3].id, comments[4].id]
+    assert embedded["next"] is None
+    older = api_client.get(embedded["previous"])
+    assert [c["id"] for c in older.data["results"]] == [comments[1].id, comments[2].id]
+    oldest = api_client.get(older.data["previous"])
+    assert [c["id"] for c in oldest.data["results"]] == [comments[0].id]
+    assert oldest.data["previous"] is None
+
+    with django_assert_num_queries(1):  # The post now comes from the cache.
+        assert api_client.get(url, {"include": "comments", "comments_limit": 2}).data == response.data
+
+
+def test_get_post_include_comments_etag_follows_comment_edits(api_client, comment):
+    """
+    Verify that the ETag of a post with its comments changes when a comment is edited.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        comment: The Comment fixture providing a Comment object.
+
+    Asserts:
+        The compound document revalidates with a 304, and returns 200 again after a comment edit,
+        which leaves the post itself untouched.
+    """
+    url = reverse("post-retrieve-update-destroy", args=[comment.post.id])
+    first = api_client.get(url, {"include": "comments"})
+    assert first.data["comments"]["results"][0]["content"] == comment.content
+    assert first["ETag"] != api_client.get(url)["ETag"]
+
+    not_modified = api_client.get(url, {"include": "comments"}, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    comment_url = reverse("post-comment-retrieve-update-destroy", args=[comment.post.id, comment.id])
+    api_client.patch(comment_url, {"content": "Edited"}, format="json")
+    edited = api_client.get(url, {"include": "comments"}, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert edited.status_code == status.HTTP_200_OK
+    assert edited.data["comments"]["results"][0]["content"] == "Edited"
+
+
+def test_get_post_include_validation(api_client, post):
+    """
+    Verify that unknown includes are rejected, and that comments are only embedded on request.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+
+    Asserts:
+        An unknown include returns 400 naming it; a missing post is still a 404.
+        Without comments, the embedded page is empty with no links; ?fields= narrows the post only.
+    """
+    url = reverse("post-retrieve-update-destroy", args=[post.id])
+    invalid = api_client.get(url, {"include": "comments,author"})
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+    assert "author" in invalid.data["include"][0]
+    missing = api_client.get(reverse("post-retrieve-update-destroy", args=[post.id + 1]), {"include": "comments"})
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+    assert "comments" not in api_client.get(url).data
+    sparse = api_client.get(url, {"include": "comments", "fields": "id"})
+    assert sparse.data == {"id": post.id, "comments": {"next": None, "previous": None, "results": []}}
+
+
+def test_get_posts_if_modified_since_sees_deletions(api_client, comment):
+    """
+    Verify that If-Modified-Since on the posts list does not answer 304 after a soft delete.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        comment: The Comment fixture providing a Comment object.
+
+    Asserts:
+        Deleting a post, which only lowers the live count, moves Last-Modified forward,
+        and so does deleting a comment, which lowers a post's comment_count.
+    """
+    other = Post.objects.create(title="Other", content="Stays")
+    an_hour_ago = timezone.now() - timezone.timedelta(hours=1)
+    Post.objects.update(updated_at=an_hour_ago, last_commented_at=None, comments_changed_at=None)
+    url = reverse("post-list-create")
+    last_modified = api_client.get(url)["Last-Modified"]
+
+    api_client.delete(reverse("post-retrieve-update-destroy", args=[comment.post_id]))
+    response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == status.HTTP_200_OK
+    assert [post["id"] for post in response.data["results"]] == [other.id]
+
+    late = CommentRepository.create_comment({"content": "Late"}, other.id)
+    Post.objects.update(updated_at=an_hour_ago, last_commented_at=an_hour_ago, comments_changed_at=an_hour_ago)
+    Post.all_objects.filter(deleted_at__isnull=False).update(deleted_at=an_hour_ago)
+    last_modified = api_client.get(url)["Last-Modified"]
+    CommentRepository.delete_comment(late.id)
+    response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"][0]["comment_count"] == 0
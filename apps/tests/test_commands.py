@@ -0,0 +1,266 @@
+import gzip
+import json
+import pytest
+from io import StringIO
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.utils import timezone
+from apps.posts.models import ImportCheckpoint, Post
+from apps.comments.models import Comment
+from apps.posts.services.import_service import ImportService
+from apps.posts.services.search_service import SearchService
+
+
+def test_recount_post_comments_repairs_drift(post, comment):
+    """
+    Verify that the recount_post_comments command recomputes drifted comment stats.
+
+    Args:
+        post: The Post fixture providing a Post object.
+        comment: The Comment fixture providing a Comment object.
+
+    Asserts:
+        comment_count and last_commented_at are recomputed from the comments table.
+        Posts without comments are reset to zero.
+    """
+    empty = Post.objects.create(title="Empty", content="No comments")
+    Post.objects.update(comment_count=42, last_commented_at=None)
+
+    out = StringIO()
+    call_command("recount_post_comments", batch_size=1, stdout=out)
+
+    post.refresh_from_db()
+    empty.refresh_from_db()
+    assert post.comment_count == 1
+    assert post.last_commented_at == Comment.objects.get(pk=comment.pk).created_at
+    assert empty.comment_count == 0
+    assert "Recounted comment stats for 2 posts." in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_recount_post_comments_invalid_batch_size():
+    with pytest.raises(CommandError):
+        call_command("recount_post_comments", batch_size=0)
+
+
+def test_purge_deleted_posts_removes_posts_and_comments_in_batches(post, comment):
+    """
+    Verify that purge_deleted_posts removes soft-deleted posts with their comments, in batches.
+
+    Args:
+        post: The Post fixture providing a Post object.
+        comment: The Comment fixture providing a Comment object.
+
+    Asserts:
+        The soft-deleted Post and all its comments are gone; live posts are untouched.
+    """
+    Comment.objects.bulk_create([Comment(post=post, content=f"Comment {i}") for i in range(4)])
+    live = Post.objects.create(title="Live", content="Still here")
+    Comment.objects.create(post=live, content="Kept")
+    Post.objects.filter(pk=post.pk).update(deleted_at=timezone.now())
+
+    out = StringIO()
+    call_command("purge_deleted_posts", batch_size=2, stdout=out)
+
+    assert not Post.all_objects.filter(pk=post.pk).exists()
+    assert not Comment.objects.filter(post_id=post.pk).exists()
+    assert list(Post.objects.all()) == [live]
+    assert Comment.objects.filter(post=live).count() == 1
+    assert "Purged 1 posts and 5 comments." in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_purge_deleted_posts_invalid_options():
+    with pytest.raises(CommandError):
+        call_command("purge_deleted_posts", batch_size=0)
+    with pytest.raises(CommandError):
+        call_command("purge_deleted_posts", pause=-1)
+
+
+def test_export_blog_writes_gzip_file(comment, tmp_path):
+    """
+    Verify that export_blog writes the NDJSON export to a file, compressed with --gzip.
+
+    Args:
+        comment: The Comment fixture providing a Comment object.
+        tmp_path: The pytest fixture providing a temporary directory.
+
+    Asserts:
+        The file holds one post line and one comment line.
+    """
+    output = tmp_path / "export.ndjson.gz"
+    out = StringIO()
+    call_command("export_blog", output=str(output), gzip=True, chunk_size=1, stdout=out)
+
+    lines = gzip.decompress(output.read_bytes()).splitlines()
+    assert [json.loads(line)["type"] for line in lines] == ["post", "comment"]
+    assert f"to {output}" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_import_blog_ndjson_maps_legacy_ids(tmp_path):
+    """
+    Verify that import_blog loads posts before comments and attaches comments to the new post IDs.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+
+    Asserts:
+        Comments listed before their post are still imported, under the new post ID.
+        Timestamps are kept, comment stats are maintained and orphaned comments are skipped.
+    """
+    dump = tmp_path / "dump.ndjson"
+    records = [
+        {"type": "comment", "id": 7, "post_id": 500, "content": "Early", "created_at": "2020-01-02T00:00:00Z"},
+        {"type": "post", "id": 500, "title": "Legacy", "content": "Body", "created_at": "2020-01-01T00:00:00Z"},
+        {"type": "post", "id": 501, "title": "", "content": "No title"},
+        {"type": "comment", "id": 8, "post_id": 999, "content": "Orphan"},
+    ]
+    dump.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+
+    out = StringIO()
+    call_command("import_blog", str(dump), batch_size=1, stdout=out)
+
+    post = Post.objects.get()
+    assert post.title == "Legacy"
+    assert post.created_at.isoformat() == "2020-01-01T00:00:00+00:00"
+    assert post.comment_count == 1
+    comment = Comment.objects.get()
+    assert comment.post_id == post.id
+    assert comment.created_at == post.last_commented_at
+    assert "Imported 1 posts and 1 comments" in out.getvalue()
+    assert "skipped 2 rows" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_import_blog_csv_resumes_from_checkpoint(tmp_path):
+    """
+    Verify that an import run with a checkpoint resumes after the last committed batch.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+
+    Asserts:
+        Rows before the checkpoint are not imported again and the legacy ID map is restored.
+        A finished import is not run twice.
+    """
+    dump = tmp_path / "dump.csv"
+    dump.write_text(
+        "type,id,post_id,title,content\n"
+        "post,1,,First,Body\n"
+        "post,2,,Second,Body\n"
+        "comment,1,1,,On first\n"
+        "comment,2,2,,On second\n"
+    )
+    call_command("import_blog", str(dump), batch_size=1, checkpoint="blog", stdout=StringIO())
+    assert Post.objects.count() == 2 and Comment.objects.count() == 2
+
+    # Pretend the previous run stopped after the first comment batch.
+    Comment.objects.filter(content="On second").delete()
+    ImportCheckpoint.objects.filter(name="blog").update(phase="comment", position=3)
+    out = StringIO()
+    call_command("import_blog", str(dump), batch_size=1, checkpoint="blog", stdout=out)
+
+    assert Post.objects.count() == 2
+    assert Comment.objects.get(content="On second").post.title == "Second"
+    assert "Imported 0 posts and 1 comments" in out.getvalue()
+
+    out = StringIO()
+    call_command("import_blog", str(dump), checkpoint="blog", stdout=out)
+    assert "finished import" in out.getvalue()
+    assert Comment.objects.count() == 2
+
+    call_command("import_blog", str(dump), checkpoint="blog", restart=True, stdout=StringIO())
+    assert Post.objects.count() == 4 and Comment.objects.count() == 4
+
+
+@pytest.mark.django_db(transaction=True)
+def test_import_blog_crash_before_checkpoint_does_not_duplicate(tmp_path, mocker):
+    """
+    Verify that a batch interrupted before its checkpoint is saved is rolled back, not imported twice.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+        mocker: The pytest-mock fixture.
+
+    Asserts:
+        The interrupted run keeps only the first batch; the resumed run imports each post once
+        and attaches every comment to it.
+    """
+    dump = tmp_path / "dump.ndjson"
+    records = [
+        {"type": "post", "id": 10, "title": "First", "content": "Body"},
+        {"type": "post", "id": 20, "title": "Second", "content": "Body"},
+        {"type": "comment", "id": 1, "post_id": 20, "content": "On second"},
+    ]
+    dump.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+    save_progress = ImportService.save_progress
+    calls = []
+
+    def crash_on_second_batch(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        save_progress(*args, **kwargs)
+
+    mocker.patch.object(ImportService, "save_progress", side_effect=crash_on_second_batch)
+    with pytest.raises(KeyboardInterrupt):
+        call_command("import_blog", str(dump), batch_size=1, checkpoint="blog", stdout=StringIO())
+    assert list(Post.objects.values_list("title", flat=True)) == ["First"]
+
+    mocker.stopall()
+    call_command("import_blog", str(dump), batch_size=1, checkpoint="blog", stdout=StringIO())
+    assert sorted(Post.objects.values_list("title", flat=True)) == ["First", "Second"]
+    assert Comment.objects.get().post.title == "Second"
+
+
+def test_import_blog_restart_requires_checkpoint(tmp_path):
+    """
+    Verify that --restart is refused without --checkpoint.
+    """
+    dump = tmp_path / "dump.ndjson"
+    dump.write_text("")
+    with pytest.raises(CommandError):
+        call_command("import_blog", str(dump), restart=True)
+
+
+def test_rebuild_search_index_restores_the_index(post, comment):
+    """
+    Verify that rebuild_search_index re-indexes existing rows and restores the sync triggers.
+
+    Args:
+        post: The Post fixture providing a Post object.
+        comment: The Comment fixture providing a Comment object.
+
+    Asserts:
+        Rows written before the index existed are searchable after the rebuild, and
+        rows written afterwards are indexed by the triggers.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TRIGGER blog_search_post_insert")
+        cursor.execute("DELETE FROM blog_search")
+    out = StringIO()
+    call_command("rebuild_search_index", batch_size=1, stdout=out)
+    Post.objects.create(title="Later", content="Written after the rebuild")
+
+    assert "Indexed 1 posts and 1 comments." in out.getvalue()
+    assert [hit["id"] for hit in SearchService.search_posts("comment", 10)] == [post.id]
+    assert len(SearchService.search_posts("rebuild", 10)) == 1
+
+
+def test_migrate_restores_search_triggers(post):
+    """
+    Verify that running migrations recreates the search triggers a SQLite table rebuild drops.
+
+    Args:
+        post: The Post fixture providing a Post object.
+
+    Asserts:
+        Posts created after migrate are indexed again.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TRIGGER blog_search_post_insert")
+    call_command("migrate", verbosity=0)
+    created = Post.objects.create(title="Reindexed", content="Written after migrate")
+
+    assert [hit["id"] for hit in SearchService.search_posts("reindexed", 10)] == [created.id]
@@ -0,0 +1,198 @@
+import gzip
+import re
+import pytest
+from asgiref.sync import async_to_sync
+from django.middleware.csrf import _unmask_cipher_token
+from django.test import AsyncClient, Client
+from django.urls import reverse
+from apps.posts.models import Post
+from my_project_blog import compression
+
+
+@pytest.fixture
+def posts(db):
+    """
+    Create enough posts for the list pages to be worth compressing.
+
+    Args:
+        db: The pytest fixture that sets up a test database.
+    """
+    return Post.objects.bulk_create(
+        [Post(title=f"Post {i}", content="Lorem ipsum dolor sit amet. " * 20) for i in range(10)]
+    )
+
+
+def test_negotiate():
+    """
+    Verify that the content coding is picked from the Accept-Encoding header, honouring q-values.
+    """
+    assert compression.negotiate("gzip, deflate") == "gzip"
+    assert compression.negotiate("GZIP;q=0.5") == "gzip"
+    assert compression.negotiate("*") == compression.ENCODINGS[0]
+    assert compression.negotiate("gzip;q=0, *") == ("br" if "br" in compression.ENCODINGS else None)
+    assert compression.negotiate("gzip;q=0") is None
+    assert compression.negotiate("deflate, identity") is None
+    assert compression.negotiate("") is None
+
+
+def test_post_list_is_gzipped(api_client, posts):
+    """
+    Verify that a large JSON response is gzip-compressed when the client accepts it.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        posts: The posts fixture providing a full list page.
+
+    Asserts:
+        The body decompresses to the uncompressed response, with a matching Content-Length.
+        Vary names Accept-Encoding and the ETag is weak, as the body differs by coding.
+    """
+    url = reverse("post-list-create")
+    plain = api_client.get(url)
+    response = api_client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+    assert response["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.content) == plain.content
+    assert int(response["Content-Length"]) == len(response.content) < len(plain.content)
+    assert "Accept-Encoding" in response["Vary"]
+    assert response["ETag"] == "W/" + plain["ETag"]
+
+
+@pytest.mark.parametrize("accept_encoding", [None, "gzip;q=0", "identity"])
+def test_response_left_uncompressed_without_gzip(api_client, posts, accept_encoding):
+    """
+    Verify that the response is sent as is when the client does not accept gzip.
+    """
+    headers = {"HTTP_ACCEPT_ENCODING": accept_encoding} if accept_encoding else {}
+    response = api_client.get(reverse("post-list-create"), **headers)
+
+    assert not response.has_header("Content-Encoding")
+    assert "Accept-Encoding" in response["Vary"]
+    assert response.json()["results"]
+
+
+def test_small_response_left_uncompressed(api_client, post):
+    """
+    Verify that bodies below COMPRESSION_MIN_SIZE are not compressed.
+    """
+    response = api_client.get(reverse("post-retrieve-update-destroy", args=[post.id]), HTTP_ACCEPT_ENCODING="gzip")
+
+    assert not response.has_header("Content-Encoding")
+    assert response.json()["id"] == post.id
+
+
+def test_compressed_body_is_cached_with_etag(api_client, posts, mocker):
+    """
+    Verify that the compressed body of a response with an ETag is reused by identical requests.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        posts: The posts fixture providing a full list page.
+        mocker: The pytest-mock fixture.
+
+    Asserts:
+        The body is compressed once for two requests, and the weak ETag still revalidates.
+        A write changes the ETag, so the next request compresses the new body.
+    """
+    compress = mocker.spy(compression, "compress")
+    url = reverse("post-list-create")
+    first = api_client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+    second = api_client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+    assert compress.call_count == 1
+    assert second.content == first.content
+    assert api_client.get(url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+
+    api_client.post(url, {"title": "New", "content": "Post"}, format="json")
+    third = api_client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+    assert compress.call_count == 2
+    assert b"New" in gzip.decompress(third.content)
+
+
+def test_compression_under_asgi(api_client, posts):
+    """
+    Verify that responses served through the ASGI handler are compressed like WSGI ones.
+    """
+    url = reverse("post-list-create")
+    plain = api_client.get(url)
+    response = async_to_sync(AsyncClient().get)(url, headers={"Accept-Encoding": "gzip"})
+
+    assert response["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.content) == plain.content
+
+
+def test_export_is_compressed_while_streaming(api_client, comment):
+    """
+    Verify that the streaming export is compressed on the fly, and that the ?gzip=1 archive is not compressed twice.
+    """
+    url = reverse("blog-export")
+    plain = b"".join(api_client.get(url).streaming_content)
+    response = api_client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+    assert response["Content-Encoding"] == "gzip"
+    assert not response.has_header("Content-Length")
+    assert gzip.decompress(b"".join(response.streaming_content)) == plain
+
+    archive = api_client.get(url, {"gzip": "1"}, HTTP_ACCEPT_ENCODING="gzip")
+    assert not archive.has_header("Content-Encoding")
+    assert gzip.decompress(b"".join(archive.streaming_content)) == plain
+
+
+def test_html_page_is_gzipped(client, posts):
+    """
+    Verify that the HTML pages are compressed too.
+    """
+    url = reverse("post-list")
+    plain = client.get(url)
+    response = client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+    assert response["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.content) == plain.content
+
+
+def test_compress_stream_sync_and_async():
+    """
+    Verify that both stream compressors flush every chunk and produce a complete gzip member.
+    """
+    chunks = [b'{"id": %d}\n' % i for i in range(100)]
+
+    async def achunks():
+        for chunk in chunks:
+            yield chunk
+
+    async def acollect():
+        return [part async for part in compression.acompress_stream(achunks(), "gzip")]
+
+    for parts in (list(compression.compress_stream(iter(chunks), "gzip")), async_to_sync(acollect)()):
+        assert len(parts) > len(chunks) / 2
+        assert gzip.decompress(b"".join(parts)) == b"".join(chunks)
+
+
+def test_html_with_csrf_token_is_not_shared_between_clients(posts):
+    """
+    Verify that a compressed page holding the requester's CSRF token is never served to another client.
+
+    Args:
+        posts: The posts fixture providing a full list page.
+
+    Asserts:
+        Two clients without cookies each get the CSRF token matching their own cookie.
+    """
+    url = reverse("post-list-create")
+    for _ in range(2):
+        client = Client()
+        response = client.get(url, HTTP_ACCEPT="text/html", HTTP_ACCEPT_ENCODING="gzip")
+        assert response["Content-Encoding"] == "gzip"
+        page = gzip.decompress(response.content).decode()
+        token = re.search(r'"csrfToken": "([^"]+)"', page).group(1)
+        secret = client.cookies["csrftoken"].value
+        assert _unmask_cipher_token(token) == secret
+
+
+def test_cache_key_depends_on_scheme(rf):
+    """
+    Verify that http and https requests do not share compressed bodies, which hold absolute links.
+    """
+    plain, secure = rf.get("/api/posts/"), rf.get("/api/posts/", secure=True)
+
+    assert compression.cache_key(plain, '"v1"', "gzip") != compression.cache_key(secure, '"v1"', "gzip")
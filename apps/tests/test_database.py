@@ -0,0 +1,93 @@
+import sqlite3
+import pytest
+from django.conf import settings
+from django.db import connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+
+@pytest.fixture
+def production_connection(tmp_path):
+    """
+    Open a connection to a new SQLite file with the production database profile.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+
+    Returns:
+        DatabaseWrapper: A connection configured with SQLITE_PRODUCTION_PROFILE.
+    """
+    settings_dict = {**connections.settings["default"], **settings.SQLITE_PRODUCTION_PROFILE}
+    settings_dict["NAME"] = str(tmp_path / "production.sqlite3")
+    wrapper = DatabaseWrapper(settings_dict, alias="production")
+    yield wrapper
+    wrapper.close()
+
+
+def pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_production_profile_applies_pragmas(production_connection):
+    """
+    Verify that the production profile's pragmas are applied when a connection is opened.
+
+    Args:
+        production_connection: A connection using the production profile.
+
+    Asserts:
+        The database file is in WAL mode and the connection uses the configured
+        synchronous, busy_timeout, cache_size, mmap_size and temp_store values.
+    """
+    pragmas = settings.SQLITE_PRODUCTION_PROFILE["PRAGMAS"]
+    assert pragma(production_connection, "journal_mode") == "wal"
+    assert pragma(production_connection, "synchronous") == 1  # NORMAL
+    assert pragma(production_connection, "busy_timeout") == pragmas["busy_timeout"]
+    assert pragma(production_connection, "cache_size") == pragmas["cache_size"]
+    assert pragma(production_connection, "mmap_size") == pragmas["mmap_size"]
+    assert pragma(production_connection, "temp_store") == 2  # MEMORY
+
+
+@pytest.mark.django_db
+def test_production_profile_takes_write_lock_at_begin(production_connection):
+    """
+    Verify that transactions of the production profile start with BEGIN IMMEDIATE.
+
+    Args:
+        production_connection: A connection using the production profile.
+
+    Asserts:
+        While a transaction that has not written anything yet is open, another
+        connection cannot start a write transaction.
+    """
+    production_connection.ensure_connection()
+    other = sqlite3.connect(production_connection.settings_dict["NAME"], timeout=0, isolation_level=None)
+    # What atomic() does on entry; the wrapper is not registered in `connections`.
+    production_connection.set_autocommit(False, force_begin_transaction_with_broken_autocommit=True)
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            other.execute("BEGIN IMMEDIATE")
+    finally:
+        production_connection.rollback()
+        production_connection.set_autocommit(True)
+        other.close()
+
+
+def test_apply_pragmas_rejects_invalid_values(mocker):
+    """
+    Verify that pragma values which are not keywords or integers are refused.
+
+    Args:
+        mocker: The pytest-mock fixture.
+
+    Asserts:
+        ValueError is raised before anything is executed.
+    """
+    from my_project_blog.sqlite import apply_pragmas
+
+    wrapper = mocker.MagicMock(vendor="sqlite", settings_dict={"PRAGMAS": {"cache_size": "1; DROP TABLE posts_post"}})
+    with pytest.raises(ValueError, match="Invalid SQLite pragma"):
+        apply_pragmas(sender=DatabaseWrapper, connection=wrapper)
+    wrapper.cursor.return_value.__enter__.return_value.execute.assert_not_called()
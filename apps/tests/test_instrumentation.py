@@ -0,0 +1,166 @@
+import json
+import logging
+import re
+import time
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from my_project_blog.renderers import FastJSONRenderer
+
+SERVER_TIMING = re.compile(
+    r'^db;dur=[0-9.]+;desc="(?P<queries>[0-9]+) queries", serialize;dur=(?P<serialize>[0-9.]+), total;dur=[0-9.]+$'
+)
+
+
+@pytest.fixture
+def slow_renderer(mocker):
+    """
+    Make JSON rendering take at least 5 ms, so its share of the timings is measurable.
+
+    Args:
+        mocker: The pytest-mock fixture.
+    """
+    render = FastJSONRenderer.render
+
+    def slow_render(self, *args, **kwargs):
+        time.sleep(0.005)
+        return render(self, *args, **kwargs)
+
+    mocker.patch.object(FastJSONRenderer, "render", slow_render)
+
+
+def test_server_timing_header(api_client, post, slow_renderer):
+    """
+    Verify that API responses report their queries and timings in a Server-Timing header.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        slow_renderer: The fixture slowing JSON rendering down.
+
+    Asserts:
+        The header lists the database time with the number of queries, the rendering
+        time and the total time; the cached second request runs fewer queries.
+    """
+    url = reverse("post-retrieve-update-destroy", args=[post.pk])
+    first = SERVER_TIMING.match(api_client.get(url)["Server-Timing"])
+    second = SERVER_TIMING.match(api_client.get(url)["Server-Timing"])
+
+    assert first and second
+    assert int(first["queries"]) == 2  # Version lookup, then the post itself.
+    assert int(second["queries"]) == 0  # Version and post both come from the cache.
+    assert float(first["serialize"]) >= 5
+
+
+def test_server_timing_header_under_asgi(post, slow_renderer):
+    """
+    Verify that the async read views report their timings too.
+
+    Args:
+        post: The Post fixture providing a Post object.
+        slow_renderer: The fixture slowing JSON rendering down.
+
+    Asserts:
+        The Server-Timing header counts the queries of the async view and its rendering.
+    """
+    response = async_to_sync(AsyncClient().get)(reverse("post-retrieve-update-destroy", args=[post.pk]))
+    timing = SERVER_TIMING.match(response["Server-Timing"])
+    assert timing and int(timing["queries"]) == 2
+    assert float(timing["serialize"]) >= 5
+
+
+def test_request_log_line(api_client, post, caplog):
+    """
+    Verify that every request is logged as one JSON line.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        caplog: The pytest fixture capturing log records.
+
+    Asserts:
+        The line carries the method, path, status, query count and timings.
+    """
+    with caplog.at_level(logging.INFO, logger="my_project_blog.requests"):
+        api_client.get(reverse("post-retrieve-update-destroy", args=[post.pk + 1]))
+
+    [record] = [record for record in caplog.records if record.name == "my_project_blog.requests"]
+    line = json.loads(record.getMessage())
+    assert line["method"] == "GET"
+    assert line["path"] == reverse("post-retrieve-update-destroy", args=[post.pk + 1])
+    assert line["status"] == status.HTTP_404_NOT_FOUND
+    assert line["queries"] >= 1
+    assert {"db_ms", "serialize_ms", "total_ms"} <= line.keys()
+
+
+def test_slow_query_log(api_client, post, caplog, settings):
+    """
+    Verify that queries slower than SLOW_QUERY_MS are logged with their SQL, parameters and caller.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        caplog: The pytest fixture capturing log records.
+        settings: The pytest-django fixture for overriding settings.
+
+    Asserts:
+        With a threshold of 0 every query is logged, and the post lookup names the
+        repository method that ran it. A negative threshold disables the log.
+    """
+    settings.SLOW_QUERY_MS = 0
+    with caplog.at_level(logging.WARNING, logger="my_project_blog.sql.slow"):
+        api_client.get(reverse("post-retrieve-update-destroy", args=[post.pk]))
+    queries = [json.loads(record.getMessage()) for record in caplog.records if record.name == "my_project_blog.sql.slow"]
+
+    lookup = next(query for query in queries if query["caller"].endswith("PostRepository.get_post_by_id"))
+    assert lookup["caller"] == "apps.posts.repositories.post_repository.PostRepository.get_post_by_id"
+    assert '"posts_post"' in lookup["sql"]
+    assert repr(post.pk) in lookup["params"]
+    assert lookup["database"] == "default"
+
+    caplog.clear()
+    settings.SLOW_QUERY_MS = -1
+    with caplog.at_level(logging.WARNING, logger="my_project_blog.sql.slow"):
+        api_client.get(reverse("post-retrieve-update-destroy", args=[post.pk]))
+    assert not [record for record in caplog.records if record.name == "my_project_blog.sql.slow"]
+
+
+
+def test_slow_query_log_failure_does_not_fail_the_query(api_client, post, caplog, settings, mocker):
+    """
+    Verify that an error while logging a slow query is logged, not raised over the query's result.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        caplog: The pytest fixture capturing log records.
+        settings: The pytest-django fixture for overriding settings.
+        mocker: The pytest-mock fixture.
+    """
+    settings.SLOW_QUERY_MS = 0
+    mocker.patch("my_project_blog.instrumentation.find_caller", side_effect=AttributeError("co_qualname"))
+    with caplog.at_level(logging.WARNING, logger="my_project_blog.sql.slow"):
+        response = api_client.get(reverse("post-retrieve-update-destroy", args=[post.pk]))
+
+    assert response.status_code == 200
+    assert "Could not log a slow query." in caplog.text
+
+
+def test_server_timing_header_can_be_disabled(api_client, post, settings):
+    """
+    Verify that SERVER_TIMING_HEADER = False keeps the timings from clients.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        settings: The pytest-django fixture for overriding settings.
+
+    Asserts:
+        The response has no Server-Timing header.
+    """
+    settings.SERVER_TIMING_HEADER = False
+    response = api_client.get(reverse("post-list-create"))
+    assert response.status_code == status.HTTP_200_OK
+    assert "Server-Timing" not in response
@@ -0,0 +1,129 @@
+import json
+import os
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from my_project_blog.metrics import registry
+
+
+@pytest.fixture
+def metrics_dir(settings, tmp_path):
+    """
+    Collect metrics into an empty directory, starting from zero.
+
+    Args:
+        settings: The pytest-django fixture for overriding settings.
+        tmp_path: The pytest fixture providing a temporary directory.
+
+    Returns:
+        Path: The directory shared by the worker processes.
+    """
+    settings.METRICS_DIR = str(tmp_path)
+    registry.reset()
+    yield tmp_path
+    registry.reset()
+
+
+def scrape(client):
+    response = client.get(reverse("metrics"))
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    samples = {}
+    for line in response.content.decode().splitlines():
+        if line and not line.startswith("#"):
+            key, value = line.rsplit(" ", 1)
+            samples[key] = float(value)
+    return response.content.decode(), samples
+
+
+def test_metrics_count_requests_by_url_name(api_client, post, metrics_dir):
+    """
+    Verify that /metrics reports requests, latency, queries, cache use and in-flight requests.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        metrics_dir: The fixture isolating the metrics store.
+
+    Asserts:
+        Requests are counted by URL name, method and status, with a latency
+        histogram, their SQL queries, the cache hit ratio and the scrape itself
+        as the one request in flight.
+    """
+    detail = reverse("post-retrieve-update-destroy", args=[post.pk])
+    api_client.get(reverse("post-list-create"))
+    api_client.get(detail)
+    api_client.get(detail)
+    api_client.get("/api/posts/does-not-exist/")
+
+    text, samples = scrape(api_client)
+
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert samples['http_requests_total{view="post-list-create",method="GET",status="200"}'] == 1
+    assert samples['http_requests_total{view="post-retrieve-update-destroy",method="GET",status="200"}'] == 2
+    assert samples['http_requests_total{view="unmatched",method="GET",status="404"}'] == 1
+    assert samples['http_request_duration_seconds_bucket{view="post-retrieve-update-destroy",le="+Inf"}'] == 2
+    assert samples['http_request_duration_seconds_count{view="post-retrieve-update-destroy"}'] == 2
+    assert samples['http_request_duration_seconds_sum{view="post-retrieve-update-destroy"}'] > 0
+    assert samples['db_queries_total{view="post-retrieve-update-destroy"}'] == 2  # The second one is cached.
+    assert samples['repository_cache_hit_ratio{cache="post"}'] > 0
+    assert samples["http_requests_in_flight"] == 1
+
+
+def test_metrics_histogram_buckets_are_cumulative(api_client, post, metrics_dir):
+    """
+    Verify that the latency buckets are cumulative and listed in increasing order.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        metrics_dir: The fixture isolating the metrics store.
+
+    Asserts:
+        Bucket counts never decrease and the +Inf bucket comes last.
+    """
+    for _ in range(3):
+        api_client.get(reverse("post-list-create"))
+    text, _ = scrape(api_client)
+
+    buckets = [
+        line for line in text.splitlines() if line.startswith('http_request_duration_seconds_bucket{view="post-list-create"')
+    ]
+    counts = [float(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    assert buckets[-1].endswith('le="+Inf"} 3')
+
+
+def test_metrics_add_up_worker_processes(api_client, post, metrics_dir):
+    """
+    Verify that /metrics adds up the files of every worker process.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        metrics_dir: The fixture isolating the metrics store.
+
+    Asserts:
+        Counters and histograms of another live worker and of an exited one are
+        added; only the live worker's in-flight gauge is.
+    """
+    key = 'http_requests_total{view="post-list-create",method="GET",status="200"}'
+    histogram = 'http_request_duration_seconds{view="post-list-create"}'
+    for pid, in_flight in ((os.getppid(), 2), (2**22 + 12345, 5)):  # A live process, and one that is gone.
+        (metrics_dir / f"{pid}.json").write_text(
+            json.dumps(
+                {
+                    "pid": pid,
+                    "counters": {key: 10},
+                    "histograms": {histogram: [10] + [0] * 11 + [0.01]},
+                    "gauges": {"http_requests_in_flight": in_flight},
+                }
+            )
+        )
+
+    api_client.get(reverse("post-list-create"))
+    _, samples = scrape(api_client)
+
+    assert samples[key] == 21
+    assert samples['http_request_duration_seconds_count{view="post-list-create"}'] == 21
+    assert samples["http_requests_in_flight"] == 3
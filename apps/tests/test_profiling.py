@@ -0,0 +1,202 @@
+import tracemalloc
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from my_project_blog.middleware import ProfilingMiddleware
+from my_project_blog.profiling import make_token, read_token, sampler
+
+
+@pytest.fixture
+def profiling(settings, tmp_path):
+    """
+    Enable request profiling into a temporary directory, with no rate limit.
+
+    Args:
+        settings: The pytest-django fixture for overriding settings.
+        tmp_path: The pytest fixture providing a temporary directory.
+
+    Returns:
+        Path: The directory profiles are written to.
+    """
+    settings.PROFILING_ENABLED = True
+    settings.PROFILING_DIR = str(tmp_path)
+    settings.PROFILING_MAX_PER_MINUTE = 1000
+    sampler._recent.clear()
+    yield tmp_path
+    sampler._recent.clear()
+
+
+def test_profiled_request_writes_stats_and_summary(api_client, post, profiling):
+    """
+    Verify that a request with a valid token is profiled down to the repository layer.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        profiling: The fixture enabling profiling into a temporary directory.
+
+    Asserts:
+        The response is unchanged apart from an X-Profile header naming the files.
+        A .prof file and a summary covering the view and the repository are written.
+    """
+    response = api_client.get(reverse("post-list-create"), HTTP_X_PROFILE_TOKEN=make_token())
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"][0]["title"] == post.title
+    name = response["X-Profile"]
+    assert (profiling / f"{name}.prof").stat().st_size > 0
+    summary = (profiling / f"{name}.txt").read_text()
+    assert summary.startswith("GET /api/posts/ -> 200")
+    project_code = summary.split("Project code only (apps/):")[1]
+    assert "api_views.py" in project_code
+    assert "post_service.py" in project_code
+    assert "post_repository.py" in project_code
+    assert "tracemalloc" not in summary
+
+
+def test_profiled_request_with_memory_tracing(api_client, post, profiling):
+    """
+    Verify that a memory token adds the tracemalloc statistics to the summary.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        profiling: The fixture enabling profiling into a temporary directory.
+
+    Asserts:
+        The summary reports the peak memory and the top allocations.
+    """
+    url = reverse("post-retrieve-update-destroy", args=[post.pk])
+    response = api_client.get(url, {"profile": make_token(memory=True)})
+
+    summary = (profiling / f"{response['X-Profile']}.txt").read_text()
+    assert "tracemalloc: peak" in summary
+
+
+
+def test_profile_write_failure_keeps_the_response(api_client, post, profiling, settings, caplog):
+    """
+    Verify that a profile that cannot be written is logged and the response is served as is.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        profiling: The fixture enabling profiling into a temporary directory.
+        settings: The pytest-django fixture for overriding settings.
+        caplog: The pytest fixture capturing log records.
+    """
+    (profiling / "file").write_text("")
+    settings.PROFILING_DIR = str(profiling / "file" / "profiles")  # mkdir fails under a file.
+    response = api_client.get(reverse("post-retrieve-update-destroy", args=[post.pk]), {"profile": make_token()})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "X-Profile" not in response
+    assert "Could not write the profile" in caplog.text
+
+
+def test_failing_request_stops_memory_tracing(rf, profiling):
+    """
+    Verify that tracemalloc is stopped and the sampler released when the rest of the chain raises.
+
+    Args:
+        rf: The pytest-django RequestFactory fixture.
+        profiling: The fixture enabling profiling into a temporary directory.
+    """
+
+    def get_response(request):
+        raise RuntimeError("boom")
+
+    middleware = ProfilingMiddleware(get_response)
+    with pytest.raises(RuntimeError):
+        middleware(rf.get("/api/posts/", {"profile": make_token(memory=True)}))
+
+    assert not tracemalloc.is_tracing()
+    assert sampler.acquire()
+    sampler.release()
+
+
+@pytest.mark.parametrize("token", [None, "cpu", "cpu:forged:signature"])
+def test_request_without_valid_token_is_not_profiled(api_client, post, profiling, token):
+    """
+    Verify that only requests carrying a correctly signed token are profiled.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        profiling: The fixture enabling profiling into a temporary directory.
+        token: The token sent, if any.
+
+    Asserts:
+        No X-Profile header and no file.
+    """
+    extra = {"HTTP_X_PROFILE_TOKEN": token} if token else {}
+    response = api_client.get(reverse("post-list-create"), **extra)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "X-Profile" not in response
+    assert not list(profiling.iterdir())
+
+
+def test_profiling_disabled_ignores_tokens(api_client, post, profiling, settings):
+    """
+    Verify that tokens have no effect unless PROFILING_ENABLED is set.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        profiling: The fixture enabling profiling into a temporary directory.
+        settings: The pytest-django fixture for overriding settings.
+
+    Asserts:
+        The request is not profiled.
+    """
+    settings.PROFILING_ENABLED = False
+    response = api_client.get(reverse("post-list-create"), HTTP_X_PROFILE_TOKEN=make_token())
+    assert "X-Profile" not in response
+    assert not list(profiling.iterdir())
+
+
+def test_profiling_rate_limit_and_rotation(api_client, post, profiling, settings):
+    """
+    Verify that profiles are rate limited and that only the newest files are kept.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        profiling: The fixture enabling profiling into a temporary directory.
+        settings: The pytest-django fixture for overriding settings.
+
+    Asserts:
+        With PROFILING_MAX_FILES = 2, three profiles leave the two newest ones.
+        With PROFILING_MAX_PER_MINUTE = 3, a fourth request is served unprofiled.
+    """
+    settings.PROFILING_MAX_FILES = 2
+    settings.PROFILING_MAX_PER_MINUTE = 3
+    url = reverse("post-list-create")
+    names = [api_client.get(url, HTTP_X_PROFILE_TOKEN=make_token())["X-Profile"] for _ in range(3)]
+
+    assert sorted(path.stem for path in profiling.glob("*.prof")) == sorted(names[1:])
+    assert sorted(path.stem for path in profiling.glob("*.txt")) == sorted(names[1:])
+    assert "X-Profile" not in api_client.get(url, HTTP_X_PROFILE_TOKEN=make_token())
+
+
+def test_profiling_token_command(settings):
+    """
+    Verify that the profiling_token command prints a valid token.
+
+    Args:
+        settings: The pytest-django fixture for overriding settings.
+
+    Asserts:
+        The printed token is accepted, in memory mode with --memory, and is
+        rejected once older than PROFILING_TOKEN_MAX_AGE.
+    """
+    out = StringIO()
+    call_command("profiling_token", memory=True, stdout=out, stderr=StringIO())
+    token = out.getvalue().strip()
+
+    assert read_token(token) == "memory"
+    settings.PROFILING_TOKEN_MAX_AGE = -1
+    assert read_token(token) is None
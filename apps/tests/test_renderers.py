@@ -0,0 +1,129 @@
+import datetime
+import io
+import json
+import uuid
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+import pytest
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from my_project_blog.renderers import FastJSONParser, FastJSONRenderer
+
+PAYLOAD = {
+    "utc": datetime.datetime(2024, 5, 6, 7, 8, 9, 123456, tzinfo=datetime.timezone.utc),
+    "bogota": datetime.datetime(2024, 5, 6, 7, 8, 9, tzinfo=ZoneInfo("America/Bogota")),
+    "naive": datetime.datetime(2024, 5, 6, 7, 8, 9),
+    "date": datetime.date(2024, 5, 6),
+    "time": datetime.time(7, 8, 9, 500),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "decimal": Decimal("12.50"),
+    "text": "Ñandú \u2028 line \u2029 paragraph \"quoted\" \\ </script> 🚀",
+    "lazy": gettext_lazy("This field is required."),
+    "errors": {"title": [ErrorDetail("This field may not be blank.", code="blank")]},
+    "numbers": [0, -1, 2**63 - 1, 1.5, True, None],
+    1: "integer key",
+}
+
+
+@pytest.fixture
+def without_orjson(mocker):
+    """
+    Simulate an environment where orjson is not installed.
+
+    Args:
+        mocker: The pytest-mock fixture.
+    """
+    mocker.patch("my_project_blog.renderers.orjson", None)
+
+
+@pytest.mark.parametrize("media_type", [None, "application/json", "application/json; indent=4"])
+def test_fast_renderer_matches_json_renderer(media_type):
+    """
+    Verify that FastJSONRenderer renders the same bytes as DRF's JSONRenderer, floats in exponent notation aside.
+
+    Args:
+        media_type: Accepted media type, including the indented variant.
+
+    Asserts:
+        Datetimes in any time zone, dates, times, UUIDs, Decimals, lazy strings, error details,
+        big integers, non-string keys and the U+2028/U+2029 escapes are rendered identically.
+    """
+    assert FastJSONRenderer().render(PAYLOAD, media_type) == JSONRenderer().render(PAYLOAD, media_type)
+    beyond_64_bits = {"id": 2**64}  # orjson refuses it; the stdlib renderer takes over.
+    assert FastJSONRenderer().render(beyond_64_bits, media_type) == JSONRenderer().render(beyond_64_bits, media_type)
+    assert FastJSONRenderer().render(None) == b""
+
+
+def test_fast_renderer_floats_are_equivalent():
+    """
+    Verify that floats, such as search ranks, render to the same values, though exponents are written shorter.
+
+    Asserts:
+        Plain floats are rendered byte for byte like JSONRenderer.
+        Floats in exponent notation parse back to the same values; only their spelling differs.
+    """
+    plain = {"rank": [1.5, -0.25, 123456.789, 0.1 + 0.2]}
+    assert FastJSONRenderer().render(plain) == JSONRenderer().render(plain)
+    exponents = {"rank": [-1.996370235934664e-06, 1e-07, 1.5e20, 6.02e23]}
+    content = FastJSONRenderer().render(exponents)
+    assert json.loads(content) == json.loads(JSONRenderer().render(exponents)) == exponents
+    assert b"e-6" in content
+
+
+def test_fast_renderer_falls_back_to_stdlib(without_orjson):
+    """
+    Verify that without orjson FastJSONRenderer and FastJSONParser behave like DRF's classes.
+    """
+    assert FastJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+    assert FastJSONParser().parse(io.BytesIO(b'{"a": [1, "\\u00e9"]}')) == {"a": [1, "é"]}
+
+
+def test_fast_parser_matches_json_parser():
+    """
+    Verify that FastJSONParser parses like JSONParser and rejects what the strict parser rejects.
+
+    Asserts:
+        Bodies parse to the same data, in UTF-8 or in another declared charset.
+        Malformed JSON and NaN raise ParseError.
+    """
+    body = '{"title": "Ñandú", "items": [1, 2.5, null, true], "nested": {"k": "v"}}'.encode()
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+    latin1 = '{"title": "Ñandú"}'.encode("latin-1")
+    assert FastJSONParser().parse(io.BytesIO(latin1), parser_context={"encoding": "latin-1"}) == {"title": "Ñandú"}
+    for invalid in (b'{"title": ', b'{"value": NaN}'):
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(invalid))
+
+
+def test_api_responses_match_json_renderer(api_client, comment, mocker):
+    """
+    Verify that API responses are byte for byte what JSONRenderer would render, and that JSON
+    request bodies are parsed by FastJSONParser.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        comment: The Comment fixture providing a Comment object.
+        mocker: The pytest-mock fixture.
+    """
+    parse = mocker.spy(FastJSONParser, "parse")
+    urls = [
+        reverse("post-list-create"),
+        reverse("post-retrieve-update-destroy", args=[comment.post.id]),
+        reverse("post-comment-create", args=[comment.post.id]),
+        reverse("post-comment-retrieve-update-destroy", args=[comment.post.id, comment.id]),
+    ]
+    for url in urls:
+        response = api_client.get(url)
+        assert response.content == JSONRenderer().render(response.data)
+
+    created = api_client.post(
+        reverse("post-list-create"),
+        data='{"title": "Ñandú \\u2028 x", "content": "Body"}',
+        content_type="application/json",
+    )
+    assert created.data["title"] == "Ñandú \u2028 x"
+    parse.assert_called_once()
+    assert created.content == JSONRenderer().render(created.data)
@@ -0,0 +1,174 @@
+import pytest
+from django.db import connection, connections, transaction
+from django.urls import reverse
+from rest_framework import status
+from apps.posts.models import Post
+from my_project_blog.routers import PrimaryReplicaRouter, use_primary
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+# Not "replica", which DATABASE_REPLICA_PATH may already configure as a mirror of the primary.
+REPLICA = "lagging_replica"
+
+
+@pytest.fixture
+def replicate(tmp_path, settings):
+    """
+    Add a replica database: a snapshot of the test database in a second SQLite file.
+
+    The replica only changes when the returned function is called, so every write made
+    in between simulates replication lag.
+
+    Args:
+        tmp_path: The pytest fixture providing a temporary directory.
+        settings: The pytest-django fixture for overriding settings.
+
+    Returns:
+        Callable: Copies the current state of the primary to the replica.
+    """
+    path = tmp_path / "replica.sqlite3"
+
+    def replicate():
+        connections[REPLICA].close()
+        path.unlink(missing_ok=True)
+        with connection.cursor() as cursor:
+            cursor.execute("VACUUM INTO %s", [str(path)])
+        # Connect eagerly: the test case refuses lazy connections to aliases it did not declare.
+        connections[REPLICA].connect()
+
+    connections.settings[REPLICA] = {**connections.settings["default"], "NAME": str(path)}
+    settings.DATABASE_REPLICAS = [REPLICA]
+    replicate()
+    yield replicate
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+def post_titles(response):
+    return [post["title"] for post in response.data["results"]]
+
+
+def test_reads_are_served_by_the_replica(api_client, replicate):
+    """
+    Verify that GET requests read from the replica, and so lag behind the primary.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        replicate: The fixture syncing the replica with the primary.
+
+    Asserts:
+        A post written directly to the primary is missing from the list until it
+        is replicated.
+    """
+    Post.objects.create(title="Lagging", content="Not replicated yet")
+    assert post_titles(api_client.get(reverse("post-list-create"))) == []
+
+    replicate()
+    assert post_titles(api_client.get(reverse("post-list-create"))) == ["Lagging"]
+
+
+def test_writer_reads_its_own_writes(api_client, replicate, settings):
+    """
+    Verify that a client that has just written reads from the primary while pinned.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        replicate: The fixture syncing the replica with the primary.
+        settings: The pytest-django fixture for overriding settings.
+
+    Asserts:
+        A successful write sets the pin cookie for REPLICA_PIN_SECONDS.
+        The writer then sees its post, though the replica has not caught up.
+        Another client, without the cookie, still reads the lagging replica.
+    """
+    response = api_client.post(
+        reverse("post-list-create"), {"title": "Mine", "content": "Just written"}, format="json"
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    pin = response.cookies[settings.REPLICA_PIN_COOKIE]
+    assert pin["max-age"] == settings.REPLICA_PIN_SECONDS
+
+    assert post_titles(api_client.get(reverse("post-list-create"))) == ["Mine"]
+    post_id = Post.objects.using("default").get(title="Mine").pk
+    detail = api_client.get(reverse("post-retrieve-update-destroy", args=[post_id]))
+    assert detail.status_code == status.HTTP_200_OK
+
+    api_client.cookies.clear()
+    assert post_titles(api_client.get(reverse("post-list-create"))) == []
+
+
+def test_expired_pin_reads_from_the_replica(api_client, replicate, settings):
+    """
+    Verify that a pin cookie past its expiry time no longer pins reads to the primary.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        replicate: The fixture syncing the replica with the primary.
+        settings: The pytest-django fixture for overriding settings.
+
+    Asserts:
+        With an expired or malformed pin, the list is read from the lagging replica.
+    """
+    Post.objects.create(title="Lagging", content="Not replicated yet")
+    for value in ("0", "not-a-time"):
+        api_client.cookies[settings.REPLICA_PIN_COOKIE] = value
+        assert post_titles(api_client.get(reverse("post-list-create"))) == []
+
+
+def test_failed_write_does_not_pin(api_client, replicate, settings):
+    """
+    Verify that a rejected write does not pin the client to the primary.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        replicate: The fixture syncing the replica with the primary.
+        settings: The pytest-django fixture for overriding settings.
+
+    Asserts:
+        A 400 response carries no pin cookie.
+    """
+    response = api_client.post(reverse("post-list-create"), {"title": ""}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert settings.REPLICA_PIN_COOKIE not in response.cookies
+
+
+def test_router_keeps_reads_on_the_primary_when_required(replicate):
+    """
+    Verify the cases where the router sends reads to the primary despite replicas.
+
+    Args:
+        replicate: The fixture syncing the replica with the primary.
+
+    Asserts:
+        Reads go to the replica by default, but to the primary inside `use_primary`
+        and inside a transaction. Writes always go to the primary.
+    """
+    router = PrimaryReplicaRouter()
+    assert router.db_for_read(Post) == REPLICA
+    assert router.db_for_write(Post) == "default"
+    with use_primary():
+        assert router.db_for_read(Post) == "default"
+    with transaction.atomic():
+        assert router.db_for_read(Post) == "default"
+    assert router.db_for_read(Post) == REPLICA
+
+
+def test_cache_is_filled_from_the_primary(api_client, replicate):
+    """
+    Verify that single-object lookups are cached from the primary, not the replica.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        replicate: The fixture syncing the replica with the primary.
+
+    Asserts:
+        An update not yet replicated is returned by the cached detail lookup, so a
+        lagging replica never puts a stale row in the cache.
+    """
+    post = Post.objects.create(title="Old", content="Content")
+    replicate()
+    Post.objects.filter(pk=post.pk).update(title="New")
+
+    response = api_client.get(reverse("post-retrieve-update-destroy", args=[post.pk]))
+    assert response.data["title"] == "New"
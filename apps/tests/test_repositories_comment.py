@@ -1,6 +1,7 @@
 import pytest
 from django.db import DatabaseError
 from apps.comments.repositories.comment_repository import CommentRepository
+from apps.posts.repositories.post_repository import PostRepository
 
 
 
@@ -66,6 +67,7 @@ def test_database_error_repository_get_comment_by_post_and_id(mocker):
         CommentRepository.get_comment_by_post_and_id(3, -1)
     
 
+@pytest.mark.django_db
 def test_database_error_repository_create_comment(mocker):
     mocker.patch('apps.comments.repositories.comment_repository.Comment.objects.create', side_effect=DatabaseError)
 
@@ -84,3 +86,87 @@ def test_database_error_repository_delete_comment(mocker):
 
     with pytest.raises(DatabaseError):
         CommentRepository.delete_comment(-1)
+
+
+def test_repository_create_comment_updates_post_stats(post):
+    """
+    Verify that creating comments keeps the Post's comment_count and last_commented_at up to date.
+
+    Args:
+        post: The Post fixture providing a Post object.
+
+    Asserts:
+        comment_count is incremented once per comment.
+        last_commented_at matches the newest comment.
+    """
+    CommentRepository.create_comment({"content": "First"}, post.id)
+    newest = CommentRepository.create_comment({"content": "Second"}, post.id)
+
+    post.refresh_from_db()
+    assert post.comment_count == 2
+    assert post.last_commented_at == newest.created_at
+
+
+def test_repository_delete_comment_updates_post_stats(post):
+    """
+    Verify that deleting comments decrements comment_count and rewinds last_commented_at.
+
+    Args:
+        post: The Post fixture providing a Post object.
+
+    Asserts:
+        After deleting the newest comment, last_commented_at points at the remaining one.
+        After deleting every comment, the stats are back to zero and None.
+    """
+    oldest = CommentRepository.create_comment({"content": "First"}, post.id)
+    newest = CommentRepository.create_comment({"content": "Second"}, post.id)
+
+    CommentRepository.delete_comment(newest.id)
+    post.refresh_from_db()
+    assert post.comment_count == 1
+    assert post.last_commented_at == oldest.created_at
+
+    CommentRepository.delete_comment(oldest.id)
+    post.refresh_from_db()
+    assert post.comment_count == 0
+    assert post.last_commented_at is None
+
+
+def test_repository_update_comment_invalidates_cache(comment, django_assert_num_queries):
+    """
+    Verify that a cached Comment is served without SQL until it is updated.
+
+    Args:
+        comment: The Comment fixture providing a Comment object.
+        django_assert_num_queries: The pytest-django fixture for counting queries.
+
+    Asserts:
+        The repeated lookup runs no query.
+        After an update, the lookup returns the new content.
+    """
+    CommentRepository.get_comment_by_post_and_id(comment.post_id, comment.id)
+    with django_assert_num_queries(0):
+        CommentRepository.get_comment_by_post_and_id(comment.post_id, comment.id)
+
+    CommentRepository.update_comment({"content": "Edited"}, comment.id)
+
+    result = CommentRepository.get_comment_by_post_and_id(comment.post_id, comment.id)
+    assert result.content == "Edited"
+
+
+def test_repository_comment_writes_invalidate_cached_post(post):
+    """
+    Verify that creating and deleting comments drops the cached Post, whose comment stats changed.
+
+    Args:
+        post: The Post fixture providing a Post object.
+
+    Asserts:
+        The cached Post always reports the current comment_count.
+    """
+    PostRepository.get_post_by_id(post.id)
+    created = CommentRepository.create_comment({"content": "New"}, post.id)
+    assert PostRepository.get_post_by_id(post.id).comment_count == 1
+
+    CommentRepository.delete_comment(created.id)
+    assert PostRepository.get_post_by_id(post.id).comment_count == 0
@@ -0,0 +1,156 @@
+import pytest
+from django.utils import timezone
+from django.urls import reverse
+from apps.posts.repositories.cache import comment_cache, post_cache
+from apps.posts.repositories.post_repository import PostRepository
+from apps.comments.repositories.comment_repository import CommentRepository
+from apps.posts.models import Post
+from apps.comments.models import Comment
+
+
+def test_repository_get_post_by_id_is_cached(post, django_assert_num_queries):
+    """
+    Verify that a repeated lookup of the same Post is served from the cache.
+
+    Args:
+        post: The Post fixture providing a Post object.
+        django_assert_num_queries: The pytest-django fixture for counting queries.
+
+    Asserts:
+        The second lookup runs no query and counts as a cache hit.
+    """
+    post_cache.reset_stats()
+    assert PostRepository.get_post_by_id(post.id) == post
+
+    with django_assert_num_queries(0):
+        assert PostRepository.get_post_by_id(post.id) == post
+    assert post_cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_post_detail_counts_one_cache_lookup_per_request(api_client, post):
+    """
+    Verify that a post detail GET counts a single cache lookup, though the ETag lookup peeks at the cache too.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+
+    Asserts:
+        A cold GET counts one miss and a warm GET one hit, so the hit ratio is not inflated.
+    """
+    url = reverse("post-retrieve-update-destroy", args=[post.id])
+    post_cache.reset_stats()
+    api_client.get(url)
+    assert post_cache.stats() == {"hits": 0, "misses": 1}
+    api_client.get(url)
+    assert post_cache.stats() == {"hits": 1, "misses": 1}
+
+
+@pytest.mark.django_db
+def test_repository_get_post_by_id_does_not_cache_misses(django_assert_num_queries):
+    """
+    Verify that looking up a missing Post is not cached, so it is found once it exists.
+    """
+    assert PostRepository.get_post_by_id(9999) is None
+    with django_assert_num_queries(1):
+        assert PostRepository.get_post_by_id(9999) is None
+
+
+def test_repository_update_post_invalidates_cache(post):
+    """
+    Verify that updating a Post drops its cached copy.
+
+    Args:
+        post: The Post fixture providing a Post object.
+
+    Asserts:
+        The next lookup returns the updated title.
+    """
+    PostRepository.get_post_by_id(post.id)
+    PostRepository.update_post({"title": "Updated"}, post.id)
+
+    assert PostRepository.get_post_by_id(post.id).title == "Updated"
+
+
+def test_repository_delete_post_soft_deletes(comment, django_assert_num_queries):
+    """
+    Verify that deleting a Post only marks it as deleted, with one UPDATE, and stops serving it.
+
+    Args:
+        comment: The Comment fixture providing a Comment object.
+        django_assert_num_queries: The pytest-django fixture for counting queries.
+
+    Asserts:
+        The deletion writes with a single UPDATE, then reads the comment IDs to drop their cached
+        copies, and leaves the rows in place for the purge.
+        Neither the cached Post nor the cached Comment can be looked up afterwards.
+    """
+    post_id = comment.post_id
+    PostRepository.get_post_by_id(post_id)
+    CommentRepository.get_comment_by_post_and_id(post_id, comment.id)
+
+    with django_assert_num_queries(2) as queries:
+        PostRepository.delete_post(post_id)
+    assert [query["sql"].split()[0] for query in queries.captured_queries] == ["UPDATE", "SELECT"]
+
+    assert PostRepository.get_post_by_id(post_id) is None
+    assert CommentRepository.get_comment_by_post_and_id(post_id, comment.id) is None
+    assert Post.all_objects.get(pk=post_id).deleted_at is not None
+    assert Comment.objects.filter(pk=comment.pk).exists()
+    assert PostRepository.get_deleted_post_ids() == [post_id]
+
+
+def test_repository_purge_comments_batch_invalidates_cache(comment):
+    """
+    Verify that purging a batch of comments removes them and drops their cached copies.
+
+    Args:
+        comment: The Comment fixture providing a Comment object.
+
+    Asserts:
+        Batches are bounded by batch_size and the last call reports nothing left.
+        The cached Comment is gone once it is purged.
+    """
+    post_id = comment.post_id
+    Comment.objects.create(post_id=post_id, content="Second")
+    CommentRepository.get_comment_by_post_and_id(post_id, comment.id)
+    PostRepository.delete_post(post_id)
+
+    assert CommentRepository.purge_comments_batch(post_id, 1) == 1
+    assert CommentRepository.purge_comments_batch(post_id, 1) == 1
+    assert CommentRepository.purge_comments_batch(post_id, 1) == 0
+    assert comment_cache.backend.get(comment_cache.make_key(post_id, comment.id)) is None
+    assert PostRepository.purge_post(post_id) is True
+    assert not Post.all_objects.filter(pk=post_id).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_create_keeping_timestamps_leaves_other_saves_alone(mocker):
+    """
+    Verify that keeping imported timestamps does not switch off auto_now for other saves meanwhile.
+
+    Args:
+        mocker: The pytest-mock fixture.
+
+    Asserts:
+        The imported post keeps its timestamps, and a post saved while the import runs
+        (as by a request in another thread) is stamped with the current time.
+    """
+    long_ago = timezone.now() - timezone.timedelta(days=365)
+    bulk_create = Post.objects.bulk_create
+    concurrent = []
+
+    def bulk_create_and_save_another(*args, **kwargs):
+        posts = bulk_create(*args, **kwargs)
+        concurrent.append(Post.objects.create(title="Concurrent", content="Request"))
+        return posts
+
+    mocker.patch.object(Post.objects, "bulk_create", side_effect=bulk_create_and_save_another)
+    [imported] = PostRepository.bulk_create_posts(
+        [{"title": "Imported", "content": "Old", "created_at": long_ago, "updated_at": long_ago}],
+        keep_timestamps=True,
+    )
+
+    imported.refresh_from_db()
+    assert imported.created_at == imported.updated_at == long_ago
+    assert concurrent[0].created_at > long_ago and concurrent[0].updated_at > long_ago
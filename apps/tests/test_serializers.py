@@ -0,0 +1,75 @@
+import datetime
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from apps.comments.models import Comment
+from apps.comments.serializers import CommentSerializer
+from apps.posts.models import Post
+from apps.posts.serializers import PostSerializer, ValuesListSerializer
+
+
+@pytest.mark.parametrize("fields", [None, ("id", "title", "created_at"), ("last_commented_at",)])
+def test_values_list_serializer_matches_post_serializer(comment, fields):
+    """
+    Verify that ValuesListSerializer renders posts byte for byte like PostSerializer.
+
+    Args:
+        comment: The Comment fixture, so one post has comment stats set.
+        fields: Sparse fieldset to render, or None for every field.
+
+    Asserts:
+        The rendered JSON is identical, for null and non-null datetimes, with and without microseconds.
+    """
+    Post.objects.create(title="Tz", content="Exact second")
+    exact_second = datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+    Post.objects.filter(title="Tz").update(created_at=exact_second)
+    posts = Post.objects.order_by("id")
+    serializer = ValuesListSerializer(PostSerializer, fields=fields)
+    rows = posts.values_list(*serializer.get_columns(), named=True)
+
+    expected = JSONRenderer().render(PostSerializer(posts, many=True, fields=fields).data)
+    assert JSONRenderer().render(serializer.to_representation(rows)) == expected
+
+
+def test_values_list_serializer_matches_comment_serializer(comment):
+    """
+    Verify that ValuesListSerializer renders comments, including their post key, like CommentSerializer.
+    """
+    comments = Comment.objects.order_by("id")
+    serializer = ValuesListSerializer(CommentSerializer)
+    rows = comments.values_list(*serializer.get_columns(required=("created_at", "id")), named=True)
+
+    expected = JSONRenderer().render(CommentSerializer(comments, many=True).data)
+    assert JSONRenderer().render(serializer.to_representation(rows)) == expected
+
+
+def test_values_list_serializer_follows_the_current_timezone(post):
+    """
+    Verify that datetimes are rendered in the time zone active when the serializer is built, like DRF does.
+    """
+    with timezone.override("America/Bogota"):
+        serializer = ValuesListSerializer(PostSerializer, fields=("created_at",))
+        expected = PostSerializer(post, fields=("created_at",)).data
+        rows = Post.objects.filter(pk=post.pk).values_list(*serializer.get_columns(), named=True)
+        assert serializer.to_representation(rows) == [expected]
+    assert expected["created_at"].endswith("-05:00")
+
+
+def test_post_list_does_not_instantiate_posts(api_client, post, mocker):
+    """
+    Verify that the posts list is served from rows, without building Post instances.
+
+    Args:
+        api_client: The APIClient fixture for making API requests.
+        post: The Post fixture providing a Post object.
+        mocker: The pytest-mock fixture.
+
+    Asserts:
+        Post.from_db is never called, and the page holds the post.
+    """
+    from_db = mocker.spy(Post, "from_db")
+    response = api_client.get(reverse("post-list-create"))
+
+    assert response.data["results"][0]["id"] == post.id
+    from_db.assert_not_called()
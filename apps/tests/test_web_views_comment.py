@@ -1,5 +1,6 @@
 from django.urls import reverse
 from bs4 import BeautifulSoup
+from apps.comments.models import Comment
 
 
 def test_comment_list_view(client, comment):
@@ -44,3 +45,51 @@ def test_comment_detail_view(client, comment):
     comments = soup.find_all("p")
     comment_texts = [comment.get_text() for comment in comments]
     assert "This is a test comment" in comment_texts
+
+
+def test_comment_list_view_query_count_is_constant(client, post, django_assert_num_queries):
+    """
+    Verify that the Comment list view renders a 1,000-comment page without loading the Post once per row.
+
+    Args:
+        client: The Django test client fixture for making HTTP requests.
+        post: The Post fixture providing a Post object.
+        django_assert_num_queries: The pytest-django fixture for counting queries.
+
+    Asserts:
+        The page is rendered with a single query and links every comment.
+        The query does not read the content of the Post.
+    """
+    Comment.objects.bulk_create(
+        [Comment(post=post, content=f"Comment {i}") for i in range(1000)]
+    )
+
+    with django_assert_num_queries(1) as queries:
+        response = client.get(reverse("post-comments", args=[post.id]))
+
+    assert response.status_code == 200
+    soup = BeautifulSoup(response.content, "html.parser")
+    assert len(soup.find_all("li")) == 1000
+    assert '"posts_post"."title"' not in queries.captured_queries[0]["sql"]
+    assert '"posts_post"."content"' not in queries.captured_queries[0]["sql"]
+
+
+def test_comment_detail_view_loads_post_in_the_same_query(client, comment, django_assert_num_queries):
+    """
+    Verify that the Comment detail view loads the comment and the title of its Post in one query.
+
+    Args:
+        client: The Django test client fixture for making HTTP requests.
+        comment: The Comment fixture providing a Comment object.
+        django_assert_num_queries: The pytest-django fixture for counting queries.
+
+    Asserts:
+        The page is rendered with a single query and shows the Post title.
+    """
+    with django_assert_num_queries(1):
+        response = client.get(
+            reverse("post-comment-detail", args=[comment.post.id, comment.id])
+        )
+
+    assert response.status_code == 200
+    assert b"Post: Test Post" in response.content
@@ -0,0 +1,104 @@
+"""
+Compare the async read path served through ASGI with the synchronous views under WSGI.
+
+Both handlers are driven in-process with Django's test clients, so only the framework,
+view and ORM work is measured, not a server or the network:
+
+    WSGI  one Client per worker thread, `--concurrency` threads
+    ASGI  one AsyncClient, `--concurrency` requests in flight on one event loop
+
+    python -m benchmarks.bench_async --posts 1000 --requests 2000 --concurrency 32
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import setup_django, temporary_database
+
+
+def run_wsgi(urls, concurrency):
+    from django.db import connection
+    from django.test import Client
+
+    local = threading.local()
+
+    def fetch(url):
+        if not hasattr(local, "client"):
+            local.client = Client()
+        started = time.perf_counter()
+        response = local.client.get(url)
+        assert response.status_code == 200, response.status_code
+        connection.close()  # Each worker thread has its own connection; do not leak them.
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(fetch, urls))
+
+
+def run_asgi(urls, concurrency):
+    from django.test import AsyncClient
+
+    client = AsyncClient()
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(url):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(url)
+                assert response.status_code == 200, response.status_code
+                return time.perf_counter() - started
+
+        return await asyncio.gather(*(fetch(url) for url in urls))
+
+    return asyncio.run(main())
+
+
+def report(name, latencies, elapsed):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{name:<5} {len(latencies) / elapsed:>10.0f} {statistics.median(latencies) * 1000:>10.2f} "
+        f"{p95 * 1000:>10.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+    from apps.posts.models import Post
+
+    # Allow the test clients' host name and stop recording queries, as DEBUG would.
+    setup_test_environment(debug=False)
+    with temporary_database():
+        posts = Post.objects.bulk_create(
+            [Post(title=f"Post {i}", content="Lorem ipsum " * 50) for i in range(args.posts)]
+        )
+        urls = [
+            reverse("post-retrieve-update-destroy", args=[posts[i % len(posts)].pk]) if i % 2
+            else reverse("post-list-create")
+            for i in range(args.requests)
+        ]
+        print(f"{args.requests} requests (half list, half detail), concurrency {args.concurrency}")
+        print(f"{'path':<5} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10}")
+        for name, run in (("wsgi", run_wsgi), ("asgi", run_asgi)):
+            cache.clear()
+            started = time.perf_counter()
+            latencies = run(urls, args.concurrency)
+            report(name, latencies, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Measure what response compression saves in bytes and what it costs in time.
+
+Seeds a throwaway database, then requests a posts list page, a post detail, an HTML
+page and the NDJSON export uncompressed and with each coding the server can produce
+(gzip, plus br when brotli is installed). Buffered responses are timed twice: with
+the cache of compressed bodies disabled, so every request compresses, and with it
+enabled, so repeated requests reuse the body compressed under the ETag. Only JSON
+bodies are cached; the HTML page embeds a CSRF token and is compressed every time.
+
+    python -m benchmarks.bench_compression --posts 2000 --page-size 100 --repeat 50
+"""
+import argparse
+import random
+
+from benchmarks.common import measure, setup_django, temporary_database
+
+
+def populate(posts, batch_size=500):
+    from apps.comments.models import Comment
+    from apps.posts.models import Post
+
+    # Random words rather than a repeated sentence, so ratios are close to real prose.
+    rng = random.Random(0)
+    words = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(2, 10))) for _ in range(5000)]
+    for start in range(0, posts, batch_size):
+        created = Post.objects.bulk_create(
+            [
+                Post(title=f"Post {i}", content=" ".join(rng.choices(words, k=200)))
+                for i in range(start, min(start + batch_size, posts))
+            ]
+        )
+        Comment.objects.bulk_create([Comment(post=post, content=f"Comment on {post.title}") for post in created])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client, override_settings
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+    from apps.posts.models import Post
+    from my_project_blog.compression import ENCODINGS
+
+    # Allow the test client's host name and stop recording queries, as DEBUG would.
+    setup_test_environment(debug=False)
+    with temporary_database():
+        populate(args.posts)
+        client = Client()
+        post_id = Post.objects.order_by("id").values_list("id", flat=True).first()
+        scenarios = [
+            ("list", reverse("post-list-create"), {"page_size": args.page_size}),
+            ("detail", reverse("post-retrieve-update-destroy", args=[post_id]), {}),
+            ("html", reverse("post-list"), {}),
+            ("export", reverse("blog-export"), {}),
+        ]
+        print(f"{args.posts} posts, list pages of {args.page_size}")
+        print(f"{'endpoint':<8} {'coding':<9} {'bytes':>10} {'ratio':>7} {'cold ms':>9} {'cached ms':>10}")
+        for name, url, params in scenarios:
+            identity_size = None
+            for encoding in ("identity",) + ENCODINGS:
+
+                def request():
+                    response = client.get(url, params, HTTP_ACCEPT_ENCODING=encoding)
+                    assert response.status_code == 200, response.status_code
+                    body = b"".join(response.streaming_content) if response.streaming else response.content
+                    assert response.get("Content-Encoding", "identity") == encoding, (name, encoding)
+                    return body
+
+                with override_settings(COMPRESSION_CACHE_TTL=0):
+                    size = len(request())
+                    cold = measure(request, args.repeat)
+                cached = measure(request, args.repeat) if name != "export" else float("nan")
+                identity_size = identity_size or size
+                ratio = identity_size / size
+                print(f"{name:<8} {encoding:<9} {size:>10} {ratio:>7.1f} {cold:>9.2f} {cached:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Latency, SQL query count and peak memory of every API and web route, at a chosen scale.
+
+Seeds a dataset of posts and as many comments (1k, 100k or 1M of each), then drives each
+route of apps/posts/urls/api_urls.py and web_urls.py through the test client. Every
+request starts with an empty cache, so the numbers reflect the queries, not cache hits.
+
+    python -m benchmarks.bench_endpoints --scale 100k --output results.json
+    python -m benchmarks.bench_endpoints --scale 100k --compare results.json --threshold 0.2
+
+Seeding 1M rows takes minutes: with --dataset, the seeded database is saved to that file
+the first time and every later run works on a fresh copy of it.
+
+With --compare, the run fails (exit status 1) if an endpoint's p95 latency or peak memory
+grew by more than --threshold, or if it runs more SQL queries than in the baseline file.
+"""
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks.common import copied_database, setup_django, temporary_database
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+HOT_POST_COMMENTS = 200  # Extra comments on the post the detail routes read, so they paginate.
+
+
+def seed(rows, batch_size=10_000):
+    """
+    Insert `rows` posts and `rows` comments, then fill in the posts' comment stats.
+    """
+    from django.core.management import call_command
+    from django.db import transaction
+    from apps.comments.models import Comment
+    from apps.posts.models import Post
+
+    started = time.perf_counter()
+    post_ids = []
+    for start in range(0, rows, batch_size):
+        with transaction.atomic():
+            posts = Post.objects.bulk_create(
+                [
+                    Post(title=f"Post {i} about topic{i % 100}", content=f"Body of post {i}. " * 20)
+                    for i in range(start, min(start + batch_size, rows))
+                ]
+            )
+        post_ids.extend(post.pk for post in posts)
+
+    hot_post_id = post_ids[len(post_ids) // 2]
+    comment_post_ids = [hot_post_id] * HOT_POST_COMMENTS + [
+        post_ids[i % len(post_ids)] for i in range(rows - HOT_POST_COMMENTS)
+    ]
+    for start in range(0, len(comment_post_ids), batch_size):
+        with transaction.atomic():
+            Comment.objects.bulk_create(
+                [
+                    Comment(post_id=post_id, content=f"Comment {start + i} on topic{post_id % 100}")
+                    for i, post_id in enumerate(comment_post_ids[start:start + batch_size])
+                ]
+            )
+    call_command("recount_post_comments", verbosity=0, stdout=io.StringIO())
+    print(f"Seeded {rows} posts and {rows} comments in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+def build_scenarios(iterations, warmup):
+    """
+    :return: List of (name, method, url or callable returning a URL, data, iterations).
+    """
+    from django.urls import reverse
+    from apps.comments.models import Comment
+    from apps.posts.models import Post
+
+    hot_post = Post.objects.order_by("-comment_count", "id").first()
+    comment = Comment.objects.filter(post=hot_post).order_by("id").first()
+    # DELETE needs a post of its own per request (warmup, timed and tracemalloc runs).
+    doomed = iter(Post.objects.order_by("id").values_list("id", flat=True)[: warmup + iterations + 1])
+
+    detail = reverse("post-retrieve-update-destroy", args=[hot_post.pk])
+    comments = reverse("post-comment-create", args=[hot_post.pk])
+    comment_detail = reverse("post-comment-retrieve-update-destroy", args=[hot_post.pk, comment.pk])
+    posts = reverse("post-list-create")
+    new_post = {"title": "Benchmark post", "content": "Created by the benchmark"}
+    new_comments = [{"post_id": hot_post.pk, "content": f"Bulk comment {i}"} for i in range(100)]
+
+    return [
+        # apps/posts/urls/api_urls.py
+        ("api post list", "get", posts, None, iterations),
+        ("api post create", "post", posts, new_post, iterations),
+        ("api post bulk create", "post", reverse("post-bulk-create"), [new_post] * 100, iterations),
+        ("api comment bulk create", "post", reverse("comment-bulk-create"), new_comments, iterations),
+        ("api post search", "get", reverse("post-search") + "?q=topic42", None, iterations),
+        ("api export", "get", reverse("blog-export"), None, min(iterations, 3)),
+        ("api post detail", "get", detail, None, iterations),
+        ("api post update", "patch", detail, {"title": "Updated by the benchmark"}, iterations),
+        (
+            "api post delete",
+            "delete",
+            lambda: reverse("post-retrieve-update-destroy", args=[next(doomed)]),
+            None,
+            iterations,
+        ),
+        ("api comment list", "get", comments, None, iterations),
+        ("api comment create", "post", comments, {"content": "Benchmark comment"}, iterations),
+        ("api comment detail", "get", comment_detail, None, iterations),
+        ("api comment update", "patch", comment_detail, {"content": "Updated comment"}, iterations),
+        # apps/posts/urls/web_urls.py
+        ("web post list", "get", reverse("post-list"), None, iterations),
+        ("web post detail", "get", reverse("post-detail", args=[hot_post.pk]), None, iterations),
+        ("web comment list", "get", reverse("post-comments", args=[hot_post.pk]), None, iterations),
+        (
+            "web comment detail",
+            "get",
+            reverse("post-comment-detail", args=[hot_post.pk, comment.pk]),
+            None,
+            iterations,
+        ),
+    ]
+
+
+def run_scenario(client, method, url, data, iterations, warmup):
+    """
+    Send `warmup` + `iterations` requests, then one more under tracemalloc.
+
+    :return: Dictionary of latency percentiles (ms), query count and peak memory (KiB).
+    """
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def request():
+        cache.clear()
+        path = url() if callable(url) else url
+        if method == "get":
+            response = client.get(path)
+        else:
+            response = getattr(client, method)(path, data, format="json")
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method.upper()} returned {response.status_code}")
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        return response
+
+    for _ in range(warmup):
+        request()
+    latencies = []
+    queries = 0
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            request()
+            latencies.append((time.perf_counter() - started) * 1000)
+        queries = max(queries, len(captured))
+
+    tracemalloc.start()
+    try:
+        request()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "iterations": iterations,
+        "p50_ms": round(quantiles[49], 3),
+        "p95_ms": round(quantiles[94], 3),
+        "p99_ms": round(quantiles[98], 3),
+        "queries": queries,
+        "peak_memory_kib": round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the change of every endpoint against `baseline` and list the regressions.
+
+    :return: List of regression descriptions, empty if there is none.
+    """
+    regressions = []
+    print(f"\n{'endpoint':<26} {'p95 ms':>18} {'queries':>10} {'peak KiB':>22}")
+    for name, result in results["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if before is None:
+            continue
+        p95 = result["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        memory = result["peak_memory_kib"] / before["peak_memory_kib"] - 1 if before["peak_memory_kib"] else 0.0
+        print(
+            f"{name:<26} {before['p95_ms']:>8.2f} {p95:>+8.0%} "
+            f"{before['queries']:>4}->{result['queries']:<4} "
+            f"{before['peak_memory_kib']:>11.1f} {memory:>+9.0%}"
+        )
+        if p95 > threshold:
+            regressions.append(f"{name}: p95 {before['p95_ms']} -> {result['p95_ms']} ms ({p95:+.0%})")
+        if result["queries"] > before["queries"]:
+            regressions.append(f"{name}: {before['queries']} -> {result['queries']} SQL queries")
+        if memory > threshold:
+            regressions.append(
+                f"{name}: peak memory {before['peak_memory_kib']} -> {result['peak_memory_kib']} KiB ({memory:+.0%})"
+            )
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="1k", help="Posts, and comments, to seed.")
+    parser.add_argument("--iterations", type=int, default=30, help="Timed requests per endpoint.")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed requests per endpoint.")
+    parser.add_argument("--dataset", help="SQLite file caching the seeded dataset between runs.")
+    parser.add_argument("--only", help="Run only the endpoints whose name contains this text.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="JSON results of an earlier run to check for regressions.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed growth, 0.2 = 20%% (default).")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    from rest_framework.test import APIClient
+
+    setup_test_environment(debug=False)
+    rows = SCALES[args.scale]
+    if args.dataset and not os.path.exists(args.dataset):
+        with temporary_database():
+            seed(rows)
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM INTO %s", [args.dataset])
+    database = copied_database(args.dataset) if args.dataset else temporary_database()
+
+    results = {
+        "commit": git_commit(),
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "scale": args.scale,
+        "endpoints": {},
+    }
+    with database:
+        if not args.dataset:
+            seed(rows)
+        from apps.posts.models import Post
+
+        results["posts"] = Post.all_objects.count()  # A reused --dataset may not match --scale.
+        client = APIClient()
+        print(f"{'endpoint':<26} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'peak KiB':>10}")
+        for name, method, url, data, iterations in build_scenarios(args.iterations, args.warmup):
+            if args.only and args.only not in name:
+                continue
+            result = run_scenario(client, method, url, data, iterations, args.warmup)
+            results["endpoints"][name] = result
+            print(
+                f"{name:<26} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+                f"{result['queries']:>8} {result['peak_memory_kib']:>10.1f}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("\nNo regression.")
+
+
+if __name__ == "__main__":
+    main()
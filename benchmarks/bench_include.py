@@ -0,0 +1,77 @@
+"""
+Compare rendering a post page with two requests against one compound request.
+
+Seeds a post with many comments, then fetches the post and a page of its comments either
+as GET /api/posts/<id>/ followed by GET /api/posts/<id>/comments/, or as a single
+GET /api/posts/<id>/?include=comments&comments_limit=N. The compound request returns the
+newest comments where the comment list starts with the oldest. Both variants are timed
+with a cold cache and with a warm one, and the queries of a cold run are counted.
+
+    python -m benchmarks.bench_include --comments 5000 --limit 20 --repeat 50
+"""
+import argparse
+
+from benchmarks.common import measure, setup_django, temporary_database
+
+
+def populate(comments, batch_size=1000):
+    from apps.comments.models import Comment
+    from apps.posts.models import Post
+
+    post = Post.objects.create(title="Busy post", content="Lorem ipsum " * 100)
+    for start in range(0, comments, batch_size):
+        count = min(batch_size, comments - start)
+        Comment.objects.bulk_create([Comment(post=post, content=f"Comment {start + i}") for i in range(count)])
+    Post.objects.filter(pk=post.pk).update(comment_count=comments)
+    return post
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--comments", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext, setup_test_environment
+    from django.urls import reverse
+
+    # Allow the test client's host name and stop recording queries, as DEBUG would.
+    setup_test_environment(debug=False)
+    with temporary_database():
+        post = populate(args.comments)
+        client = Client()
+        post_url = reverse("post-retrieve-update-destroy", args=[post.id])
+        comments_url = reverse("post-comment-create", args=[post.id])
+
+        def separate():
+            assert client.get(post_url).status_code == 200
+            assert len(client.get(comments_url, {"page_size": args.limit}).json()["results"]) == args.limit
+
+        def compound():
+            response = client.get(post_url, {"include": "comments", "comments_limit": args.limit})
+            assert len(response.json()["comments"]["results"]) == args.limit
+
+        print(f"1 post with {args.comments} comments, pages of {args.limit}")
+        print(f"{'variant':<10} {'requests':>8} {'queries':>8} {'cold ms':>9} {'warm ms':>9}")
+        for name, requests, function in (("separate", 2, separate), ("compound", 1, compound)):
+
+            def cold():
+                cache.clear()
+                function()
+
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                function()
+            print(
+                f"{name:<10} {requests:>8} {len(queries.captured_queries):>8}"
+                f" {measure(cold, args.repeat):>9.2f} {measure(function, args.repeat):>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
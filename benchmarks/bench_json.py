@@ -0,0 +1,79 @@
+"""
+Compare DRF's JSONRenderer/JSONParser with FastJSONRenderer/FastJSONParser.
+
+No database is needed: payloads shaped like the API's are built in memory.
+
+    posts      a list page as the views build it, datetimes already ISO strings
+    native     the same rows with datetime and Decimal objects left to the renderer
+    bulk body  a POST /api/posts/bulk/ request body, parsed
+
+    python -m benchmarks.bench_json --rows 10000 --repeat 20
+"""
+import argparse
+import datetime
+import io
+from decimal import Decimal
+
+from benchmarks.common import measure, setup_django
+
+
+def build_rows(count):
+    created = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    return [
+        {
+            "id": i,
+            "title": f"Post {i} about topic{i % 100}",
+            "content": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+            "created_at": created + datetime.timedelta(seconds=i, microseconds=i),
+            "updated_at": created + datetime.timedelta(seconds=i),
+            "comment_count": i % 7,
+            "last_commented_at": None,
+            "rating": Decimal(i % 50) / 10,
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from my_project_blog.renderers import FastJSONParser, FastJSONRenderer, orjson
+
+    native = build_rows(args.rows)
+    strings = [
+        dict(
+            row,
+            created_at=row["created_at"].isoformat(),
+            updated_at=row["updated_at"].isoformat(),
+            rating=str(row["rating"]),
+        )
+        for row in native
+    ]
+    page = {"next": "http://testserver/api/posts/?cursor=abc", "previous": None, "results": strings}
+    body = JSONRenderer().render([{"title": row["title"], "content": row["content"]} for row in strings])
+
+    print(f"{args.rows} rows, orjson {'installed' if orjson else 'missing: both columns use the stdlib'}")
+    print(f"{'payload':<10} {'stdlib ms':>10} {'fast ms':>10} {'speedup':>8}")
+    cases = [
+        ("posts", lambda: JSONRenderer().render(page), lambda: FastJSONRenderer().render(page)),
+        ("native", lambda: JSONRenderer().render(native), lambda: FastJSONRenderer().render(native)),
+        (
+            "bulk body",
+            lambda: JSONParser().parse(io.BytesIO(body)),
+            lambda: FastJSONParser().parse(io.BytesIO(body)),
+        ),
+    ]
+    for name, stdlib, fast in cases:
+        assert stdlib() == fast()
+        before, after = measure(stdlib, args.repeat), measure(fast, args.repeat)
+        print(f"{name:<10} {before:>10.2f} {after:>10.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compare the FTS5 search endpoint's query against an icontains scan.
+
+Builds a corpus of posts and comments (1M rows by default) in a throwaway database and
+times both approaches for a few terms of different frequency:
+
+    python -m benchmarks.bench_search --posts 250000 --comments-per-post 3
+"""
+import argparse
+import random
+
+from benchmarks.common import measure, setup_django, temporary_database
+
+WORDS = [f"word{i}" for i in range(5000)]
+TERMS = ["word0", "word42", "word4999", "sourdough"]  # In nearly every row, common, rare, absent.
+
+
+def random_text(rng, length):
+    # Zipf-like choice, so a few words are frequent and most are rare.
+    return " ".join(WORDS[min(int(rng.paretovariate(1.1)) - 1, len(WORDS) - 1)] for _ in range(length))
+
+
+def populate(posts, comments_per_post, batch_size=5000):
+    from apps.comments.models import Comment
+    from apps.posts.models import Post
+
+    rng = random.Random(0)
+    for start in range(0, posts, batch_size):
+        created = Post.objects.bulk_create(
+            [Post(title=random_text(rng, 6), content=random_text(rng, 80)) for _ in range(min(batch_size, posts - start))]
+        )
+        Comment.objects.bulk_create(
+            [Comment(post=post, content=random_text(rng, 25)) for post in created for _ in range(comments_per_post)]
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=250000)
+    parser.add_argument("--comments-per-post", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db.models import Q
+    from apps.posts.models import Post
+    from apps.posts.services.search_service import SearchService
+
+    with temporary_database():
+        populate(args.posts, args.comments_per_post)
+        rows = args.posts * (1 + args.comments_per_post)
+        print(f"Corpus: {args.posts} posts, {rows} rows")
+        print(f"{'term':<12} {'fts5 ms':>10} {'icontains ms':>14}")
+        for term in TERMS:
+            fts = measure(lambda: SearchService.search_posts(term, 20), args.repeat)
+            scan = measure(
+                lambda: list(
+                    Post.objects.filter(
+                        Q(title__icontains=term) | Q(content__icontains=term) | Q(comments__content__icontains=term)
+                    )
+                    .distinct()
+                    .values_list("id", flat=True)[:20]
+                ),
+                args.repeat,
+            )
+            print(f"{term:<12} {fts:>10.1f} {scan:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare ModelSerializer list serialization with the values_list() path of ValuesListSerializer.
+
+Both paths fetch the same rows from a throwaway database and build the list of
+dictionaries the API renders; the JSON rendering, identical for both, is timed apart.
+
+    python -m benchmarks.bench_serialization --rows 10000 --repeat 5
+"""
+import argparse
+
+from benchmarks.common import measure, setup_django, temporary_database
+
+
+def populate(rows, batch_size=5000):
+    from apps.comments.models import Comment
+    from apps.posts.models import Post
+
+    post = Post.objects.create(title="Commented post", content="Body")
+    for start in range(0, rows, batch_size):
+        count = min(batch_size, rows - start)
+        Post.objects.bulk_create([Post(title=f"Post {start + i}", content="Lorem ipsum " * 40) for i in range(count)])
+        Comment.objects.bulk_create([Comment(post=post, content=f"Comment {start + i}") for i in range(count)])
+    return post
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+    from apps.comments.models import Comment
+    from apps.comments.serializers import CommentSerializer
+    from apps.posts.models import Post
+    from apps.posts.serializers import PostSerializer, ValuesListSerializer
+
+    with temporary_database():
+        post = populate(args.rows)
+        querysets = {
+            "posts": (Post.objects.order_by("created_at", "id"), PostSerializer),
+            "comments": (Comment.objects.filter(post=post).order_by("created_at", "id"), CommentSerializer),
+        }
+        print(f"{args.rows} rows, median of {args.repeat}")
+        print(f"{'list':<10} {'model ms':>10} {'values ms':>10} {'speedup':>8} {'render ms':>10}")
+        for name, (queryset, serializer_class) in querysets.items():
+
+            def model_path():
+                return serializer_class(list(queryset), many=True).data
+
+            def values_path():
+                serializer = ValuesListSerializer(serializer_class)
+                return serializer.to_representation(list(queryset.values_list(*serializer.get_columns(), named=True)))
+
+            assert JSONRenderer().render(model_path()) == JSONRenderer().render(values_path())
+            model = measure(model_path, args.repeat)
+            values = measure(values_path, args.repeat)
+            data = values_path()
+            render = measure(lambda: JSONRenderer().render(data), args.repeat)
+            print(f"{name:<10} {model:>10.1f} {values:>10.1f} {model / values:>7.1f}x {render:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
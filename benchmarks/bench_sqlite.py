@@ -0,0 +1,101 @@
+"""
+Reader/writer contention on SQLite, with the default and the production database profiles.
+
+Reader threads page through the posts list while writer threads run transactions that
+read a post and then add a comment to it, the pattern that fails with "database is
+locked" when a deferred transaction cannot upgrade its read lock. Each profile gets its
+own database file, since WAL mode is a property of the file.
+
+    python -m benchmarks.bench_sqlite --readers 8 --writers 4 --duration 5
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from benchmarks.common import setup_django, temporary_database
+
+
+def run_workload(readers, writers, duration, post_ids):
+    from django.db import OperationalError, connection, transaction
+    from apps.comments.models import Comment
+    from apps.posts.models import Post
+
+    stop = time.monotonic() + duration
+    results = {"read": [], "write": []}
+    errors = {"read": 0, "write": 0}
+    lock = threading.Lock()
+
+    def read(index):
+        list(Post.objects.order_by("-created_at", "-id")[index % 50 * 20:][:20])
+
+    def write(index):
+        with transaction.atomic():
+            post = Post.objects.get(pk=post_ids[index % len(post_ids)])
+            Comment.objects.create(post=post, content=f"Comment {index}")
+
+    def worker(kind, operation):
+        latencies, failures, index = [], 0, 0
+        while time.monotonic() < stop:
+            started = time.perf_counter()
+            try:
+                operation(index)
+                latencies.append(time.perf_counter() - started)
+            except OperationalError:
+                failures += 1
+            index += 1
+        connection.close()
+        with lock:
+            results[kind].extend(latencies)
+            errors[kind] += failures
+
+    threads = [threading.Thread(target=worker, args=("read", read)) for _ in range(readers)]
+    threads += [threading.Thread(target=worker, args=("write", write)) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per profile.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connections
+    from apps.posts.models import Post
+
+    database = connections.settings["default"]
+    default_profile = {key: database[key] for key in ("CONN_MAX_AGE", "CONN_HEALTH_CHECKS", "OPTIONS")}
+    profiles = (("default", {**default_profile, "PRAGMAS": {}}), ("production", settings.SQLITE_PRODUCTION_PROFILE))
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.duration:g}s per profile")
+    print(f"{'profile':<11} {'op':<6} {'ops/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, profile in profiles:
+        # Every connection, including those opened by the worker threads, reads this dict.
+        database.update(profile)
+        with temporary_database():
+            post_ids = [
+                post.pk for post in Post.objects.bulk_create(
+                    [Post(title=f"Post {i}", content="Lorem ipsum " * 50) for i in range(args.posts)]
+                )
+            ]
+            connections["default"].close()
+            results, errors = run_workload(args.readers, args.writers, args.duration, post_ids)
+        for kind in ("read", "write"):
+            latencies = sorted(results[kind]) or [0.0]
+            p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+            print(
+                f"{name:<11} {kind:<6} {len(results[kind]) / args.duration:>8.0f} "
+                f"{statistics.median(latencies) * 1000:>8.2f} {p99 * 1000:>8.2f} {errors[kind]:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
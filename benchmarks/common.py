@@ -0,0 +1,80 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Benchmarks run against a throwaway SQLite database file, created with the project's
+migrations and deleted afterwards, so they never touch db.sqlite3.
+"""
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def setup_django():
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "my_project_blog.settings")
+    import django
+
+    django.setup()
+    # One JSON line per request on the console would interleave with the results tables.
+    logging.getLogger("my_project_blog.requests").setLevel(logging.WARNING)
+
+
+@contextmanager
+def temporary_database():
+    """
+    Create a migrated, empty database file for the duration of the block.
+    """
+    from django.db import connection
+    from django.test.utils import setup_databases, teardown_databases
+
+    with tempfile.TemporaryDirectory() as directory:
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(directory, "bench.sqlite3")
+        config = setup_databases(verbosity=0, interactive=False)
+        try:
+            yield
+        finally:
+            teardown_databases(config, verbosity=0)
+
+
+@contextmanager
+def copied_database(path):
+    """
+    Use a migrated copy of the SQLite file at `path` for the duration of the block.
+
+    Lets a dataset that is slow to build be seeded once and reused by many runs, each
+    starting from the same state whatever it writes.
+    """
+    from django.core.management import call_command
+    from django.db import connection
+
+    with tempfile.TemporaryDirectory() as directory:
+        copy = os.path.join(directory, "bench.sqlite3")
+        shutil.copyfile(path, copy)
+        connection.close()
+        original, connection.settings_dict["NAME"] = connection.settings_dict["NAME"], copy
+        try:
+            call_command("migrate", verbosity=0)
+            yield
+        finally:
+            connection.close()
+            connection.settings_dict["NAME"] = original
+
+
+def measure(function, repeat):
+    """
+    Call `function` `repeat` times.
+
+    :return: Median duration of one call, in milliseconds.
+    """
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations)
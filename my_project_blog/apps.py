@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class ProjectConfig(AppConfig):
+    # Project-wide hooks that do not belong to the posts or comments apps.
+    name = "my_project_blog"
+
+    def ready(self):
+        from .instrumentation import install_query_recorder
+        from .sqlite import apply_pragmas
+
+        connection_created.connect(apply_pragmas, dispatch_uid="my_project_blog.sqlite.apply_pragmas")
+        connection_created.connect(
+            install_query_recorder, dispatch_uid="my_project_blog.instrumentation.install_query_recorder"
+        )
@@ -0,0 +1,16 @@
+"""
+URL configuration used for requests served through ASGI (see AsgiUrlconfMiddleware).
+
+Identical to my_project_blog.urls, except that the API read endpoints are async views.
+"""
+
+from django.contrib import admin
+from django.urls import path, include
+from .views import metrics
+
+urlpatterns = [
+    path("admin/", admin.site.urls),
+    path("metrics", metrics, name="metrics"),
+    path("posts/", include("apps.posts.urls.web_urls")),
+    path("api/posts/", include("apps.posts.urls.async_api_urls")),
+]
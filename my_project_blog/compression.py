@@ -0,0 +1,136 @@
+import hashlib
+import re
+import zlib
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # Optional: without it responses are only gzip-compressed.
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# Content codings we can produce, preferred first when the client weighs them equally.
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Media types worth compressing; images, archives (the ?gzip=1 export) and the like are not.
+COMPRESSIBLE_TYPE = re.compile(
+    r"^(text/|application/(json|x-ndjson|javascript|xml)\b|application/[\w.+-]+\+(json|xml)\b|image/svg\+xml\b)"
+)
+
+# Media types whose compressed bodies may be cached and shared between users: the JSON API
+# serves the same data to everyone, while HTML pages embed the requester's CSRF token.
+SHAREABLE_TYPE = re.compile(r"^application/([\w.+-]+\+)?json\b")
+
+
+def negotiate(accept_encoding):
+    """
+    Pick the content coding of a response from the request's Accept-Encoding header.
+
+    :param accept_encoding: Value of the header, e.g. "gzip, deflate, br;q=0.9".
+    :return: One of ENCODINGS, or None to send the response uncompressed.
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, parameters = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for parameter in parameters.split(";"):
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(response):
+    """
+    :return: True if the response is of a compressible type and not already encoded.
+    """
+    return not response.has_header("Content-Encoding") and bool(
+        COMPRESSIBLE_TYPE.match(response.get("Content-Type", ""))
+    )
+
+
+class _Compressor:
+    """
+    Incremental compressor for one content coding.
+    """
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            # 31 selects the gzip container; its header carries no timestamp, so output is deterministic.
+            self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def process(self, chunk, flush=False):
+        """
+        :param flush: If True, also emit everything buffered so far, so a streaming client gets it now.
+        """
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + (self._compressor.flush() if flush else b"")
+        return self._compressor.compress(chunk) + (self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else b"")
+
+    def finish(self):
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def compress(content, encoding):
+    """
+    :param content: Bytes to compress.
+    :param encoding: One of ENCODINGS.
+    :return: Compressed bytes.
+    """
+    compressor = _Compressor(encoding)
+    return compressor.process(content) + compressor.finish()
+
+
+def compress_stream(chunks, encoding):
+    """
+    Compress an iterator of byte chunks on the fly, flushing after every chunk.
+    """
+    compressor = _Compressor(encoding)
+    for chunk in chunks:
+        compressed = compressor.process(chunk, flush=True)
+        if compressed:
+            yield compressed
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, encoding):
+    """
+    Async variant of `compress_stream`, for the async iterators of responses served under ASGI.
+    """
+    compressor = _Compressor(encoding)
+    async for chunk in chunks:
+        compressed = compressor.process(chunk, flush=True)
+        if compressed:
+            yield compressed
+    yield compressor.finish()
+
+
+def cache_key(request, etag, encoding):
+    """
+    Key under which the compressed body of a response with a strong ETag is cached.
+
+    The scheme and host are part of it because bodies hold absolute links (the pagination
+    cursors) while ETags only cover the path.
+    """
+    digest = hashlib.sha1(f"{request.scheme}://{request.get_host()}\n{etag}\n{encoding}".encode()).hexdigest()
+    return f"compressed:{digest}"
@@ -0,0 +1,174 @@
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+
+request_logger = logging.getLogger("my_project_blog.requests")
+slow_query_logger = logging.getLogger("my_project_blog.sql.slow")
+
+# Metrics of the request being handled, set by ServerTimingMiddleware.
+_current = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """
+    Timings of one request: SQL queries, response rendering and the whole request.
+
+    All durations are in seconds. Rendering can run queries of its own (lazy querysets in
+    templates), so the time of those queries is part of both `db_time` and
+    `serialize_time`.
+    """
+
+    __slots__ = ("started", "finished", "queries", "db_time", "serialize_time", "_serialize_started")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self._serialize_started = None
+
+    @property
+    def total_time(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def start_serialization(self):
+        self._serialize_started = time.perf_counter()
+
+    def stop_serialization(self):
+        if self._serialize_started is not None:
+            self.serialize_time += time.perf_counter() - self._serialize_started
+            self._serialize_started = None
+
+    def server_timing(self):
+        """
+        :return: Value of the Server-Timing header, durations in milliseconds.
+        """
+        return (
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries", '
+            f"serialize;dur={self.serialize_time * 1000:.1f}, "
+            f"total;dur={self.total_time * 1000:.1f}"
+        )
+
+    def as_log(self, request, response):
+        return json.dumps(
+            {
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "queries": self.queries,
+                "db_ms": round(self.db_time * 1000, 2),
+                "serialize_ms": round(self.serialize_time * 1000, 2),
+                "total_ms": round(self.total_time * 1000, 2),
+            }
+        )
+
+
+def current_metrics():
+    """
+    :return: RequestMetrics of the current request, or None outside a request.
+    """
+    return _current.get()
+
+
+@contextmanager
+def collect_metrics():
+    """
+    Record the queries and rendering of the block into a new RequestMetrics.
+    """
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        metrics.finished = time.perf_counter()
+        _current.reset(token)
+
+
+@contextmanager
+def measure_serialization():
+    """
+    Count the block as response rendering time of the current request, if any.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    metrics.start_serialization()
+    try:
+        yield
+    finally:
+        metrics.stop_serialization()
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper timing every query, installed on each connection by `install_query_recorder`.
+
+    Queries are added to the metrics of the current request, and queries lasting at
+    least SLOW_QUERY_MS are logged with their parameters and the repository method
+    that ran them, whether or not they belong to a request.
+    """
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.queries += 1
+            metrics.db_time += duration
+        if 0 <= settings.SLOW_QUERY_MS <= duration * 1000:
+            try:
+                log_slow_query(duration, sql, params, many, context)
+            except Exception:  # Logging must never turn a query that succeeded into an error.
+                slow_query_logger.exception("Could not log a slow query.")
+
+
+def log_slow_query(duration, sql, params, many, context):
+    slow_query_logger.warning(
+        json.dumps(
+            {
+                "duration_ms": round(duration * 1000, 2),
+                "database": context["connection"].alias,
+                "caller": find_caller(),
+                "sql": sql,
+                "params": [repr(param) for param in params] if params and not many else None,
+            }
+        )
+    )
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    Add `record_query` to the execute wrappers of a new connection, once.
+
+    Connected to connection_created. Installing it on the connection, rather than with
+    connection.execute_wrapper() around each request, also covers management commands
+    and never stacks two recorders when a connection is reopened.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def find_caller():
+    """
+    :return: Dotted path of the innermost repository method on the stack, else of the
+             innermost function of the project apps, or None.
+    """
+    fallback = None
+    frame = sys._getframe(3)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("apps.") and not module.startswith("apps.tests"):
+            code = frame.f_code
+            qualname = getattr(code, "co_qualname", code.co_name).split(".<locals>")[0]  # co_qualname: 3.11+.
+            if ".repositories." in module:
+                return f"{module}.{qualname}"
+            fallback = fallback or f"{module}.{qualname}"
+        frame = frame.f_back
+    return fallback
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ...profiling import make_token
+
+
+class Command(BaseCommand):
+    """
+    Print a signed token that makes ProfilingMiddleware profile the requests carrying it.
+
+    The token is valid for PROFILING_TOKEN_MAX_AGE seconds, for any request, and only
+    works where PROFILING_ENABLED is set and the SECRET_KEY is the same.
+    """
+
+    help = "Print a token for the X-Profile-Token header or the ?profile= query parameter."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--memory",
+            action="store_true",
+            help="Also trace memory allocations with tracemalloc.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(make_token(memory=options["memory"]))
+        if not settings.PROFILING_ENABLED:
+            self.stderr.write("PROFILING_ENABLED is not set here; requests will not be profiled.")
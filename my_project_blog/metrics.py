@@ -0,0 +1,266 @@
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from django.conf import settings
+
+# Upper bounds, in seconds, of the request latency histogram buckets (Prometheus defaults).
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_HELP = {
+    "http_requests_total": ("counter", "Requests handled, by URL name, method and status."),
+    "http_request_duration_seconds": ("histogram", "Request latency, by URL name."),
+    "http_requests_in_flight": ("gauge", "Requests being handled."),
+    "db_queries_total": ("counter", "SQL queries run by requests, by URL name."),
+    "db_query_duration_seconds_total": ("counter", "Time spent in SQL queries by requests, by URL name."),
+    "repository_cache_requests_total": ("counter", "Read-through cache lookups, by cache and result."),
+    "repository_cache_hit_ratio": ("gauge", "Share of read-through cache lookups that were hits."),
+}
+
+
+def series(name, **labels):
+    """
+    :return: Series key in the exposition format, e.g. 'name{view="post-list-create"}'.
+    """
+    if not labels:
+        return name
+    return f"{name}{{{format_labels(labels)}}}"
+
+
+def format_labels(labels):
+    escaped = (
+        str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in labels.values()
+    )
+    return ",".join(f'{key}="{value}"' for key, value in zip(labels, escaped))
+
+
+class _Shard:
+    """
+    Counters of one thread. Only its own thread writes to it, so its lock is only ever
+    contended by a flush.
+    """
+
+    __slots__ = ("lock", "counters", "histograms")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}  # series -> [bucket counts..., +Inf count, sum]
+
+
+class MetricsRegistry:
+    """
+    Request metrics of this process, shared with the other workers through METRICS_DIR.
+
+    Each thread counts into its own shard, so recording a request costs a few dictionary
+    updates under an uncontended lock. A background thread writes the totals of the
+    process to METRICS_DIR/<pid>.json every METRICS_FLUSH_INTERVAL seconds, and `collect`
+    adds up the files of every process, like the multiprocess mode of the Prometheus
+    client. Counters of exited processes are kept so totals never go backwards; their
+    gauges are dropped. Empty METRICS_DIR when deploying, as old files would add up.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher_pid = None
+
+    def request_started(self):
+        if self._flusher_pid != os.getpid():
+            self._start_flusher()
+        with self._in_flight_lock:
+            self._in_flight += 1
+
+    def request_finished(self, view, method, status, duration, queries, db_time):
+        """
+        Record a finished request.
+
+        :param view: URL name of the view, or "unmatched".
+        :param duration: Duration of the request, in seconds.
+        :param queries: Number of SQL queries it ran.
+        :param db_time: Time spent in those queries, in seconds.
+        """
+        with self._in_flight_lock:
+            self._in_flight -= 1
+        shard = self._shard()
+        requests = series("http_requests_total", view=view, method=method, status=status)
+        latency = series("http_request_duration_seconds", view=view)
+        query_count = series("db_queries_total", view=view)
+        query_time = series("db_query_duration_seconds_total", view=view)
+        with shard.lock:
+            counters = shard.counters
+            counters[requests] = counters.get(requests, 0) + 1
+            counters[query_count] = counters.get(query_count, 0) + queries
+            counters[query_time] = counters.get(query_time, 0.0) + db_time
+            histogram = shard.histograms.get(latency)
+            if histogram is None:
+                histogram = shard.histograms[latency] = [0] * (len(LATENCY_BUCKETS) + 2)
+            histogram[bisect_left(LATENCY_BUCKETS, duration)] += 1
+            histogram[-1] += duration
+
+    def snapshot(self):
+        """
+        :return: Totals of this process, as written to its file in METRICS_DIR.
+        """
+        from apps.posts.repositories.cache import comment_cache, post_cache
+
+        counters, histograms = {}, {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            with shard.lock:
+                for key, value in shard.counters.items():
+                    counters[key] = counters.get(key, 0) + value
+                for key, values in shard.histograms.items():
+                    total = histograms.setdefault(key, [0] * len(values))
+                    for index, value in enumerate(values):
+                        total[index] += value
+        for cache in (post_cache, comment_cache):
+            stats = cache.stats()
+            counters[series("repository_cache_requests_total", cache=cache.prefix, result="hit")] = stats["hits"]
+            counters[series("repository_cache_requests_total", cache=cache.prefix, result="miss")] = stats["misses"]
+        return {
+            "pid": os.getpid(),
+            "counters": counters,
+            "histograms": histograms,
+            "gauges": {"http_requests_in_flight": self._in_flight},
+        }
+
+    def flush(self):
+        """
+        Write the totals of this process to METRICS_DIR/<pid>.json, atomically.
+        """
+        with self._flush_lock:
+            directory = Path(settings.METRICS_DIR)
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"{os.getpid()}.json"
+            temporary = path.with_suffix(".tmp")
+            temporary.write_text(json.dumps(self.snapshot()))
+            os.replace(temporary, path)
+
+    def collect(self):
+        """
+        Add up the metrics of every worker process.
+
+        :return: Dictionary with the merged 'counters', 'histograms' and 'gauges'.
+        """
+        self.flush()
+        merged = {"counters": {}, "histograms": {}, "gauges": {}}
+        for path in Path(settings.METRICS_DIR).glob("*.json"):
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue  # Removed or being replaced meanwhile.
+            for key, value in data["counters"].items():
+                merged["counters"][key] = merged["counters"].get(key, 0) + value
+            for key, values in data["histograms"].items():
+                total = merged["histograms"].setdefault(key, [0] * len(values))
+                for index, value in enumerate(values):
+                    total[index] += value
+            if process_is_alive(data["pid"]):
+                for key, value in data["gauges"].items():
+                    merged["gauges"][key] = merged["gauges"].get(key, 0) + value
+        return merged
+
+    def reset(self):
+        """
+        Forget the metrics of this process (tests only).
+        """
+        with self._shards_lock:
+            for shard in self._shards:
+                with shard.lock:
+                    shard.counters.clear()
+                    shard.histograms.clear()
+        with self._in_flight_lock:
+            self._in_flight = 0
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _start_flusher(self):
+        with self._flush_lock:
+            if self._flusher_pid == os.getpid():
+                return
+            if self._flusher_pid is not None:
+                self.reset()  # Forked: the inherited counts are the parent's, reported by the parent.
+            self._flusher_pid = os.getpid()  # A forked worker starts its own thread.
+        threading.Thread(target=self._flush_forever, name="metrics-flush", daemon=True).start()
+
+    def _flush_forever(self):
+        while True:
+            time.sleep(settings.METRICS_FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except OSError:
+                pass  # Try again at the next interval.
+
+
+def process_is_alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Exists, but belongs to another user.
+    return True
+
+
+def render(merged):
+    """
+    Format merged metrics in the Prometheus text exposition format (version 0.0.4).
+    """
+    families = {}
+    for key, value in merged["counters"].items():
+        families.setdefault(key.split("{")[0], []).append(f"{key} {value}")
+    for key, value in merged["gauges"].items():
+        families.setdefault(key.split("{")[0], []).append(f"{key} {value}")
+
+    for key, values in sorted(merged["histograms"].items()):
+        name, _, labels = key.partition("{")
+        labels = labels.rstrip("}")
+        lines = families.setdefault(name, [])
+        cumulative = 0
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), values[:-1]):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels + "," if labels else ""}le="{bound}"}} {cumulative}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {values[-1]}")
+        lines.append(f"{name}_count{suffix} {cumulative}")
+
+    hits = {}
+    for key, value in merged["counters"].items():
+        if key.startswith("repository_cache_requests_total{"):
+            cache = key.split('cache="')[1].split('"')[0]
+            hit, total = hits.get(cache, (0, 0))
+            hits[cache] = (hit + (value if 'result="hit"' in key else 0), total + value)
+    families["repository_cache_hit_ratio"] = [
+        f"{series('repository_cache_hit_ratio', cache=cache)} {hit / total if total else 0.0}"
+        for cache, (hit, total) in sorted(hits.items())
+    ]
+
+    output = []
+    for name in sorted(families):
+        kind, help_text = METRIC_HELP.get(name, ("untyped", name))
+        output.append(f"# HELP {name} {help_text}")
+        output.append(f"# TYPE {name} {kind}")
+        # Histogram lines are already grouped by series, buckets in increasing order.
+        output.extend(families[name] if kind == "histogram" else sorted(families[name]))
+    return "\n".join(output) + "\n"
+
+
+registry = MetricsRegistry()
+atexit.register(lambda: registry.flush() if registry._flusher_pid == os.getpid() else None)
@@ -0,0 +1,359 @@
+import time
+from contextlib import nullcontext
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from . import compression
+from .instrumentation import collect_metrics, current_metrics, request_logger
+from .metrics import registry
+from .profiling import logger as profiling_logger, read_token, sampler
+from .routers import use_primary
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class AsgiUrlconfMiddleware:
+    """
+    Route requests served through ASGI with settings.ASGI_ROOT_URLCONF.
+
+    Django builds the middleware chain in async mode only under the ASGI handler, so this
+    middleware switches the urlconf exactly when the request is already on an event loop,
+    where async views avoid a thread hop per request. Under WSGI it does nothing and the
+    synchronous views of ROOT_URLCONF are used.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        request.urlconf = settings.ASGI_ROOT_URLCONF
+        return await self.get_response(request)
+
+
+class ReplicaPinMiddleware:
+    """
+    Read your own writes when reads are served by replicas (see PrimaryReplicaRouter).
+
+    Requests with an unsafe method read from the primary throughout. When one succeeds,
+    the response sets the REPLICA_PIN_COOKIE cookie for REPLICA_PIN_SECONDS, and requests
+    carrying it read from the primary too, so the client never sees data older than its
+    own write while the replicas catch up. The cookie holds the time the pin expires.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self.reads_for(request):
+            response = self.get_response(request)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        with self.reads_for(request):
+            response = await self.get_response(request)
+        return self.pin(request, response)
+
+    def reads_for(self, request):
+        if request.method not in SAFE_METHODS or self.is_pinned(request):
+            return use_primary()
+        return nullcontext()
+
+    def is_pinned(self, request):
+        try:
+            return float(request.COOKIES[settings.REPLICA_PIN_COOKIE]) > time.time()
+        except (KeyError, ValueError):
+            return False
+
+    def pin(self, request, response):
+        if settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                str(time.time() + settings.REPLICA_PIN_SECONDS),
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class ServerTimingMiddleware:
+    """
+    Measure every request and report it in a Server-Timing header and a log line.
+
+    Records the number and duration of SQL queries (see instrumentation.record_query),
+    the time spent rendering the response (template and DRF responses here, the async
+    views report their own) and the total time of the request, as seen from the first
+    middleware. SERVER_TIMING_HEADER controls whether clients get the header; the
+    "my_project_blog.requests" logger always gets a JSON line at INFO.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with collect_metrics() as metrics:
+            response = self.get_response(request)
+        return self.report(request, response, metrics)
+
+    async def __acall__(self, request):
+        with collect_metrics() as metrics:
+            response = await self.get_response(request)
+        return self.report(request, response, metrics)
+
+    def process_template_response(self, request, response):
+        # Called just before the response is rendered; the callback runs right after.
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.start_serialization()
+            response.add_post_render_callback(lambda rendered: metrics.stop_serialization())
+        return response
+
+    def report(self, request, response, metrics):
+        if settings.SERVER_TIMING_HEADER:
+            response["Server-Timing"] = metrics.server_timing()
+        request_logger.info(metrics.as_log(request, response))
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Run a request under cProfile, and optionally tracemalloc, when it asks with a signed token.
+
+    Only active with PROFILING_ENABLED. A request carrying a token from `manage.py
+    profiling_token` in the X-Profile-Token header or the "profile" query parameter is
+    profiled through the rest of the middleware chain, the view, services and
+    repositories. The .prof file and a top-N summary are written to PROFILING_DIR and the
+    response names them in an X-Profile header. See profiling.ProfileSampler for the
+    limits that make it safe to leave enabled.
+
+    cProfile only sees the thread it runs in: under ASGI, ORM calls made through
+    sync_to_async show up as time spent waiting, and other requests running on the event
+    loop at the same time appear in the profile too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        mode = self.requested_mode(request)
+        if mode is None or not sampler.acquire():
+            return self.get_response(request)
+        try:
+            started = time.perf_counter()
+            profile = sampler.start(mode)
+            try:
+                response = self.get_response(request)
+            finally:
+                memory = sampler.stop(profile, mode)
+            self.save(profile, memory, request, response, time.perf_counter() - started)
+        finally:
+            sampler.release()
+        return response
+
+    async def __acall__(self, request):
+        mode = self.requested_mode(request)
+        if mode is None or not sampler.acquire():
+            return await self.get_response(request)
+        try:
+            started = time.perf_counter()
+            profile = sampler.start(mode)
+            try:
+                response = await self.get_response(request)
+            finally:
+                memory = sampler.stop(profile, mode)
+            self.save(profile, memory, request, response, time.perf_counter() - started)
+        finally:
+            sampler.release()
+        return response
+
+    def save(self, profile, memory, request, response, duration):
+        # The request was served; failing to write its profile (disk full...) must not change that.
+        try:
+            response["X-Profile"] = sampler.save(profile, memory, request, response, duration)
+        except Exception:
+            profiling_logger.exception("Could not write the profile of %s %s.", request.method, request.path)
+
+    def requested_mode(self, request):
+        token = request.headers.get("X-Profile-Token") or request.GET.get("profile")
+        return read_token(token) if token else None
+
+
+class MetricsMiddleware:
+    """
+    Count every request into the metrics served at /metrics (see metrics.MetricsRegistry).
+
+    Requests are labelled with the name of the URL pattern they matched, so the series
+    stay few however many posts there are. Placed after ServerTimingMiddleware, whose
+    measurements provide the query counts.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        registry.request_started()
+        started, response = time.perf_counter(), None
+        try:
+            response = self.get_response(request)
+            return response
+        finally:
+            self.record(request, response, started)
+
+    async def __acall__(self, request):
+        registry.request_started()
+        started, response = time.perf_counter(), None
+        try:
+            response = await self.get_response(request)
+            return response
+        finally:
+            self.record(request, response, started)
+
+    def record(self, request, response, started):
+        match = getattr(request, "resolver_match", None)
+        metrics = current_metrics()
+        registry.request_finished(
+            view=(match.url_name or match.view_name) if match else "unmatched",
+            method=request.method,
+            status=response.status_code if response is not None else 500,
+            duration=time.perf_counter() - started,
+            queries=metrics.queries if metrics else 0,
+            db_time=metrics.db_time if metrics else 0.0,
+        )
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best content coding the client accepts: brotli when the
+    brotli package is installed, else gzip.
+
+    Bodies of compressible types (HTML, JSON, NDJSON...) of at least COMPRESSION_MIN_SIZE
+    bytes are compressed; streaming responses, such as the export, are compressed chunk
+    by chunk as they are sent. A GET answered with a strong ETag identifies its body, so
+    the compressed body is cached under that ETag for COMPRESSION_CACHE_TTL seconds and
+    repeated requests skip the compression. As with Django's GZipMiddleware, the ETag is
+    made weak, which keeps If-None-Match working.
+
+    The ETag does not cover who asked, so only bodies that are the same for every user
+    are cached: JSON that sets no cookie. The Browsable API pages embed the requester's
+    CSRF token and login state and are compressed on every request. Those tokens are
+    masked afresh each time, which is Django's defence against BREACH-style attacks.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def compress(self, request, response):
+        if not compression.is_compressible(response):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = compression.negotiate(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compression.acompress_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compression.compress_stream(response.streaming_content, encoding)
+            del response.headers["Content-Length"]
+        else:
+            content = self.compressed_content(request, response, encoding)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers["Content-Length"] = str(len(content))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def compressed_content(self, request, response, encoding):
+        etag = response.get("ETag")
+        if (
+            request.method not in ("GET", "HEAD")
+            or response.status_code != 200
+            or not etag
+            or not etag.startswith('"')
+            or settings.COMPRESSION_CACHE_TTL <= 0
+            or not self.is_shareable(request, response)
+        ):
+            return compression.compress(response.content, encoding)
+        cache = caches[settings.COMPRESSION_CACHE_ALIAS]
+        key = compression.cache_key(request, etag, encoding)
+        content = cache.get(key)
+        if content is None:
+            content = compression.compress(response.content, encoding)
+            cache.set(key, content, settings.COMPRESSION_CACHE_TTL)
+        return content
+
+    @staticmethod
+    def is_shareable(request, response):
+        """
+        :return: True if the body is the same for every user: JSON that sets no cookie and
+                 embeds no CSRF token. Vary: Cookie is no guide, as API views read the
+                 session to authenticate whether or not their data depends on it.
+        """
+        return (
+            bool(compression.SHAREABLE_TYPE.match(response.get("Content-Type", "")))
+            and not response.cookies
+            and not request.META.get("CSRF_COOKIE_USED", False)
+        )
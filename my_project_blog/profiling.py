@@ -0,0 +1,142 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from django.conf import settings
+from django.core import signing
+
+logger = logging.getLogger("my_project_blog.profiling")
+
+TOKEN_SALT = "my_project_blog.profiling"
+MODES = ("cpu", "memory")  # "memory" adds tracemalloc to the cProfile run.
+
+
+def make_token(memory=False):
+    """
+    Sign a token that asks ProfilingMiddleware to profile the requests carrying it.
+
+    :param memory: If True, the requests are also traced with tracemalloc.
+    :return: Token for the X-Profile-Token header or the "profile" query parameter.
+    """
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign("memory" if memory else "cpu")
+
+
+def read_token(token):
+    """
+    :param token: Token given by the client.
+    :return: "cpu" or "memory", or None if the token is invalid or older than PROFILING_TOKEN_MAX_AGE.
+    """
+    try:
+        mode = signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=settings.PROFILING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    return mode if mode in MODES else None
+
+
+class ProfileSampler:
+    """
+    Decide which requests of this process may be profiled, and write their results.
+
+    At most one request is profiled at a time, since tracemalloc is process-wide, and at
+    most PROFILING_MAX_PER_MINUTE per minute; requests beyond that are served normally.
+    Only the PROFILING_MAX_FILES newest profiles are kept in PROFILING_DIR.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()  # Held for the whole profiled request.
+        self._recent = deque()  # Start times of the profiles of the last minute.
+        self._recent_lock = threading.Lock()
+
+    def acquire(self):
+        """
+        :return: True if the caller may profile a request now; it must then call `release`.
+        """
+        if not self._lock.acquire(blocking=False):
+            return False
+        with self._recent_lock:
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] >= 60:
+                self._recent.popleft()
+            if len(self._recent) >= settings.PROFILING_MAX_PER_MINUTE:
+                self._lock.release()
+                return False
+            self._recent.append(now)
+        return True
+
+    def release(self):
+        self._lock.release()
+
+    def start(self, mode):
+        """
+        Start profiling the current thread.
+
+        :param mode: "cpu", or "memory" to trace allocations too.
+        :return: The running cProfile.Profile.
+        """
+        if mode == "memory":
+            tracemalloc.start(10)
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def stop(self, profile, mode):
+        """
+        Stop profiling the current thread; tracemalloc is stopped even if its snapshot fails.
+
+        :return: Tuple of (tracemalloc snapshot, peak traced bytes), or (None, None) in "cpu" mode.
+        """
+        profile.disable()
+        if mode != "memory":
+            return None, None
+        try:
+            return tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def save(self, profile, memory, request, response, duration):
+        """
+        Write the .prof file and its .txt summary.
+
+        :param memory: Tuple of (snapshot, peak) returned by `stop`.
+        :return: Name of the files written, without extension.
+        """
+        snapshot, peak = memory
+        directory = Path(settings.PROFILING_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", request.path).strip("-") or "root"
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%f")
+        name = f"{stamp}-{request.method.lower()}-{slug[:80]}-{os.getpid()}"
+        profile.dump_stats(directory / f"{name}.prof")
+
+        summary = io.StringIO()
+        summary.write(f"{request.method} {request.path} -> {response.status_code} in {duration * 1000:.1f} ms\n\n")
+        stats = pstats.Stats(profile, stream=summary)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(settings.PROFILING_TOP_N)
+        # Views, services and repositories are often cheap next to Django and DRF; list them apart.
+        summary.write("Project code only (apps/):\n")
+        stats.print_stats(r"[/\\]apps[/\\]", settings.PROFILING_TOP_N)
+        if snapshot is not None:
+            summary.write(f"tracemalloc: peak {peak / 1024:.1f} KiB, top allocations by line\n")
+            for statistic in snapshot.statistics("lineno")[: settings.PROFILING_TOP_N]:
+                summary.write(f"{statistic}\n")
+        (directory / f"{name}.txt").write_text(summary.getvalue())
+
+        self.rotate(directory)
+        return name
+
+    def rotate(self, directory):
+        profiles = sorted(directory.glob("*.prof"), reverse=True)  # Names start with their UTC time.
+        for path in profiles[settings.PROFILING_MAX_FILES:]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".txt").unlink(missing_ok=True)
+
+
+sampler = ProfileSampler()
@@ -0,0 +1,72 @@
+import codecs
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser, get_encoding
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # Optional: without it both classes behave exactly like DRF's.
+    orjson = None
+
+# Datetimes with a "Z" suffix for UTC, and non-string keys converted like the json module does.
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+
+# Types orjson does not know (Decimal, lazy strings, QuerySets, timedelta...) go through DRF's encoder.
+_encoder_default = encoders.JSONEncoder().default
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer encoding with orjson when it is installed: equivalent JSON, in less time.
+
+    orjson writes compact UTF-8 JSON and encodes datetimes, dates, times and UUIDs in C the
+    way DRF's encoder does, so the output is byte for byte the same except for floats in
+    exponent notation: orjson writes 1e-6 where the json module writes 1e-06, the same
+    value. Decimals and the other types it does not know are handed to DRF's encoder,
+    which orjson only calls for such values. Indented output (the browsable API) and
+    non-default UNICODE_JSON / COMPACT_JSON / STRICT_JSON settings are left to the stdlib
+    renderer. Unlike it, NaN and infinite floats are rendered as null instead of raising
+    an error.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(data, default=_encoder_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Integers beyond 64 bits, or a type no encoder knows: same output or error as before.
+            return super().render(data, accepted_media_type, renderer_context)
+        # Like JSONRenderer, escape the two line terminators JavaScript does not allow in strings.
+        if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+            content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return content
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser decoding UTF-8 bodies with orjson when it is installed.
+
+    orjson rejects NaN and Infinity like the strict stdlib parser. Bodies in another
+    encoding, and every body when STRICT_JSON is off, go to the stdlib parser.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = get_encoding(parser_context or {})
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,51 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Set while the current request or block must read from the primary database.
+_primary_only = ContextVar("primary_only", default=False)
+
+
+@contextmanager
+def use_primary():
+    """
+    Send every read made inside the block to the primary database.
+
+    The flag is a context variable, so it covers the current thread or task and the
+    sync_to_async calls it makes, and nothing else.
+    """
+    token = _primary_only.set(True)
+    try:
+        yield
+    finally:
+        _primary_only.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Send writes to the primary ("default") and reads to one of settings.DATABASE_REPLICAS.
+
+    Reads stay on the primary when no replica is configured, inside `use_primary` (see
+    ReplicaPinMiddleware) and inside a transaction on the primary, where reading from a
+    replica would not see the transaction's own writes. Replicas are read-only copies
+    kept in sync outside Django, so migrations only run on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or _primary_only.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The primary and its replicas hold the same rows.
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        return obj1._state.db in aliases and obj2._state.db in aliases
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -32,6 +33,7 @@ ALLOWED_HOSTS = []
 # Application definition
 
 INSTALLED_APPS = [
+    "my_project_blog.apps.ProjectConfig",
     "rest_framework",
     "apps.posts",
     "apps.comments",
@@ -44,6 +46,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "my_project_blog.middleware.ServerTimingMiddleware",  # First, to time the whole request.
+    "my_project_blog.middleware.MetricsMiddleware",
+    "my_project_blog.middleware.CompressionMiddleware",  # Before anything reading the body it returns.
+    "my_project_blog.middleware.ProfilingMiddleware",  # Removed from the chain unless PROFILING_ENABLED.
+    "my_project_blog.middleware.AsgiUrlconfMiddleware",
+    "my_project_blog.middleware.ReplicaPinMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -54,6 +62,7 @@ MIDDLEWARE = [
 ]
 
 ROOT_URLCONF = "my_project_blog.urls"
+ASGI_ROOT_URLCONF = "my_project_blog.asgi_urls"  # Async API read views, used under ASGI only.
 
 TEMPLATES = [
     {
@@ -84,6 +93,147 @@ DATABASES = {
     }
 }
 
+# Production SQLite profile, enabled with DJANGO_DATABASE_PROFILE=production.
+# - WAL lets readers run while a write is in progress; synchronous=NORMAL is durable in
+#   WAL mode except for the last transactions before a power loss.
+# - busy_timeout makes a connection wait for a lock instead of failing at once. It is
+#   applied first, so switching to WAL also waits for other connections.
+# - Transactions start with BEGIN IMMEDIATE: an atomic() block takes the write lock when
+#   it opens, where a lock conflict waits out busy_timeout, rather than failing with
+#   "database is locked" when a deferred transaction tries to upgrade its read lock.
+# - Connections are kept for CONN_MAX_AGE seconds, so pragmas are applied once per
+#   worker thread. my_project_blog.sqlite.apply_pragmas runs the PRAGMAS on connect.
+SQLITE_PRODUCTION_PROFILE = {
+    "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "600")),
+    "CONN_HEALTH_CHECKS": True,
+    "OPTIONS": {"transaction_mode": "IMMEDIATE"},
+    "PRAGMAS": {
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000")),  # Milliseconds.
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")),  # Negative: KiB, not pages.
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),  # Bytes.
+        "temp_store": "MEMORY",
+    },
+}
+
+if os.getenv("DJANGO_DATABASE_PROFILE") == "production":
+    DATABASES["default"].update(SQLITE_PRODUCTION_PROFILE)
+
+# Read replicas: aliases of DATABASES that serve reads (see my_project_blog.routers).
+# DATABASE_REPLICA_PATH adds a second SQLite file as a stand-in replica for local runs,
+# kept up to date outside Django (e.g. sqlite3 db.sqlite3 "VACUUM INTO 'replica.sqlite3'").
+DATABASE_REPLICAS = []
+if os.getenv("DATABASE_REPLICA_PATH"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.getenv("DATABASE_REPLICA_PATH"),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS = ["replica"]
+
+DATABASE_ROUTERS = ["my_project_blog.routers.PrimaryReplicaRouter"]
+
+# After a successful write, a client reads from the primary for this many seconds, which
+# must exceed the replication lag for it to always read its own writes.
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "5"))
+REPLICA_PIN_COOKIE = "db_pin"
+
+
+# Django REST Framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    # List endpoints page with an opaque (created_at, id) cursor instead of OFFSET.
+    "DEFAULT_PAGINATION_CLASS": "apps.posts.pagination.KeysetCursorPagination",
+    "PAGE_SIZE": int(os.getenv("API_PAGE_SIZE", "20")),
+    # Same JSON as DRF's classes, encoded and decoded with orjson when it is installed.
+    "DEFAULT_RENDERER_CLASSES": [
+        "my_project_blog.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "my_project_blog.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+
+# Bulk post creation (POST /api/posts/bulk/)
+POST_BULK_CREATE_BATCH_SIZE = int(os.getenv("POST_BULK_CREATE_BATCH_SIZE", "500"))  # Rows per INSERT statement.
+POST_BULK_CREATE_MAX_ITEMS = int(os.getenv("POST_BULK_CREATE_MAX_ITEMS", "10000"))  # Items accepted per request.
+
+# Batch comment ingestion (POST /api/posts/comments/bulk/)
+COMMENT_BULK_CREATE_BATCH_SIZE = int(os.getenv("COMMENT_BULK_CREATE_BATCH_SIZE", "500"))  # Rows per INSERT statement.
+COMMENT_BULK_CREATE_MAX_ITEMS = int(os.getenv("COMMENT_BULK_CREATE_MAX_ITEMS", "10000"))  # Items accepted per request.
+
+# NDJSON export (GET /api/posts/export/ and manage.py export_blog)
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))  # Rows fetched from the cursor at a time.
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# The local-memory backend is per process: with several workers, point this at a shared
+# backend (Memcached, Redis) so repository invalidations reach every worker.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "mini-blog",
+    }
+}
+
+# Read-through cache used by PostRepository and CommentRepository for single-object lookups.
+REPOSITORY_CACHE_ALIAS = "default"
+REPOSITORY_CACHE_TTL = int(os.getenv("REPOSITORY_CACHE_TTL", "300"))  # Seconds; 0 disables caching.
+
+
+# Response compression (my_project_blog.middleware.CompressionMiddleware): gzip, or brotli when
+# the brotli package is installed. Compressed bodies of responses with a strong ETag are cached.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # Bytes; smaller bodies are sent as is.
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))  # 1 (fastest) to 9 (smallest).
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))  # 0 (fastest) to 11 (smallest).
+COMPRESSION_CACHE_ALIAS = "default"
+COMPRESSION_CACHE_TTL = int(os.getenv("COMPRESSION_CACHE_TTL", "300"))  # Seconds; 0 disables caching.
+
+
+# Request instrumentation (my_project_blog.middleware.ServerTimingMiddleware)
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", "1") == "1"  # Send timings to clients.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))  # Log slower queries; negative disables.
+
+# Prometheus metrics served at /metrics (my_project_blog.metrics). Every worker process writes
+# its totals to METRICS_DIR, which must be shared by the workers and emptied on deploy.
+METRICS_DIR = os.getenv("METRICS_DIR", os.path.join(tempfile.gettempdir(), "mini-blog-metrics"))
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "1"))  # Seconds.
+
+# Opt-in request profiling (my_project_blog.middleware.ProfilingMiddleware). Requests carrying a
+# token from `manage.py profiling_token` run under cProfile; results are written to PROFILING_DIR.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+PROFILING_DIR = os.getenv("PROFILING_DIR", str(BASE_DIR / "profiles"))
+PROFILING_MAX_FILES = int(os.getenv("PROFILING_MAX_FILES", "50"))  # Older profiles are deleted.
+PROFILING_MAX_PER_MINUTE = int(os.getenv("PROFILING_MAX_PER_MINUTE", "6"))  # Per process.
+PROFILING_TOP_N = int(os.getenv("PROFILING_TOP_N", "40"))  # Functions / lines in each summary.
+PROFILING_TOKEN_MAX_AGE = int(os.getenv("PROFILING_TOKEN_MAX_AGE", "3600"))  # Seconds.
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        # One JSON line per request: method, path, status, queries and timings.
+        "my_project_blog.requests": {
+            "handlers": ["console"],
+            "level": os.getenv("REQUEST_LOG_LEVEL", "INFO"),
+            "propagate": True,
+        },
+        # One JSON line per slow query: SQL, parameters, duration and calling repository method.
+        "my_project_blog.sql.slow": {"handlers": ["console"], "level": "WARNING", "propagate": True},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
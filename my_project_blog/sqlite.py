@@ -0,0 +1,28 @@
+import re
+
+# Pragma values are interpolated into the statement, so only keywords and integers are accepted.
+PRAGMA_NAME = re.compile(r"^[a-z_]+$")
+PRAGMA_VALUE = re.compile(r"^(-?[0-9]+|[A-Za-z_]+)$")
+
+
+def apply_pragmas(sender, connection, **kwargs):
+    """
+    Run the PRAGMA statements listed in the database's "PRAGMAS" setting on a new connection.
+
+    Connected to the connection_created signal. Most SQLite pragmas only last as long as the
+    connection, so they are applied every time Django opens one; with CONN_MAX_AGE that is
+    once per worker thread rather than once per request. Pragmas are applied in the order
+    they are listed.
+
+    :param sender: Database wrapper class of the new connection.
+    :param connection: The new connection.
+    :raises ValueError: If a pragma name or value is not a plain keyword or number.
+    """
+    if connection.vendor != "sqlite":
+        return
+    pragmas = connection.settings_dict.get("PRAGMAS") or {}
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            if not PRAGMA_NAME.match(name) or not PRAGMA_VALUE.match(str(value)):
+                raise ValueError(f"Invalid SQLite pragma: {name} = {value!r}")
+            cursor.execute(f"PRAGMA {name} = {value}")
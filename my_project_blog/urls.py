@@ -17,9 +17,11 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path, include
+from .views import metrics
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics, name="metrics"),
     path("posts/", include("apps.posts.urls.web_urls")),
     path("api/posts/", include("apps.posts.urls.api_urls")),
 ]
@@ -0,0 +1,14 @@
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from .metrics import registry, render
+
+
+@require_GET
+def metrics(request):
+    """
+    Serve the metrics of every worker process in the Prometheus text format.
+
+    :param request: The incoming request.
+    :return: HttpResponse with the exposition text.
+    """
+    return HttpResponse(render(registry.collect()), content_type="text/plain; version=0.0.4; charset=utf-8")